@@ -0,0 +1,17 @@
+"""Benchmarks of the loaders and of `metaloaders.model.Node` access.
+
+Run every benchmark and store the results as JSON:
+
+    $ python -m bench --output bench/results.json
+
+Compare them against a baseline, failing if any throughput regresses by
+more than the threshold:
+
+    $ python -m bench --baseline bench/baseline.json --threshold 0.1
+
+A baseline is a results file from an earlier run on the same machine:
+
+    $ cp bench/results.json bench/baseline.json
+
+Documents are synthetic and deterministic, see `bench.corpus`.
+"""
@@ -0,0 +1,337 @@
+"""Command line entry point of the benchmarks, see `bench`."""
+
+# Standard library
+import argparse
+from functools import (
+    lru_cache,
+    partial,
+)
+from hashlib import (
+    blake2b,
+)
+import json
+import pickle
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Local libraries
+from bench.corpus import (
+    Spec,
+    render,
+)
+from metaloaders import (
+    cloudformation,
+    flat,
+    json as json_loader,
+    yaml as yaml_loader,
+)
+from metaloaders.backends import (
+    engines,
+)
+from metaloaders.interning import (
+    Interner,
+)
+from metaloaders.limits import (
+    Limits,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+from metaloaders.validation import (
+    validate,
+)
+
+# Constants
+CORPORA = (
+    Spec(name='flat', size=0, depth=1, breadth=8),
+    Spec(name='nested', size=0, depth=5, breadth=3),
+    Spec(
+        name='numeric',
+        size=0,
+        depth=2,
+        breadth=6,
+        scalars=(('number', 0.9), ('string', 0.1)),
+    ),
+    Spec(name='template', size=0, breadth=5, cloudformation=True),
+)
+"""Shapes of the documents, sized on the command line."""
+LOADERS = {'json': json_loader, 'yaml': yaml_loader}
+OPTIONS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ('positions=keys', {'positions': 'keys'}),
+    ('positions=containers', {'positions': 'containers'}),
+    ('max_position_depth=1', {'max_position_depth': 1}),
+    ('share', {'share': True}),
+    ('share,max_position_depth=2', {'share': True, 'max_position_depth': 2}),
+    ('limits', {'limits': Limits()}),
+)
+"""Options of the loaders compared with the defaults on every loader."""
+
+
+class Case(NamedTuple):
+    """A single benchmark."""
+    name: str
+    """Name of the benchmark in results."""
+    run: Callable[[], Any]
+    """Runs the benchmark once."""
+    amount: float
+    """Work done by every run, in `unit`."""
+    unit: str
+    """Unit of work, throughput is reported in `unit` per second."""
+    corpus: str
+    """Digest of the benchmarked document."""
+
+
+class Document(NamedTuple):
+    """A rendered corpus."""
+    text: str
+    """Text of the document."""
+    digest: str
+    """Digest of `text`, results of other documents are not compared."""
+    megabytes: float
+    """Size of `text` once encoded, in megabytes."""
+
+
+class Result(NamedTuple):
+    """Measurements of a benchmark."""
+    seconds: float
+    """Best time of a single run."""
+    throughput: float
+    """Work done per second on the best run."""
+    peak_memory: int
+    """Peak of bytes allocated by a run, measured apart."""
+    unit: str
+    """Unit of work."""
+    corpus: str
+    """Digest of the benchmarked document."""
+
+
+def cases(size: int, pattern: str = '') -> Iterator[Case]:
+    """Generate the benchmarks over documents of about `size` characters.
+
+    Only benchmarks whose name contains `pattern` are generated, documents
+    none of them runs on are neither rendered nor loaded.
+    """
+    for spec in CORPORA:
+        spec = spec._replace(size=size)
+        for fmt, loader in LOADERS.items():
+            # Name, function, and arguments after the document, of a run
+            runs: List[Tuple[str, Callable[..., Any], Tuple[Any, ...],
+                             Dict[str, Any]]] = []
+            for engine in engines(fmt):
+                if spec.cloudformation:
+                    runs.append((
+                        f'cloudformation.load[{fmt}:{engine.name}]',
+                        cloudformation.load, (fmt,), {'engine': engine.name},
+                    ))
+                else:
+                    runs.append((
+                        f'{fmt}.load[{engine.name}]',
+                        loader.load, (), {'engine': engine.name},
+                    ))
+
+            if spec.cloudformation:
+                # Shared by every run, like by the templates of a batch
+                runs.append((
+                    f'cloudformation.load[{fmt}:interner]',
+                    cloudformation.load, (fmt,), {'interner': Interner()},
+                ))
+
+            runs.append((f'validate[{fmt}]', validate, (fmt,), {}))
+
+            if spec.name == 'nested':
+                for option, kwargs in OPTIONS:
+                    runs.append(
+                        (f'{fmt}.load[{option}]', loader.load, (), kwargs),
+                    )
+
+            for name, function, args, kwargs in runs:
+                name = f'{name}/{spec.name}'
+                if pattern in name:
+                    document = _document(spec, fmt)
+                    yield Case(
+                        name,
+                        partial(function, document.text, *args, **kwargs),
+                        document.megabytes,
+                        'MB',
+                        document.digest,
+                    )
+
+            if fmt == 'json':
+                yield from _tree_cases(spec, pattern)
+
+
+def measure(case: Case, repeat: int) -> Result:
+    """Time the best of `repeat` runs of `case`."""
+    timer = timeit.Timer(case.run)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        seconds=seconds,
+        throughput=case.amount / seconds,
+        peak_memory=peak_memory,
+        unit=f'{case.unit}/s',
+        corpus=case.corpus,
+    )
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> List[str]:
+    """Return the benchmarks whose throughput regressed beyond `threshold`.
+    """
+    regressions: List[str] = []
+    for name, current in sorted(results['results'].items()):
+        previous = baseline['results'].get(name)
+        if previous is None or previous['corpus'] != current['corpus']:
+            print(f'{name}: not in the baseline, skipped')
+            continue
+
+        change = current['throughput'] / previous['throughput'] - 1
+        regressed = change < -threshold
+        print(
+            f'{name}: {previous["throughput"]:.4g} -> '
+            f'{current["throughput"]:.4g} {current["unit"]} '
+            f'({change:+.1%}){" REGRESSION" if regressed else ""}',
+        )
+        if regressed:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks, return the exit status."""
+    parser = argparse.ArgumentParser(prog='python -m bench')
+    parser.add_argument('--baseline', help='results file to compare with')
+    parser.add_argument('--filter', default='', help='run matching names')
+    parser.add_argument('--output', help='file to write the results to')
+    parser.add_argument('--repeat', default=3, type=int)
+    parser.add_argument('--size', default=100_000, type=int)
+    parser.add_argument('--threshold', default=0.1, type=float)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        'environment': {
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'python': platform.python_version(),
+        },
+        'results': {},
+        'size': args.size,
+    }
+    for case in cases(args.size, args.filter):
+        result = measure(case, args.repeat)
+        results['results'][case.name] = result._asdict()
+        print(
+            f'{case.name}: {result.throughput:.4g} {result.unit} '
+            f'({result.seconds * 1e3:.2f} ms, '
+            f'{result.peak_memory / 1e6:.2f} MB peak)',
+        )
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmarks regressed beyond '
+                  f'{args.threshold:.0%}: {", ".join(regressions)}')
+            return 1
+
+    return 0
+
+
+@lru_cache(maxsize=1)
+def _document(spec: Spec, fmt: str) -> Document:
+    # Cases of a document are generated in a row, only the last is kept
+    text = render(spec, fmt)
+    return Document(
+        text=text,
+        digest=blake2b(text.encode(), digest_size=8).hexdigest(),
+        megabytes=len(text.encode()) / 1e6,
+    )
+
+
+def _flat_get(buffer: bytes, key: Any) -> None:
+    # Opening a buffer reads its header, and a lookup only the records and
+    # strings it visits
+    flat.FlatTree(buffer).root.get(key)
+
+
+def _inner(nodes: List[Node]) -> None:
+    for node in nodes:
+        node.inner  # pylint: disable=pointless-statement
+
+
+def _tree_cases(spec: Spec, pattern: str) -> Iterator[Case]:
+    # Benchmarks of a loaded tree, the document is loaded only if one of
+    # them runs
+    names = [
+        'Node.inner', 'Node.raw',
+        'pickle.dumps', 'pickle.loads', 'flat.dump', 'FlatTree.get',
+    ]
+    if not any(pattern in f'{name}/{spec.name}' for name in names):
+        return
+
+    document = _document(spec, 'json')
+    root: Node = (
+        cloudformation.load(document.text, 'json')
+        if spec.cloudformation
+        else json_loader.load(document.text)
+    )
+    containers = [
+        node for _, node in root.walk()
+        if node.data_type in {Type.ARRAY, Type.OBJECT}
+    ]
+    nodes = sum(1 for _ in root.walk())
+    runs: List[Tuple[str, Callable[[], Callable[[], Any]], float, str]] = [
+        ('Node.inner', lambda: partial(_inner, containers),
+         len(containers), 'nodes'),
+        ('Node.raw', lambda: partial(getattr, root, 'raw'), nodes, 'nodes'),
+        # Handing the tree to another process: serializing it, then reading
+        # a value back from the serialized form
+        ('pickle.dumps', lambda: partial(
+            pickle.dumps, root, pickle.HIGHEST_PROTOCOL,
+        ), document.megabytes, 'MB'),
+        ('pickle.loads', lambda: partial(
+            pickle.loads, pickle.dumps(root, pickle.HIGHEST_PROTOCOL),
+        ), document.megabytes, 'MB'),
+        ('flat.dump', lambda: partial(flat.dump, root),
+         document.megabytes, 'MB'),
+        ('FlatTree.get', lambda: partial(
+            _flat_get, flat.dump(root), next(iter(root.inner)),
+        ), document.megabytes, 'MB'),
+    ]
+    for name, build, amount, unit in runs:
+        name = f'{name}/{spec.name}'
+        if pattern in name:
+            yield Case(name, build(), amount, unit, document.digest)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""Deterministic generator of synthetic documents.
+
+Documents are described by a `Spec` and rendered as JSON or YAML:
+
+    >>> from bench.corpus import Spec, render
+
+    >>> spec = Spec(name='nested', size=10_000, depth=4, breadth=3)
+    >>> render(spec, 'yaml')
+
+The same spec renders the same text on every run and platform, only
+`random.Random.random` is used to draw values.
+"""
+
+# Standard library
+import json
+import random
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+)
+
+# Constants
+WORDS: Tuple[str, ...] = (
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf',
+    'hotel', 'india', 'juliett', 'kilo', 'lima', 'mike', 'november',
+)
+"""Words strings and keys are made of."""
+RESOURCE_TYPES: Tuple[str, ...] = (
+    'AWS::EC2::Instance',
+    'AWS::IAM::Role',
+    'AWS::Lambda::Function',
+    'AWS::S3::Bucket',
+    'AWS::SQS::Queue',
+)
+"""Types of the resources in CloudFormation templates."""
+
+
+class Spec(NamedTuple):
+    """Shape of a synthetic document."""
+    name: str
+    """Name of the document in results."""
+    size: int
+    """Approximate size of the document in characters."""
+    depth: int = 3
+    """Nesting levels of every top level entry."""
+    breadth: int = 4
+    """Children of every array or object."""
+    scalars: Tuple[Tuple[str, float], ...] = (
+        ('string', 0.5),
+        ('number', 0.3),
+        ('boolean', 0.1),
+        ('null', 0.1),
+    )
+    """Relative weights of the kinds of scalars."""
+    cloudformation: bool = False
+    """Whether to render a CloudFormation template with intrinsics."""
+    seed: int = 0
+    """Seed of the random generator."""
+
+
+class Intrinsic(NamedTuple):
+    """A CloudFormation intrinsic function call."""
+    function: str
+    """Name of the function, for instance: `Fn::Sub`."""
+    argument: Any
+    """Argument of the function."""
+
+
+def generate(spec: Spec) -> Any:
+    """Generate the data of a document, as plain Python values."""
+    rng = random.Random(spec.seed)
+    if spec.cloudformation:
+        return _template(spec, rng)
+
+    data: Dict[str, Any] = {}
+    size = 0
+    while size < spec.size:
+        key = f'{_pick(rng, WORDS)}{len(data)}'
+        data[key] = _value(spec, rng, spec.depth)
+        size += len(json.dumps({key: data[key]}))
+    return data
+
+
+def render(spec: Spec, fmt: str) -> str:
+    """Render the document described by `spec` as `json` or `yaml`."""
+    data = generate(spec)
+    if fmt == 'json':
+        return json.dumps(_plain(data), indent=2) + '\n'
+    if fmt == 'yaml':
+        lines: List[str] = []
+        _yaml_lines(data, 0, lines)
+        return '\n'.join(lines) + '\n'
+    raise NotImplementedError(fmt)
+
+
+def _plain(data: Any) -> Any:
+    # Intrinsics in the long form, as in JSON templates
+    if isinstance(data, Intrinsic):
+        return {data.function: _plain(data.argument)}
+    if isinstance(data, list):
+        return [_plain(val) for val in data]
+    if isinstance(data, dict):
+        return {key: _plain(val) for key, val in data.items()}
+    return data
+
+
+def _pick(rng: random.Random, values: Sequence[Any]) -> Any:
+    return values[int(rng.random() * len(values))]
+
+
+def _scalar(spec: Spec, rng: random.Random) -> Any:
+    total = sum(weight for _, weight in spec.scalars)
+    point = rng.random() * total
+    kind = spec.scalars[-1][0]
+    for kind, weight in spec.scalars:
+        if point < weight:
+            break
+        point -= weight
+
+    if kind == 'string':
+        return ' '.join(
+            _pick(rng, WORDS) for _ in range(1 + int(rng.random() * 4))
+        )
+    if kind == 'number':
+        if rng.random() < 0.5:
+            return int(rng.random() * 100_000)
+        return round(rng.random() * 1000, 3)
+    if kind == 'boolean':
+        return rng.random() < 0.5
+    return None
+
+
+def _value(spec: Spec, rng: random.Random, depth: int) -> Any:
+    if depth == 0:
+        return _scalar(spec, rng)
+    if rng.random() < 0.5:
+        return [_value(spec, rng, depth - 1) for _ in range(spec.breadth)]
+    return {
+        f'{_pick(rng, WORDS)}{index}': _value(spec, rng, depth - 1)
+        for index in range(spec.breadth)
+    }
+
+
+def _intrinsic(rng: random.Random, names: List[str]) -> Intrinsic:
+    name = _pick(rng, names)
+    kind = _pick(rng, ('Ref', 'Fn::Sub', 'Fn::GetAtt', 'Fn::Join'))
+    if kind == 'Ref':
+        return Intrinsic(kind, name)
+    if kind == 'Fn::Sub':
+        return Intrinsic(kind, f'arn:aws:s3:::${{{name}}}-${{AWS::Region}}')
+    if kind == 'Fn::GetAtt':
+        return Intrinsic(kind, [name, 'Arn'])
+    return Intrinsic(kind, ['-', [Intrinsic('Ref', name), 'suffix']])
+
+
+def _template(spec: Spec, rng: random.Random) -> Any:
+    resources: Dict[str, Any] = {}
+    template = {
+        'AWSTemplateFormatVersion': '2010-09-09',
+        'Parameters': {'Environment': {'Type': 'String'}},
+        'Resources': resources,
+    }
+    size = 0
+    while size < spec.size:
+        name = f'r{_pick(rng, WORDS).title()}{len(resources)}'
+        names = list(resources) or ['Environment']
+        properties: Dict[str, Any] = {
+            f'{_pick(rng, WORDS).title()}{index}': (
+                _intrinsic(rng, names)
+                if rng.random() < 0.4
+                else _value(spec, rng, 1 if rng.random() < 0.3 else 0)
+            )
+            for index in range(spec.breadth)
+        }
+        properties['Tags'] = [
+            {'Key': _pick(rng, WORDS), 'Value': _intrinsic(rng, names)}
+        ]
+        resources[name] = {
+            'Type': _pick(rng, RESOURCE_TYPES),
+            'Properties': properties,
+        }
+        size += len(json.dumps(_plain({name: resources[name]})))
+    return template
+
+
+def _yaml_scalar(value: Any) -> str:
+    if isinstance(value, Intrinsic):
+        tag = '!' + value.function.replace('Fn::', '')
+        if value.function == 'Fn::GetAtt':
+            return f'{tag} {".".join(value.argument)}'
+        return f'{tag} {_yaml_flow(value.argument)}'
+    return json.dumps(value)
+
+
+def _yaml_flow(value: Any) -> str:
+    if isinstance(value, list):
+        return '[' + ', '.join(_yaml_flow(val) for val in value) + ']'
+    return _yaml_scalar(value)
+
+
+def _yaml_lines(data: Any, indent: int, lines: List[str]) -> None:
+    prefix = ' ' * indent
+    entries = (
+        [('- ', val) for val in data]
+        if isinstance(data, list)
+        else [(f'{key}: ', val) for key, val in data.items()]
+    )
+    for head, val in entries:
+        if isinstance(val, (dict, list)) and val:
+            lines.append(f'{prefix}{head.rstrip()}')
+            _yaml_lines(val, indent + 2, lines)
+        elif isinstance(val, (dict, list)):
+            lines.append(f'{prefix}{head}{json.dumps(val)}')
+        else:
+            lines.append(f'{prefix}{head}{_yaml_scalar(val)}')
@@ -0,0 +1,18 @@
+#! /usr/bin/env bash
+
+function main {
+  local args_bench=(
+    --output "${PWD}/bench/results.json"
+  )
+
+  if test -e "${PWD}/bench/baseline.json"
+  then
+    args_bench+=(--baseline "${PWD}/bench/baseline.json")
+  fi
+
+      echo '[INFO] Running benchmarks' \
+  &&  poetry run python -m bench "${args_bench[@]}" \
+
+}
+
+main
@@ -14,9 +14,11 @@ function main {
       echo '[INFO] Checking static typing' \
   &&  poetry run mypy "${args_mypy[@]}" src/ \
   &&  poetry run mypy "${args_mypy[@]}" test/ \
+  &&  poetry run mypy "${args_mypy[@]}" bench/ \
   &&  echo "[INFO] Linting" \
   &&  poetry run prospector "${args_prospector[@]}" src/ \
   &&  poetry run prospector "${args_prospector[@]}" test/ \
+  &&  poetry run prospector "${args_prospector[@]}" bench/ \
 
 }
 
@@ -15,7 +15,7 @@ function main {
   )
 
       echo '[INFO] Running tests' \
-  &&  poetry run pytest "${args_pytest[@]}" \
+  &&  poetry run python -m pytest "${args_pytest[@]}" \
 
 }
 
@@ -0,0 +1,188 @@
+"""Registry of the parsing engines available for every format.
+
+A format can be parsed by several engines, all of them build the very same
+`metaloaders.model.Node` trees. By default the preferred engine for the
+input size is used. Engines that may differ from the reference one on edge
+cases are not preferred, they are opt-in. One can be chosen on every call:
+
+    >>> from metaloaders.yaml import load
+
+    >>> load('a: 1', engine='python')
+
+Or for every call, until configured otherwise:
+
+    >>> from metaloaders.backends import configure
+
+    >>> configure('yaml', 'python')
+    >>> configure('yaml', None)  # back to the default policy
+
+Or with the `METALOADERS_<FORMAT>_ENGINE` environment variable,
+for instance: `METALOADERS_YAML_ENGINE=python`.
+
+Built-in engines are:
+
+- `json`: `scanner`, a recursive descent parser that decodes strings and
+  numbers with the C accelerated helpers of the standard library `json`,
+  preferred, and `lark`, a LALR parser. Both load the same nodes and
+  reject the same documents, scanner is several times faster at every
+  size and it is the only one that enforces limits,
+  see `metaloaders.limits`.
+- `yaml`: `python`, the pure-Python ruamel.yaml parser, preferred,
+  and `libyaml`, its C counterpart, if `ruamel.yaml.clib` is installed.
+  libyaml is opt-in: its marks are realigned to the ones of `python`, it
+  reads the whole text at once instead of decoding it incrementally, it can
+  not share subtrees, see `metaloaders.sharing`, nor enforce limits, and
+  some malformed documents are rejected by only one of them.
+"""
+
+# Standard library
+from contextlib import (
+    contextmanager,
+)
+from importlib import (
+    import_module,
+)
+import os
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.model import (
+    Node,
+)
+
+# Constants
+FORMATS: Tuple[str, ...] = ('json', 'yaml')
+"""Formats with a registry of engines."""
+
+# State
+_CONFIGURED: Dict[str, str] = {}
+_ENGINES: Dict[str, Dict[str, 'Engine']] = {fmt: {} for fmt in FORMATS}
+
+
+class Engine(NamedTuple):
+    """A parsing engine for a format."""
+    fmt: str
+    """Format parsed by the engine."""
+    name: str
+    """Name of the engine, unique within its format."""
+    load: Callable[..., Node]
+    """Loads a stream, with the keyword arguments of the format `load`."""
+    priority: int = 0
+    """Engines with higher priority are preferred by the default policy."""
+    min_size: int = 0
+    """Smallest input, in characters, the default policy uses it for."""
+    unsupported: FrozenSet[str] = frozenset()
+    """Options the engine can not honor, it is never used with them set."""
+
+
+def register(engine: Engine) -> Engine:
+    """Register `engine`, replacing any other with the same format and name.
+    """
+    _ENGINES.setdefault(engine.fmt, {})[engine.name] = engine
+    return engine
+
+
+def engines(fmt: str) -> Tuple[Engine, ...]:
+    """Return the engines registered for `fmt`, preferred ones first."""
+    if fmt in FORMATS:
+        # Built-in engines are registered when their loader is imported
+        import_module(f'metaloaders.{fmt}')
+
+    return tuple(sorted(
+        _ENGINES.get(fmt, {}).values(),
+        key=lambda engine: (-engine.priority, engine.name),
+    ))
+
+
+def configure(fmt: str, name: Optional[str]) -> None:
+    """Use the engine called `name` for `fmt` from now on.
+
+    None restores the default policy.
+
+    Raises `metaloaders.exceptions.MetaloaderError` if the engine does not
+    exist.
+    """
+    if name is not None and all(
+        engine.name != name for engine in engines(fmt)
+    ):
+        raise MetaloaderError(f'Unknown {fmt} engine: {name}')
+
+    if name is None:
+        _CONFIGURED.pop(fmt, None)
+    else:
+        _CONFIGURED[fmt] = name
+
+
+@contextmanager
+def using(fmt: str, name: Optional[str]) -> Iterator[None]:
+    """Use the engine called `name` for `fmt` within a `with` block."""
+    previous = _CONFIGURED.get(fmt)
+    configure(fmt, name)
+    try:
+        yield
+    finally:
+        configure(fmt, previous)
+
+
+def select(
+    fmt: str,
+    name: Optional[str] = None,
+    *,
+    size: int = 0,
+    options: Iterable[str] = (),
+) -> Engine:
+    """Return the engine to load `size` characters of `fmt` with `options`.
+
+    The engine called `name` is used when given. Otherwise the configured
+    one, or else the one in the environment, as long as it supports
+    `options`. Otherwise the default policy applies: the engine with the
+    highest priority whose `min_size` does not exceed `size` and that
+    supports `options`.
+
+    Raises `metaloaders.exceptions.MetaloaderError` if the engine called
+    `name` does not exist or does not support `options`.
+    """
+    options = frozenset(options)
+    candidates = engines(fmt)
+
+    if name:
+        for engine in candidates:
+            if engine.name == name:
+                if engine.unsupported & options:
+                    raise MetaloaderError(
+                        f'Engine {name} does not support: '
+                        + ', '.join(sorted(engine.unsupported & options)),
+                    )
+                return engine
+        raise MetaloaderError(f'Unknown {fmt} engine: {name}')
+
+    preferred = (
+        _CONFIGURED.get(fmt)
+        or os.environ.get(f'METALOADERS_{fmt.upper()}_ENGINE')
+    )
+    for engine in candidates:
+        if engine.name == preferred and not engine.unsupported & options:
+            return engine
+
+    for engine in candidates:
+        if engine.min_size <= size and not engine.unsupported & options:
+            return engine
+
+    # Size thresholds are a preference, not a requirement
+    for engine in candidates:
+        if not engine.unsupported & options:
+            return engine
+
+    raise MetaloaderError(f'No {fmt} engine supports: {sorted(options)}')
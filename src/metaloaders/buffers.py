@@ -0,0 +1,232 @@
+"""Helpers to load documents from files, bytes and memory-mapped buffers.
+
+Every loader has `load_bytes` and `load_file` entry points that accept
+`bytes`, `bytearray`, `memoryview` and `mmap.mmap` buffers, or a path:
+
+    >>> from metaloaders.yaml import load_file
+
+    >>> yaml = load_file('template.yml')
+
+Files are memory-mapped instead of read. The encoding is detected from the
+byte order mark, or from the position of null bytes on the first characters
+when there is none, as in [RFC 4627](https://tools.ietf.org/html/rfc4627).
+
+Node positions are character columns. `LineIndex` translates them to byte
+columns and offsets in the original buffer:
+
+    >>> from metaloaders.buffers import LineIndex
+
+    >>> index = LineIndex(buffer, 'yaml')
+    >>> index.byte_offset(node.start_line, node.start_column)
+"""
+
+# Standard library
+import codecs
+from contextlib import (
+    contextmanager,
+)
+import mmap
+import os
+import re
+from typing import (
+    Any,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
+
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+    MetaloaderSyntaxError,
+)
+
+# Types
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Constants
+BOMS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+"""Byte order marks and their encoding, longest first."""
+CHUNK_SIZE: int = 65536
+"""Number of bytes decoded at a time by `TextReader`."""
+
+
+def detect_encoding(buffer: Buffer) -> Tuple[str, int]:
+    """Return the encoding of `buffer` and the length of its byte order mark.
+    """
+    head = bytes(buffer[:4])
+
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    if len(head) >= 4 and head[:3] == b'\0\0\0':
+        encoding = 'utf-32-be'
+    elif len(head) >= 4 and head[1:4] == b'\0\0\0':
+        encoding = 'utf-32-le'
+    elif len(head) >= 2 and head[0] == 0:
+        encoding = 'utf-16-be'
+    elif len(head) >= 2 and head[1] == 0:
+        encoding = 'utf-16-le'
+    else:
+        encoding = 'utf-8'
+
+    return encoding, 0
+
+
+def decode(buffer: Buffer) -> str:
+    """Decode `buffer` at once, without copying it to an intermediate `bytes`.
+
+    Raises `metaloaders.exceptions.MetaloaderSyntaxError` on invalid data,
+    located after the characters decoded before it.
+    """
+    encoding, bom = detect_encoding(buffer)
+    with memoryview(buffer) as view, view[bom:] as text:
+        try:
+            return str(text, encoding)
+        except UnicodeDecodeError as exc:
+            with text[:exc.start] as valid:
+                head = str(valid, encoding)
+            raise MetaloaderSyntaxError(
+                f'Unable to decode stream: {exc}',
+                head.count('\n') + 1,
+                len(head) - head.rfind('\n') - 1,
+                len(head),
+            )
+
+
+@contextmanager
+def open_buffer(path: Union[str, 'os.PathLike[str]']) -> Iterator[Buffer]:
+    """Memory-map the file at `path` for reading."""
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            yield b''
+        else:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                yield buf
+
+
+class TextReader:
+    """File-like object that decodes a buffer incrementally.
+
+    Only `CHUNK_SIZE` bytes are decoded at a time, so the buffer is never
+    held as a whole in memory as text.
+
+    It must be closed before a memory-mapped buffer is closed.
+    """
+
+    def __init__(self, buffer: Buffer, name: str = '<buffer>') -> None:
+        self.name: str = name
+        self.size: int = len(buffer)
+        """Size in bytes of the buffer."""
+        self.encoding: str
+        self.encoding, self._position = detect_encoding(buffer)
+        self._buffer = memoryview(buffer)
+        self._decoder = codecs.getincrementaldecoder(self.encoding)()
+
+    def read(self, size: int = -1) -> str:
+        """Decode and return the next characters, an empty string on EOF.
+
+        Everything left is decoded if `size` is negative, otherwise at least
+        `CHUNK_SIZE` bytes are decoded.
+        """
+        size = len(self._buffer) if size < 0 else max(size, CHUNK_SIZE)
+        # Released on errors too, the traceback would otherwise keep the
+        # slice, and a memory-mapped buffer could not be closed
+        with self._buffer[self._position:self._position + size] as chunk:
+            self._position += len(chunk)
+            try:
+                return self._decoder.decode(
+                    chunk, final=self._position >= len(self._buffer),
+                )
+            except UnicodeDecodeError as exc:
+                raise MetaloaderError(f'Unable to decode stream: {exc}')
+
+    def head(self, size: int) -> str:
+        """Decode the characters within the first `size` bytes.
+
+        Nothing is consumed. A character cut by `size` is left out,
+        invalid data is replaced.
+        """
+        _, bom = detect_encoding(self._buffer)
+        decoder = codecs.getincrementaldecoder(self.encoding)('replace')
+        with self._buffer[bom:size] as chunk:
+            return decoder.decode(chunk)
+
+    def close(self) -> None:
+        """Release the underlying buffer."""
+        self._buffer.release()
+
+    def __enter__(self) -> 'TextReader':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class LineIndex:
+    """Byte offsets of the lines of a buffer holding a `fmt` document.
+
+    Lines are split like the loaders of `fmt` split them, and numbered from
+    1, like in `Node`: JSON lines end on line feeds, YAML lines on line
+    feeds and carriage returns, like the marks of ruamel.yaml. The index is
+    built with a single scan of the buffer.
+    """
+
+    def __init__(self, buffer: Buffer, fmt: str) -> None:
+        self.encoding: str
+        self.encoding, bom = detect_encoding(buffer)
+        self._buffer = buffer
+        self._width = len('\n'.encode(self.encoding))
+        self._starts: List[int] = [bom]
+
+        breaks: Tuple[str, ...]
+        if fmt in {'yml', 'yaml'}:
+            # ruamel.yaml marks count no other YAML 1.1 line break
+            breaks = ('\r\n', '\r', '\n')
+        elif fmt in {'json'}:
+            breaks = ('\n',)
+        else:
+            raise NotImplementedError(fmt)
+
+        newline = re.compile(b'|'.join(
+            re.escape(line_break.encode(self.encoding))
+            for line_break in breaks
+        ))
+        with memoryview(buffer) as view:
+            self._starts.extend(
+                match.end()
+                for match in newline.finditer(view)
+                if (match.start() - bom) % self._width == 0
+            )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def line_offset(self, line: int) -> int:
+        """Return the byte offset where `line` starts."""
+        return self._starts[line - 1]
+
+    def byte_column(self, line: int, column: int) -> int:
+        """Translate a character column on `line` to a byte column."""
+        start = self._starts[line - 1]
+        end = (
+            self._starts[line]
+            if line < len(self._starts)
+            else len(self._buffer)
+        )
+        with memoryview(self._buffer) as view, view[start:end] as line_view:
+            text = str(line_view, self.encoding)
+        return len(text[:column].encode(self.encoding))
+
+    def byte_offset(self, line: int, column: int) -> int:
+        """Translate a line and character column to a byte offset."""
+        return self.line_offset(line) + self.byte_column(line, column)
@@ -2,56 +2,171 @@
 """
 
 # Standard library
+from functools import (
+    lru_cache,
+)
+import os
 from typing import (
     Any,
-)
-
-# Third party libraries
-from ruamel import (
-    yaml as _yaml,
+    Optional,
+    Union,
 )
 
 # Local libraries
+from metaloaders.buffers import (
+    Buffer,
+    TextReader,
+    decode,
+    open_buffer,
+)
 from metaloaders.exceptions import (
     MetaloaderError,
     MetaloaderNotImplemented,
 )
+from metaloaders.hashing import (
+    digest,
+)
+from metaloaders.interning import (
+    Interner,
+)
+from metaloaders.limits import (
+    Limits,
+    check_size,
+)
 from metaloaders.model import (
     Node,
     Type,
 )
-from metaloaders.yaml import (
-    Loader as YAMLLoader,
-    load as load_as_yaml,
-)
-from metaloaders.json import (
-    load as load_as_json,
-)
 
 
-class Loader(YAMLLoader):  # pylint: disable=abstract-method,too-many-ancestors
-    """YAML loader with overridden constructors that propagate positions.
+def __getattr__(name: str) -> Any:
+    # `Loader` extends the YAML one, which is built on first access as
+    # ruamel.yaml is slow to import
+    if name == 'Loader':
+        return _loader()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-    In normal circumstances you should not use this directly, but it is left
-    here in order to ease extension when needed.
-    """
 
+@lru_cache(maxsize=None)
+def _loader() -> Any:
+    # pylint: disable=import-outside-toplevel
+    from metaloaders.yaml import (
+        Loader as YAMLLoader,
+    )
 
-def load(stream: str, fmt: str) -> Node:
+    class Loader(  # pylint: disable=abstract-method,too-many-ancestors
+        YAMLLoader,
+    ):
+        """YAML loader with overridden constructors that propagate
+        positions.
+
+        In normal circumstances you should not use this directly, but it is
+        left here in order to ease extension when needed.
+        """
+
+        def is_container(self, node: Any) -> bool:
+            """Return whether `node` is constructed as an array or object.
+
+            Intrinsic functions are objects, even in their short form.
+            """
+            return super().is_container(node) or node.tag.startswith('!')
+
+    Loader.__qualname__ = 'Loader'
+    Loader.add_multi_constructor('!', _multi_constructor)
+    return Loader
+
+
+def load(
+    stream: Union[str, TextReader],
+    fmt: str,
+    *,
+    engine: Optional[str] = None,
+    interner: Optional[Interner] = None,
+    share: bool = False,
+    digests: bool = False,
+    limits: Optional[Limits] = None,
+    positions: str = 'all',
+    max_position_depth: Optional[int] = None,
+) -> Node:
     if fmt in {'yml', 'yaml'}:
-        return load_as_yaml(stream, loader_cls=Loader)
+        # The YAML loader is imported on first use, it is slow to import
+        # pylint: disable=import-outside-toplevel
+        from metaloaders.yaml import (
+            load as load_as_yaml,
+        )
+
+        return load_as_yaml(
+            stream,
+            engine=engine,
+            interner=interner,
+            loader_cls=_loader(),
+            share=share,
+            digests=digests,
+            limits=limits,
+            positions=positions,
+            max_position_depth=max_position_depth,
+        )
 
     if fmt in {'json'}:
-        return load_as_json(stream)
+        # The JSON loader is imported on first use, it is slow to import
+        # pylint: disable=import-outside-toplevel
+        from metaloaders.json import (
+            load as load_as_json,
+        )
+
+        if limits is not None:
+            # Before reading it
+            check_size(stream, limits)
+
+        return load_as_json(
+            stream if isinstance(stream, str) else stream.read(),
+            engine=engine,
+            interner=interner,
+            share=share,
+            digests=digests,
+            limits=limits,
+            positions=positions,
+            max_position_depth=max_position_depth,
+        )
 
     raise NotImplementedError(fmt)
 
 
+def load_bytes(buffer: Buffer, fmt: str, **kwargs: Any) -> Node:
+    """Loads a template from a bytes-like object or memory-mapped buffer.
+
+    Keyword arguments are the ones of `load`.
+    """
+    if fmt in {'json'} and kwargs.get('limits') is None:
+        return load(decode(buffer), fmt, **kwargs)
+
+    with TextReader(buffer) as stream:
+        return load(stream, fmt, **kwargs)
+
+
+def load_file(path: str, fmt: Optional[str] = None, **kwargs: Any) -> Node:
+    """Loads a template from the file at `path`, which is memory-mapped.
+
+    The format defaults to the file extension.
+    Keyword arguments are the ones of `load`.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1][1:].lower()
+
+    with open_buffer(path) as buffer:
+        return load_bytes(buffer, fmt, **kwargs)
+
+
 def _multi_constructor(
-    loader: Loader,
+    loader: Any,
     tag_suffix: str,
-    node: _yaml.Node,  # type: ignore
+    node: Any,
 ) -> Any:
+    # pylint: disable=import-outside-toplevel
+    from ruamel import (
+        yaml as _yaml,
+    )
+
     if tag_suffix not in {'Condition', 'Ref'}:
         tag_suffix = f'Fn::{tag_suffix}'
 
@@ -66,18 +181,29 @@ def _multi_constructor(
     else:
         raise MetaloaderNotImplemented(f'Bad tag: !{tag_suffix}')
 
+    data = constructor(node)
+    if loader.interner is not None:
+        tag_suffix = loader.interner(tag_suffix)
+        if isinstance(data, str):
+            data = loader.interner(data)
+
+    data = {tag_suffix: data}
+    if loader.partial is not None and node not in loader.positioned:
+        return data
+
     return Node(
-        data={tag_suffix: constructor(node)},
+        data=data,
         data_type=Type.OBJECT,
         end_column=node.end_mark.column,
         end_line=node.end_mark.line + 1,
         start_column=node.start_mark.column,
         start_line=node.start_mark.line + 1,
+        digest=digest(data, Type.OBJECT) if loader.digests else None,
     )
 
 
 def construct_getatt(
-    node: _yaml.Node,  # type: ignore
+    node: Any,
 ) -> Any:
     if isinstance(node.value, str):
         return node.value.split(".", 1)
@@ -86,11 +212,3 @@ def construct_getatt(
         return [s.value for s in node.value]
 
     raise MetaloaderError(f'Unexpected node type: {type(node.value)}')
-
-
-def _override() -> None:
-    Loader.add_multi_constructor("!", _multi_constructor)
-
-
-# Side effects
-_override()
@@ -0,0 +1,189 @@
+"""Columnar export of `metaloaders.model.Node` trees to NumPy arrays.
+
+Statistics over huge documents are faster computed over arrays than by
+iterating Python objects:
+
+    >>> from metaloaders.columnar import to_columns, type_histogram
+    >>> from metaloaders.json import load
+
+    >>> columns = to_columns(load('{"a": [1, 2], "b": "c"}'))
+    >>> type_histogram(columns)
+        {Type.ARRAY: 1, Type.NUMBER: 2, Type.OBJECT: 1, Type.STRING: 3}
+
+Every node is a row, keys included, in document order. Plain values nested
+in a `Node`, like the ones built for CloudFormation intrinsics, have no
+positions and are not exported.
+
+NumPy is an optional dependency: `pip install metaloaders[numpy]`.
+"""
+
+# Standard library
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+)
+
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+# Constants
+TYPES: Tuple[Type, ...] = tuple(Type)
+"""`Type` of every `Columns.data_type` code."""
+
+
+class Columns(NamedTuple):
+    """Metadata of every node in a tree, one array per field."""
+    data_type: Any
+    """Index of the node type in `TYPES`, `uint8`."""
+    parent: Any
+    """Row of the parent node, -1 for the root, `int64`."""
+    depth: Any
+    """Depth of the node, 0 for the root, `uint32`."""
+    is_key: Any
+    """Whether the node is an object key, `bool`."""
+    start_line: Any
+    """Start line for the node, `uint32`."""
+    start_column: Any
+    """Start column for the node, `uint32`."""
+    end_line: Any
+    """End line for the node, `uint32`."""
+    end_column: Any
+    """End column for the node, `uint32`."""
+    string_offset: Any
+    """Offset of the node data in `strings`, -1 if not a string, `int64`."""
+    string_length: Any
+    """Length of the node data in `strings`, 0 if not a string, `int64`."""
+    strings: str
+    """Concatenation of the data of every string node."""
+
+    def string(self, row: int) -> str:
+        """Return the data of the string node at `row`."""
+        offset = self.string_offset[row]
+        return self.strings[offset:offset + self.string_length[row]]
+
+
+def to_columns(node: Node) -> Columns:
+    """Export every node of a tree to a `Columns` of NumPy arrays.
+
+    Raises `metaloaders.exceptions.MetaloaderError` if NumPy is missing.
+    """
+    numpy = _numpy()
+    codes = {data_type: code for code, data_type in enumerate(TYPES)}
+    rows: List[Tuple[int, ...]] = []
+    strings: List[str] = []
+    strings_size = 0
+
+    for parent, depth, is_key, current in _preorder(node):
+        offset, length = -1, 0
+        if current.data_type is Type.STRING and isinstance(current.data, str):
+            offset, length = strings_size, len(current.data)
+            strings.append(current.data)
+            strings_size += length
+
+        rows.append((
+            codes[current.data_type],
+            parent,
+            depth,
+            is_key,
+            current.start_line,
+            current.start_column,
+            current.end_line,
+            current.end_column,
+            offset,
+            length,
+        ))
+
+    dtypes = (
+        numpy.uint8, numpy.int64, numpy.uint32, numpy.bool_,
+        numpy.uint32, numpy.uint32, numpy.uint32, numpy.uint32,
+        numpy.int64, numpy.int64,
+    )
+    fields = zip(*rows) if rows else ((),) * len(dtypes)
+
+    # One array per field but `strings`, the last one
+    return Columns._make([
+        *(
+            numpy.fromiter(field, dtype=dtype, count=len(rows))
+            for field, dtype in zip(fields, dtypes)
+        ),
+        ''.join(strings),
+    ])
+
+
+def type_histogram(columns: Columns) -> Dict[Type, int]:
+    """Count the nodes of every type."""
+    counts = _numpy().bincount(columns.data_type, minlength=len(TYPES))
+    return {
+        data_type: int(count)
+        for data_type, count in zip(TYPES, counts)
+        if count
+    }
+
+
+def depth_histogram(columns: Columns) -> Any:
+    """Count the nodes at every depth, indexed by depth."""
+    return _numpy().bincount(columns.depth)
+
+
+def longest_spans(columns: Columns, count: int = 10) -> Any:
+    """Return the rows of the `count` nodes spanning the most lines,
+    longest first."""
+    numpy = _numpy()
+    spans = columns.end_line.astype(numpy.int64) - columns.start_line
+    order = numpy.argsort(-spans, kind='stable')
+    return order[:count]
+
+
+def position_heatmap(columns: Columns, bins: int = 32) -> Any:
+    """Count node starts on a `bins` x `bins` grid of lines and columns.
+
+    Returns the counts along with the line and column bin edges, as in
+    `numpy.histogram2d`.
+    """
+    return _numpy().histogram2d(
+        columns.start_line, columns.start_column, bins=bins,
+    )
+
+
+def _preorder(node: Node) -> Iterator[Tuple[int, int, bool, Node]]:
+    # Rows are numbered in the order they are yielded
+    row = 0
+    stack: List[Tuple[int, int, bool, Node]] = [(-1, 0, False, node)]
+    while stack:
+        parent, depth, is_key, current = stack.pop()
+        yield parent, depth, is_key, current
+
+        children: List[Tuple[int, int, bool, Node]] = []
+        if current.data_type is Type.ARRAY:
+            for val in current.data:
+                children.append((row, depth + 1, False, val))
+        elif current.data_type is Type.OBJECT:
+            for key, val in current.data.items():
+                children.append((row, depth + 1, True, key))
+                children.append((row, depth + 1, False, val))
+
+        stack.extend(
+            child for child in reversed(children)
+            if isinstance(child[3], Node)
+        )
+        row += 1
+
+
+def _numpy() -> Any:
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise MetaloaderError(
+            'NumPy is required: pip install metaloaders[numpy]',
+        )
+    return numpy
@@ -0,0 +1,213 @@
+"""Positional diff between two loaded documents.
+
+Let's compare two revisions of a document:
+
+    >>> from metaloaders.diff import diff
+    >>> from metaloaders.json import load
+
+    >>> old = load('{"a": 1, "b": [1, 2]}', digests=True)
+    >>> new = load('{"a": 1, "b": [1, 3], "c": true}', digests=True)
+
+    >>> for change in diff(old, new):
+    ...     print(change.kind, change.path)
+        Kind.CHANGED ('b', 1)
+        Kind.ADDED ('c',)
+
+Every change carries the nodes of both sides, and therefore their positions.
+
+Subtrees are paired by key in objects and by digest, then by order, in
+arrays. Subtrees with equal digests are skipped without descending into them,
+so the cost is proportional to the size of the change and not to the size of
+the documents. Trees loaded without `digests=True` are hashed first.
+"""
+
+# Standard library
+from collections import (
+    deque,
+)
+from enum import (
+    Enum,
+)
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+# Local libraries
+from metaloaders.hashing import (
+    with_digests,
+)
+from metaloaders.model import (
+    Node,
+    Path,
+    Type,
+)
+
+
+class Kind(Enum):
+    """Enumeration for all possible `Change` kinds."""
+    ADDED: str = 'ADDED'
+    """The element exists in the new document only."""
+    CHANGED: str = 'CHANGED'
+    """The element exists in both documents with different data."""
+    REMOVED: str = 'REMOVED'
+    """The element exists in the old document only."""
+
+
+class Change(NamedTuple):
+    """Represents a difference between two documents."""
+    kind: Kind
+    """Defines what happened to the element."""
+    path: Path
+    """Keys and indexes to the element, indexes are the ones on the new
+    document unless the element was removed."""
+    old: Optional[Node]
+    """Element on the old document, if any."""
+    new: Optional[Node]
+    """Element on the new document, if any."""
+
+
+# Elements to compare, on the old and new documents
+_Pair = Tuple[Path, Node, Node]
+
+
+def diff(old: Node, new: Node) -> Iterator[Change]:
+    """Yield the changes needed to go from `old` to `new`.
+
+    Containers are visited depth first. Within each one, removed elements
+    come first in the order of the old document, then the others in the
+    order of the new document.
+    """
+    old = old if old.digest is not None else with_digests(old)
+    new = new if new.digest is not None else with_digests(new)
+
+    stack: List[Union[Change, _Pair]] = [((), old, new)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Change):
+            yield item
+            continue
+
+        path, old, new = item
+        if old.digest == new.digest:
+            continue
+
+        if old.data_type is not new.data_type or not _comparable(old, new):
+            yield Change(kind=Kind.CHANGED, path=path, old=old, new=new)
+        elif old.data_type is Type.OBJECT:
+            stack.extend(reversed(_diff_object(path, old, new)))
+        else:
+            stack.extend(reversed(_diff_array(path, old, new)))
+
+
+def _comparable(old: Node, new: Node) -> bool:
+    if old.data_type is Type.ARRAY:
+        return all(
+            isinstance(val, Node) for data in (old.data, new.data)
+            for val in data
+        )
+
+    if old.data_type is Type.OBJECT:
+        return all(
+            isinstance(key, Node) and isinstance(val, Node)
+            for data in (old.data, new.data)
+            for key, val in data.items()
+        )
+
+    # Scalars, as well as containers holding plain values like the ones in
+    # CloudFormation intrinsics, have nothing to pair and change as a whole
+    return False
+
+
+def _diff_object(
+    path: Path,
+    old: Node,
+    new: Node,
+) -> List[Union[Change, _Pair]]:
+    items: List[Union[Change, _Pair]] = []
+    old_items: Dict[Any, Node] = {
+        key.data: val for key, val in old.data.items()
+    }
+    new_items: Dict[Any, Node] = {
+        key.data: val for key, val in new.data.items()
+    }
+
+    for key, old_val in old_items.items():
+        if key not in new_items:
+            items.append(Change(
+                kind=Kind.REMOVED,
+                path=path + (key,),
+                old=old_val,
+                new=None,
+            ))
+
+    for key, new_val in new_items.items():
+        if key in old_items:
+            items.append((path + (key,), old_items[key], new_val))
+        else:
+            items.append(Change(
+                kind=Kind.ADDED,
+                path=path + (key,),
+                old=None,
+                new=new_val,
+            ))
+
+    return items
+
+
+def _diff_array(
+    path: Path,
+    old: Node,
+    new: Node,
+) -> List[Union[Change, _Pair]]:
+    items: List[Union[Change, _Pair]] = []
+
+    # Elements with the same digest are unchanged, even if they moved
+    unmatched: Dict[Optional[bytes], Deque[int]] = {}
+    for index, val in enumerate(old.data):
+        unmatched.setdefault(val.digest, deque()).append(index)
+
+    matched: Set[int] = set()
+    new_indexes: List[int] = []
+    for index, val in enumerate(new.data):
+        candidates = unmatched.get(val.digest)
+        if candidates:
+            matched.add(candidates.popleft())
+        else:
+            new_indexes.append(index)
+
+    old_indexes = [
+        index for index in range(len(old.data)) if index not in matched
+    ]
+
+    # What remains is paired in order
+    for old_index in old_indexes[len(new_indexes):]:
+        items.append(Change(
+            kind=Kind.REMOVED,
+            path=path + (old_index,),
+            old=old.data[old_index],
+            new=None,
+        ))
+
+    for old_index, new_index in zip(old_indexes, new_indexes):
+        items.append(
+            (path + (new_index,), old.data[old_index], new.data[new_index]),
+        )
+
+    for new_index in new_indexes[len(old_indexes):]:
+        items.append(Change(
+            kind=Kind.ADDED,
+            path=path + (new_index,),
+            old=None,
+            new=new.data[new_index],
+        ))
+
+    return items
@@ -7,3 +7,38 @@ class MetaloaderError(Exception):
 
 class MetaloaderNotImplemented(MetaloaderError):
     """Something is yet not implemented in the library."""
+
+
+class MetaloaderLimitExceeded(MetaloaderError):
+    """A document exceeded one of its `metaloaders.limits.Limits`.
+
+    `line` and `column` locate where, numbered like in `Node`.
+    """
+
+    def __init__(
+        self, limit: str, maximum: int, line: int, column: int,
+    ) -> None:
+        super().__init__(
+            f'Limit exceeded: {limit} of {maximum} '
+            f'at line {line} column {column}',
+        )
+        self.limit: str = limit
+        self.maximum: int = maximum
+        self.line: int = line
+        self.column: int = column
+
+
+class MetaloaderSyntaxError(MetaloaderError):
+    """A document is not well-formed.
+
+    `line` and `column` locate the first error, numbered like in `Node`,
+    and `offset` is its index in the text of the document.
+    """
+
+    def __init__(
+        self, message: str, line: int, column: int, offset: int,
+    ) -> None:
+        super().__init__(message)
+        self.line: int = line
+        self.column: int = column
+        self.offset: int = offset
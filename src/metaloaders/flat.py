@@ -0,0 +1,558 @@
+"""Flat binary serialization of `metaloaders.model.Node` trees.
+
+A loaded tree is written to a single contiguous buffer that another process
+can navigate without deserializing it, through shared memory or a file:
+
+    >>> from metaloaders.flat import FlatTree, dump
+    >>> from metaloaders.json import load
+
+    >>> buffer = dump(load('{"a": [1, 2]}'))
+
+    >>> tree = FlatTree(buffer)
+    >>> tree.root.inner['a'].raw
+        [1, 2]
+    >>> tree.root.inner['a'].start_column
+        6
+
+Layout, all integers are little-endian:
+
+- A header: magic `MLFT`, version, number of records, index of the root
+  record, offset and size of the string table, and offset of the key
+  table.
+- Fixed-size records, one per element, with a type tag, a value encoding,
+  the positions, a count, and a 64 bits value. The children of a container
+  are contiguous, and the value of a container is the index of the first
+  one. Objects hold `count` pairs of key and value records. Strings, bytes,
+  dates and big integers are stored in the string table, with the value
+  being an offset and the count a length.
+- The string table, where equal strings are stored once.
+- The key table, one 32 bits slot per record. The slots of the first
+  `count` children of an object hold its pair numbers sorted by key, so
+  `FlatNode.get` finds a key in O(log n) without decoding the others.
+
+Buffers are checked as they are read, truncated or corrupt ones raise
+`metaloaders.exceptions.MetaloaderError`.
+
+Plain values nested in a `Node`, like the ones built for CloudFormation
+intrinsics, are stored as records without positions and are read back
+as plain values. Digests are not stored.
+"""
+
+# Standard library
+from collections import (
+    deque,
+)
+from datetime import (
+    date,
+    datetime,
+)
+from multiprocessing import (
+    shared_memory,
+)
+import struct
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# Local libraries
+from metaloaders.buffers import (
+    Buffer,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+    plain_type,
+)
+
+# Constants
+MAGIC: bytes = b'MLFT'
+"""Identifies a flat tree buffer."""
+VERSION: int = 2
+"""Version of the layout."""
+HEADER = struct.Struct('<4sHHIIQQQ')
+"""Magic, version, reserved, records, root, strings offset, strings size,
+keys offset."""
+RECORD = struct.Struct('<BBHIIIIIQ')
+"""Type tag, encoding, reserved, start line, start column, end line,
+end column, count, value."""
+
+TYPES: Tuple[Type, ...] = tuple(Type)
+_TAGS: Dict[Type, int] = {
+    data_type: tag for tag, data_type in enumerate(TYPES)
+}
+
+# Value encodings
+_NULL, _BOOL, _INT, _FLOAT, _STR, _BYTES, _BIG_INT, _DATE, _DATETIME, \
+    _ARRAY, _OBJECT = range(11)
+_PLAIN = 0x80
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_DOUBLE = struct.Struct('<d')
+_SLOT = struct.Struct('<I')
+
+
+def dump(node: Node) -> bytes:
+    """Serialize a tree to the flat layout."""
+    strings: Dict[Union[str, bytes], int] = {}
+    table: List[bytes] = []
+    table_size = 0
+
+    def _string(value: Union[str, bytes]) -> Tuple[int, int]:
+        nonlocal table_size
+        encoded = value if isinstance(value, bytes) else value.encode(
+            'utf-8', 'surrogatepass',
+        )
+        offset = strings.get(value)
+        if offset is None:
+            offset = strings[value] = table_size
+            table.append(encoded)
+            table_size += len(encoded)
+        return offset, len(encoded)
+
+    records: List[bytes] = [b'']
+    slots: List[int] = [0]
+    queue: Deque[Tuple[int, Any]] = deque([(0, node)])
+    while queue:
+        index, value = queue.popleft()
+        if isinstance(value, Node):
+            positions: Tuple[int, int, int, int] = (
+                value.start_line,
+                value.start_column,
+                value.end_line,
+                value.end_column,
+            )
+            tag, flags, data = _TAGS[value.data_type], 0, value.data
+        else:
+            positions = (0, 0, 0, 0)
+            tag, flags, data = _TAGS[plain_type(value)], _PLAIN, value
+
+        encoding, count, payload, children = _encode(data, _string)
+        if children is not None:
+            first = len(records)
+            payload = first
+            records.extend(b'' for _ in children)
+            slots.extend(0 for _ in children)
+            queue.extend(zip(range(first, first + len(children)), children))
+            if encoding == _OBJECT:
+                keys = [_sort_key(key) for key in children[::2]]
+                slots[first:first + count] = sorted(
+                    range(count), key=keys.__getitem__,
+                )
+
+        records[index] = RECORD.pack(
+            tag, encoding | flags, 0, *positions, count, payload,
+        )
+
+    strings_offset = HEADER.size + RECORD.size * len(records)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(records),
+        0,
+        strings_offset,
+        table_size,
+        strings_offset + table_size,
+    )
+
+    return b''.join([
+        header,
+        *records,
+        *table,
+        struct.pack(f'<{len(slots)}I', *slots),
+    ])
+
+
+def _sort_key(value: Any) -> Tuple[int, bytes]:
+    # Order of object keys in the key table: encoding, then encoded bytes.
+    # Containers are not keys of loaded objects, they would go first
+    stored: List[bytes] = []
+
+    def _string(string: Union[str, bytes]) -> Tuple[int, int]:
+        stored.append(string if isinstance(string, bytes) else string.encode(
+            'utf-8', 'surrogatepass',
+        ))
+        return 0, 0
+
+    data = value.data if isinstance(value, Node) else value
+    encoding, _, payload, children = _encode(data, _string)
+    if children is not None:
+        return -1, b''
+    return encoding, stored[0] if stored else payload.to_bytes(8, 'little')
+
+
+def _encode(
+    data: Any,
+    string: Any,
+) -> Tuple[int, int, int, Optional[List[Any]]]:
+    encoding: int
+    count: int = 0
+    payload: int = 0
+    children: Optional[List[Any]] = None
+
+    if data is None:
+        encoding = _NULL
+    elif isinstance(data, bool):
+        encoding, payload = _BOOL, int(data)
+    elif isinstance(data, int) and _INT64_MIN <= data <= _INT64_MAX:
+        encoding, payload = _INT, data & 0xFFFFFFFFFFFFFFFF
+    elif isinstance(data, int):
+        encoding = _BIG_INT
+        payload, count = string(str(data))
+    elif isinstance(data, float):
+        encoding = _FLOAT
+        payload = int.from_bytes(_DOUBLE.pack(data), 'little')
+    elif isinstance(data, str):
+        encoding = _STR
+        payload, count = string(data)
+    elif isinstance(data, (bytes, bytearray)):
+        encoding = _BYTES
+        payload, count = string(bytes(data))
+    elif isinstance(data, datetime):
+        encoding = _DATETIME
+        payload, count = string(data.isoformat())
+    elif isinstance(data, date):
+        encoding = _DATE
+        payload, count = string(data.isoformat())
+    elif isinstance(data, (list, tuple)):
+        encoding, count, children = _ARRAY, len(data), list(data)
+    elif isinstance(data, dict):
+        encoding, count = _OBJECT, len(data)
+        children = [child for pair in data.items() for child in pair]
+    else:
+        raise MetaloaderError(f'Unable to serialize: {type(data)}')
+
+    return encoding, count, payload, children
+
+
+class FlatTree:
+    """Read-only view over a buffer written by `dump`.
+
+    The buffer can be `bytes`, a memory-mapped file or shared memory,
+    nothing is deserialized until accessed.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        self._buffer = memoryview(buffer)
+        self._shared_memory: Any = None
+
+        if len(self._buffer) < HEADER.size:
+            raise MetaloaderError('Invalid flat tree: truncated header')
+
+        magic, version, _, self.size, self._root, self._strings, \
+            self._strings_size, self._keys = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            raise MetaloaderError(f'Invalid flat tree: {magic!r} {version}')
+        if (
+            self._root >= self.size
+            or self._strings < HEADER.size + RECORD.size * self.size
+            or self._keys < self._strings + self._strings_size
+            or len(self._buffer) < self._keys + _SLOT.size * self.size
+        ):
+            raise MetaloaderError('Invalid flat tree: truncated')
+
+    @classmethod
+    def from_shared_memory(cls, name: str) -> 'FlatTree':
+        """Attach to the shared memory block created by `to_shared_memory`.
+        """
+        memory = shared_memory.SharedMemory(name=name)
+        tree = cls(memory.buf)
+        tree._shared_memory = memory  # pylint: disable=protected-access
+        return tree
+
+    @property
+    def root(self) -> 'FlatNode':
+        """The root element of the tree."""
+        return FlatNode(self, self._root)
+
+    def record(self, index: int) -> Tuple[int, ...]:
+        """Unpack the record at `index`, see `RECORD`."""
+        if not 0 <= index < self.size:
+            raise MetaloaderError(f'Invalid flat tree record: {index}')
+        record = RECORD.unpack_from(
+            self._buffer, HEADER.size + RECORD.size * index,
+        )
+        # Containers, and only them, have children
+        tag, encoding = record[0], record[1] & ~_PLAIN
+        if tag >= len(TYPES) or (
+            (TYPES[tag] is Type.ARRAY) != (encoding == _ARRAY)
+            or (TYPES[tag] is Type.OBJECT) != (encoding == _OBJECT)
+        ):
+            raise MetaloaderError(f'Invalid flat tree record: {index}')
+        return record
+
+    def slot(self, index: int) -> int:
+        """Return the key table slot of the record at `index`."""
+        if not 0 <= index < self.size:
+            raise MetaloaderError(f'Invalid flat tree record: {index}')
+        slot: int = _SLOT.unpack_from(
+            self._buffer, self._keys + _SLOT.size * index,
+        )[0]
+        return slot
+
+    def string(self, offset: int, size: int) -> bytes:
+        """Return `size` bytes from the string table at `offset`."""
+        if offset + size > self._strings_size:
+            raise MetaloaderError(f'Invalid flat tree string: {offset}')
+        start = self._strings + offset
+        return bytes(self._buffer[start:start + size])
+
+    def close(self) -> None:
+        """Release the buffer, and the shared memory block if attached."""
+        self._buffer.release()
+        if self._shared_memory is not None:
+            self._shared_memory.close()
+
+    def __enter__(self) -> 'FlatTree':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class FlatNode:
+    """An element of a `FlatTree`, navigable like a `Node`."""
+
+    __slots__ = ('tree', 'index', '_record')
+
+    def __init__(self, tree: FlatTree, index: int) -> None:
+        self.tree: FlatTree = tree
+        self.index: int = index
+        self._record: Tuple[int, ...] = tree.record(index)
+
+    @property
+    def data_type(self) -> Type:
+        """Defines the inner element type."""
+        return TYPES[self._record[0]]
+
+    @property
+    def start_line(self) -> int:
+        """Start line for the element."""
+        return self._record[3]
+
+    @property
+    def start_column(self) -> int:
+        """Start column for the element."""
+        return self._record[4]
+
+    @property
+    def end_line(self) -> int:
+        """End line for the element."""
+        return self._record[5]
+
+    @property
+    def end_column(self) -> int:
+        """End column for the element."""
+        return self._record[6]
+
+    @property
+    def plain(self) -> bool:
+        """Whether the element was a plain value and not a `Node`."""
+        return bool(self._record[1] & _PLAIN)
+
+    @property
+    def data(self) -> Any:
+        """Contains the inner element data, like `Node.data`."""
+        encoding = self._record[1] & ~_PLAIN
+        count, payload = self._record[7], self._record[8]
+
+        if encoding == _ARRAY:
+            return [_value(val) for val in self._children()]
+        if encoding == _OBJECT:
+            return {_value(key): _value(val) for key, val in self.items()}
+
+        return self._scalar(encoding, count, payload)
+
+    @property
+    def inner(self) -> Any:
+        """Access the wrapped data, like `Node.inner`."""
+        if self.data_type is Type.ARRAY:
+            return [val.data for val in self._children()]
+        if self.data_type is Type.OBJECT:
+            return {key.data: _value(val) for key, val in self.items()}
+        return self.data
+
+    @property
+    def raw(self) -> Any:
+        """Access the wrapped data recursing into sub-objects, like
+        `Node.raw`."""
+        if self.data_type is Type.ARRAY:
+            return [val.raw for val in self._children()]
+        if self.data_type is Type.OBJECT:
+            return {key.raw: val.raw for key, val in self.items()}
+        return self.data
+
+    @property
+    def sort_key(self) -> Tuple[int, bytes]:
+        """Order of the element among the keys of an object, the key table
+        is sorted by it."""
+        encoding = self._record[1] & ~_PLAIN
+        count, payload = self._record[7], self._record[8]
+        if encoding in {_ARRAY, _OBJECT}:
+            return -1, b''
+        if encoding in {_STR, _BYTES, _BIG_INT, _DATE, _DATETIME}:
+            return encoding, self.tree.string(payload, count)
+        return encoding, payload.to_bytes(8, 'little')
+
+    def items(self) -> Iterator[Tuple['FlatNode', 'FlatNode']]:
+        """Iterate over the key and value pairs of an object."""
+        children = self._children()
+        for key, val in zip(children, children):
+            if key.data_type in {Type.ARRAY, Type.OBJECT}:
+                raise MetaloaderError(f'Invalid flat tree key: {key.index}')
+            yield key, val
+
+    def get(self, key: Any) -> Optional['FlatNode']:
+        """Return the value of an object under `key`, or None if missing.
+
+        Keys are matched by type and value, with a binary search over the
+        key table. Of duplicated keys, the last one is found.
+        """
+        if self._record[1] & ~_PLAIN != _OBJECT:
+            return None
+        try:
+            wanted = _sort_key(key)
+        except MetaloaderError:
+            return None
+        if wanted[0] < 0:
+            return None
+
+        count, first = self._record[7], self._record[8]
+        if count and first <= self.index:
+            raise MetaloaderError(f'Invalid flat tree children: {first}')
+        # The rightmost match, duplicated keys are sorted in document order
+        # and the last one wins, like in `Node.inner`
+        low, high, pair = 0, count, None
+        while low < high:
+            middle = (low + high) // 2
+            slot = self.tree.slot(first + middle)
+            if slot >= count:
+                raise MetaloaderError(f'Invalid flat tree key: {slot}')
+            found = FlatNode(self.tree, first + 2 * slot).sort_key
+            if found <= wanted:
+                low = middle + 1
+                pair = slot if found == wanted else pair
+            else:
+                high = middle
+        return None if pair is None else FlatNode(
+            self.tree, first + 2 * pair + 1,
+        )
+
+    def to_node(self) -> Any:
+        """Deserialize this element and its descendants to a `Node`."""
+        data: Any
+        if self.data_type is Type.ARRAY:
+            data = [val.to_node() for val in self._children()]
+        elif self.data_type is Type.OBJECT:
+            data = {key.to_node(): val.to_node() for key, val in self.items()}
+        else:
+            data = self.data
+
+        if self.plain:
+            return data
+
+        return Node(
+            data=data,
+            data_type=self.data_type,
+            end_column=self.end_column,
+            end_line=self.end_line,
+            start_column=self.start_column,
+            start_line=self.start_line,
+        )
+
+    def __len__(self) -> int:
+        if self.data_type not in {Type.ARRAY, Type.OBJECT}:
+            raise TypeError(f'{self.data_type} has no length')
+        return self._record[7]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FlatNode) and (
+            self.tree is other.tree and self.index == other.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f'FlatNode(index={self.index}, data_type={self.data_type})'
+
+    def _children(self) -> Iterator['FlatNode']:
+        encoding = self._record[1] & ~_PLAIN
+        count, first = self._record[7], self._record[8]
+        if encoding == _OBJECT:
+            count *= 2
+        elif encoding != _ARRAY:
+            count = 0
+        if count and first <= self.index:
+            # Children come after their parent, otherwise there could be
+            # cycles
+            raise MetaloaderError(f'Invalid flat tree children: {first}')
+
+        for index in range(first, first + count):
+            yield FlatNode(self.tree, index)
+
+    def _scalar(self, encoding: int, count: int, payload: int) -> Any:
+        try:
+            return self._decode(encoding, count, payload)
+        except ValueError as exc:
+            # Decoding errors of strings, numbers and dates included
+            raise MetaloaderError(f'Invalid flat tree value: {exc}')
+
+    def _decode(self, encoding: int, count: int, payload: int) -> Any:
+        value: Any
+        if encoding == _NULL:
+            value = None
+        elif encoding == _BOOL:
+            value = bool(payload)
+        elif encoding == _INT:
+            value = payload - (1 << 64) if payload > _INT64_MAX else payload
+        elif encoding == _FLOAT:
+            value = _DOUBLE.unpack(payload.to_bytes(8, 'little'))[0]
+        elif encoding == _STR:
+            value = self.tree.string(payload, count).decode(
+                'utf-8', 'surrogatepass',
+            )
+        elif encoding == _BYTES:
+            value = self.tree.string(payload, count)
+        elif encoding == _BIG_INT:
+            value = int(self.tree.string(payload, count))
+        elif encoding == _DATETIME:
+            value = datetime.fromisoformat(
+                self.tree.string(payload, count).decode(),
+            )
+        elif encoding == _DATE:
+            value = date.fromisoformat(
+                self.tree.string(payload, count).decode(),
+            )
+        else:
+            raise MetaloaderError(f'Invalid flat tree encoding: {encoding}')
+
+        return value
+
+
+def _value(node: FlatNode) -> Any:
+    # Plain scalars are read back as such, like they were in the `Node`
+    if node.plain and node.data_type not in {Type.ARRAY, Type.OBJECT}:
+        return node.data
+    return node
+
+
+def to_shared_memory(node: Node) -> Any:
+    """Serialize a tree into a new `multiprocessing.shared_memory` block.
+
+    Other processes attach to it with `FlatTree.from_shared_memory` and the
+    block name. The caller owns the block and must unlink it when done.
+    """
+    buffer = dump(node)
+    memory = shared_memory.SharedMemory(create=True, size=len(buffer))
+    memory.buf[:len(buffer)] = buffer
+    return memory
@@ -0,0 +1,254 @@
+"""Opt-in instrumentation of loads.
+
+Every load within an `instrument` block is reported as a `Record`:
+the time spent on each phase of its engine, the nodes built by type and
+the size of the document:
+
+    >>> from metaloaders.instrumentation import instrument
+    >>> from metaloaders.json import load
+
+    >>> with instrument() as records:
+    ...     load('{"a": [1, 2]}')
+
+    >>> records[0].phases
+        {'scan': 2.4e-05}
+    >>> records[0].nodes
+        {'ARRAY': 1, 'NUMBER': 2, 'OBJECT': 1, 'STRING': 1}
+
+Records can also be handed to a callback as they are produced, for instance
+to send them to a metrics pipeline as plain dictionaries:
+
+    >>> with instrument(lambda record: send(record._asdict())):
+    ...     load('{"a": [1, 2]}')
+
+The peak of memory allocated by every load is measured with `tracemalloc`
+if `memory` is set, which slows loads down noticeably. Tracing starts with
+the first such load and stops with the last one running, unless it was
+already started by someone else, who is left to stop it. Peaks are
+process-wide, so loads in other threads at the same time count as well.
+
+Phases of the built-in engines are:
+
+- `json` `lark`: `grammar`, its analysis on the first load, `parse`,
+  lexing and parsing, which lark interleaves, and `build`, the conversion
+  of the parse tree to nodes.
+- `json` `scanner`: `scan`, tokens and nodes are built in a single pass.
+- `yaml` `python`: `compose`, scanning, parsing and composing, which
+  ruamel.yaml interleaves, `position` with positions granularity, see
+  `metaloaders.positions`, and `construct`, the conversion to nodes.
+- `yaml` `libyaml`: `read`, `compose`, `align`, see `metaloaders.yaml`,
+  and `construct`.
+
+Blocks apply to loads in every thread. Outside of them a load only checks
+whether any block is active.
+"""
+
+# Standard library
+from contextlib import (
+    contextmanager,
+)
+import threading
+from time import (
+    perf_counter,
+)
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Local libraries
+from metaloaders.backends import (
+    Engine,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+# State
+_LISTENERS: List[Tuple[Callable[['Record'], None], bool]] = []
+_LOCAL = threading.local()
+_LOCK = threading.Lock()
+
+
+class Record(NamedTuple):
+    """Measurements of a single load."""
+    fmt: str
+    """Format of the document."""
+    engine: str
+    """Name of the engine that loaded it, see `metaloaders.backends`."""
+    size: int
+    """Size of the document, in characters."""
+    seconds: float
+    """Wall time of the whole load."""
+    phases: Dict[str, float]
+    """Wall time of every phase of the engine."""
+    nodes: Dict[str, int]
+    """Nodes in the resulting tree by `metaloaders.model.Type` value."""
+    peak_memory: Optional[int] = None
+    """Peak of bytes allocated while loading, if measured."""
+    error: Optional[str] = None
+    """Error the load raised, if any."""
+
+
+class _Tracing:
+    """Loads measuring memory, `tracemalloc` is on while there is any."""
+
+    def __init__(self) -> None:
+        self.loads: int = 0
+        self.started: bool = False
+        """Whether tracing was started by a load, and not by someone else.
+        """
+
+    def enter(self) -> bool:
+        """Account for a load, return whether its peak can be measured."""
+        with _LOCK:
+            self.loads += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started = True
+                return True
+            if hasattr(tracemalloc, 'reset_peak'):
+                # Python 3.9+
+                tracemalloc.reset_peak()  # type: ignore
+                return True
+            return False
+
+    def leave(self) -> None:
+        """Stop tracing after the last load, if a load started it."""
+        with _LOCK:
+            self.loads -= 1
+            if self.loads == 0 and self.started:
+                tracemalloc.stop()
+                self.started = False
+
+
+class _Recording:
+    """Phases of the load in progress in a thread."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.last: float = perf_counter()
+
+
+@contextmanager
+def instrument(
+    callback: Optional[Callable[[Record], None]] = None,
+    *,
+    memory: bool = False,
+) -> Iterator[List[Record]]:
+    """Record every load within a `with` block.
+
+    The block gets the list of records, `callback` is called with every
+    record as well when given.
+    """
+    records: List[Record] = []
+
+    def listener(record: Record) -> None:
+        records.append(record)
+        if callback is not None:
+            callback(record)
+
+    entry = (listener, memory)
+    with _LOCK:
+        _LISTENERS.append(entry)
+    try:
+        yield records
+    finally:
+        with _LOCK:
+            _LISTENERS.remove(entry)
+
+
+def mark(phase: str) -> None:
+    """Attribute the time since the previous mark to `phase`.
+
+    Engines call this at the end of every phase, it does nothing unless
+    the load is being recorded.
+    """
+    if _LISTENERS:
+        recording: Optional[_Recording] = getattr(_LOCAL, 'recording', None)
+        if recording is not None:
+            now = perf_counter()
+            recording.phases[phase] = (
+                recording.phases.get(phase, 0.0) + now - recording.last
+            )
+            recording.last = now
+
+
+def run(engine: Engine, size: int, stream: Any, **kwargs: Any) -> Node:
+    """Load `stream` of `size` characters with `engine`, recording it if
+    any `instrument` block is active.
+    """
+    if not _LISTENERS:
+        return engine.load(stream, **kwargs)
+
+    with _LOCK:
+        listeners = tuple(_LISTENERS)
+    memory = any(traced for _, traced in listeners)
+    measured = memory and _TRACING.enter()
+    allocated, _ = tracemalloc.get_traced_memory()
+    peak_memory: Optional[int] = None
+
+    previous = getattr(_LOCAL, 'recording', None)
+    recording = _LOCAL.recording = _Recording()
+    start = recording.last
+    node: Optional[Node] = None
+    error: Optional[str] = None
+    try:
+        node = engine.load(stream, **kwargs)
+        return node
+    except Exception as exc:
+        error = f'{type(exc).__name__}: {exc}'
+        raise
+    finally:
+        seconds = perf_counter() - start
+        _LOCAL.recording = previous
+
+        if measured:
+            peak_memory = tracemalloc.get_traced_memory()[1] - allocated
+        if memory:
+            _TRACING.leave()
+
+        record = Record(
+            fmt=engine.fmt,
+            engine=engine.name,
+            size=size,
+            seconds=seconds,
+            phases=recording.phases,
+            nodes={} if node is None else _count(node),
+            peak_memory=peak_memory,
+            error=error,
+        )
+        for listener, _ in listeners:
+            listener(record)
+
+
+def _count(node: Node) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    stack: List[Any] = [node]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, Node):
+            # Plain values, for instance in CloudFormation intrinsics
+            continue
+
+        data_type = current.data_type.value
+        counts[data_type] = counts.get(data_type, 0) + 1
+        if current.data_type is Type.ARRAY:
+            stack.extend(current.data)
+        elif current.data_type is Type.OBJECT:
+            stack.extend(current.data.keys())
+            stack.extend(current.data.values())
+
+    return dict(sorted(counts.items()))
+
+
+# Side effects
+_TRACING = _Tracing()
@@ -0,0 +1,81 @@
+"""Bounded string interning shared across loads.
+
+Documents of the same family repeat the same keys and short values over and
+over, for instance `Type`, `Properties` or `AWS::S3::Bucket` in CloudFormation
+templates. By default every occurrence is stored as a separate `str` object.
+
+An `Interner` can be passed to the loaders so equal strings share one object:
+
+    >>> from metaloaders.interning import Interner
+    >>> from metaloaders.json import load
+
+    >>> interner = Interner()
+    >>> first = load('{"Type": "AWS::S3::Bucket"}', interner=interner)
+    >>> second = load('{"Type": "AWS::S3::Bucket"}', interner=interner)
+
+    >>> first.raw['Type'] is second.raw['Type']
+        True
+
+The table is bounded, the least recently used strings are evicted first.
+It is guarded by a lock, so one interner can be shared by loads running in
+several threads, for instance by `metaloaders.project.load` with an
+executor.
+"""
+
+# Standard library
+from collections import (
+    OrderedDict,
+)
+import threading
+
+
+class Interner:
+    """Table of shared strings with a bounded size and LRU eviction.
+
+    - `max_size` is the maximum number of strings kept in the table.
+    - `max_length` is the length above which strings are not interned,
+      long values rarely repeat and would only pollute the table.
+    """
+
+    def __init__(self, max_size: int = 65536, max_length: int = 128) -> None:
+        if max_size < 1:
+            raise ValueError(f'max_size must be positive: {max_size}')
+
+        self.max_size: int = max_size
+        self.max_length: int = max_length
+        self.hits: int = 0
+        self.misses: int = 0
+        self._table: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        """Return the shared object equal to `value`, registering it if new.
+        """
+        if len(value) > self.max_length:
+            return value
+
+        with self._lock:
+            shared = self._table.get(value)
+            if shared is None:
+                self.misses += 1
+                self._table[value] = value
+                if len(self._table) > self.max_size:
+                    self._table.popitem(last=False)
+                return value
+
+            self.hits += 1
+            self._table.move_to_end(value)
+            return shared
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def clear(self) -> None:
+        """Drop every shared string and reset the statistics."""
+        with self._lock:
+            self._table.clear()
+            self.hits = 0
+            self.misses = 0
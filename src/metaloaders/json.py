@@ -53,22 +53,77 @@ Every JSON token contains all possible metadata:
 """
 # Standard library
 import ast
+from bisect import (
+    bisect_right,
+)
+from contextlib import (
+    suppress,
+)
+from functools import (
+    lru_cache,
+)
+from itertools import (
+    accumulate,
+)
+from json import (
+    decoder as json_decoder,
+)
+from json.decoder import (
+    JSONDecoder,
+)
+import re
 from typing import (
     Any,
+    Callable,
+    Dict,
+    List,
+    NoReturn,
     Optional,
+    Tuple,
 )
 
-# Third party libraries
-import lark
-
 # Local libraries
+from metaloaders.backends import (
+    Engine,
+    register,
+    select,
+)
+from metaloaders.buffers import (
+    Buffer,
+    TextReader,
+    decode,
+    open_buffer,
+)
 from metaloaders.exceptions import (
     MetaloaderError,
+    MetaloaderSyntaxError,
+)
+from metaloaders.hashing import (
+    digest,
+)
+from metaloaders.instrumentation import (
+    mark,
+    run,
+)
+from metaloaders.interning import (
+    Interner,
+)
+from metaloaders.limits import (
+    Guard,
+    Limits,
+    check_size,
 )
 from metaloaders.model import (
     Node,
     Type,
 )
+from metaloaders.positions import (
+    Granularity,
+    granularity,
+)
+from metaloaders.sharing import (
+    SubtreeTable,
+)
 
 # Constants
 GRAMMAR = r"""
@@ -94,43 +149,615 @@ GRAMMAR = r"""
 
     %ignore WS
 """
+# C accelerated string decoder, not in the stubs of every Python version
+_SCANSTRING: Callable[[str, int, bool], Tuple[str, int]] = getattr(
+    json_decoder, 'scanstring',
+)
+# Tokens of the grammar, the way its lexer matches them
+_NUMBER = re.compile(
+    r'[+-]?(?:[0-9]+[eE][+-]?[0-9]+'
+    r'|(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?'
+    r'|[0-9]+)'
+)
+_STRING = re.compile(r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"')
+_WS = re.compile(r'[ \t\f\r\n]*')
+_ARRAY_NEXT = re.compile(r'[ \t\f\r\n]*(?:,[ \t\f\r\n]*|(\]))')
+_COLON = re.compile(r'[ \t\f\r\n]*:[ \t\f\r\n]*')
+_OBJECT_NEXT = re.compile(r'[ \t\f\r\n]*(?:,[ \t\f\r\n]*|(\}))')
+_LITERALS = (
+    ('true', True, Type.BOOLEAN),
+    ('false', False, Type.BOOLEAN),
+    ('null', None, Type.NULL),
+)
+# Values are Python literals, only these are not JSON alike
+_INTEGER = re.compile(r'[+-]?(?:[1-9][0-9]*|0+)')
+_NOT_JSON_STRING = re.compile(
+    r'[\r\0\ud800-\udfff]'
+    r'|\\(?:[^"\\bfnrtu]|u(?:[dD][89a-fA-F]|(?![0-9a-fA-F]{4})))'
+)
+# Characters that continue a JSON number into a longer grammar token
+_NUMBER_TAIL = re.compile(r'[0-9.eE]')
+# Characters the C accelerated decoder takes that the grammar rejects
+_SURROGATE = re.compile(r'[\ud800-\udfff]')
+# Engines recurse once per nesting level
+_TOO_DEEP = 'Unable to parse stream: too deeply nested'
 
 
-def load(stream: str) -> Node:
+def load(
+    stream: str,
+    *,
+    engine: Optional[str] = None,
+    interner: Optional[Interner] = None,
+    share: bool = False,
+    digests: bool = False,
+    limits: Optional[Limits] = None,
+    positions: str = 'all',
+    max_position_depth: Optional[int] = None,
+) -> Node:
     """Loads a string representation of a document.
 
+    The parsing engine is chosen by `engine` when given,
+    see `metaloaders.backends`.
+
+    Strings are shared through `interner` when given,
+    see `metaloaders.interning`.
+
+    Identical subtrees without nested nodes share storage if `share` is
+    set, see `metaloaders.sharing`.
+
+    Every node carries its structural hash if `digests` is set,
+    see `metaloaders.hashing`.
+
+    Resources are bounded by `limits` when given, see `metaloaders.limits`.
+
+    Only some elements are nodes if `positions` or `max_position_depth`
+    are set, see `metaloaders.positions`.
+
     Raises `metaloaders.exceptions.MetaloaderError` if any parsing error occur.
     """
-    parser = lark.Lark(
-        grammar=GRAMMAR,
-        parser='lalr',
-        propagate_positions=True,
+    granularity(positions, max_position_depth)
+    if limits is not None:
+        check_size(stream, limits)
+
+    options = {
+        'share': share, 'digests': digests, 'limits': limits is not None,
+    }
+    size = len(stream)
+    return run(
+        select(
+            'json',
+            engine,
+            size=size,
+            options=[option for option, value in options.items() if value],
+        ),
+        size,
+        stream,
+        interner=interner,
+        share=share,
+        digests=digests,
+        limits=limits,
+        positions=positions,
+        max_position_depth=max_position_depth,
     )
 
+
+def check_syntax(stream: str) -> None:
+    """Scans a string representation of a document without loading it.
+
+    Documents the C accelerated `json` decoder takes are checked by it,
+    which is the case of most valid documents, and the others by the
+    `scanner` engine, without building nodes.
+
+    Raises `metaloaders.exceptions.MetaloaderSyntaxError` at the first error
+    the `scanner` engine would raise, and
+    `metaloaders.exceptions.MetaloaderError` if the document is nested too
+    deeply to be checked.
+    """
+    position = _WS.match(stream).end()  # type: ignore
     try:
+        with suppress(ValueError):
+            _, end = _DECODER.raw_decode(stream, position)
+            if (
+                _WS.match(stream, end).end() == len(stream)  # type: ignore
+                and _SURROGATE.search(stream) is None
+            ):
+                return
+
+        checker = _Checker(stream, None, None, False)
+        _, position = checker.value(position)
+    except RecursionError:
+        raise MetaloaderError(_TOO_DEEP)
+    if _WS.match(stream, position).end() != len(stream):  # type: ignore
+        checker.fail(position)
+
+
+def load_bytes(buffer: Buffer, **kwargs: Any) -> Node:
+    """Loads a document from a bytes-like object or memory-mapped buffer.
+
+    The parser needs the whole text, so the buffer is decoded at once but
+    without intermediate copies. Keyword arguments are the ones of `load`.
+    """
+    if kwargs.get('limits') is not None:
+        # Before decoding it
+        with TextReader(buffer) as reader:
+            check_size(reader, kwargs['limits'])
+
+    return load(decode(buffer), **kwargs)
+
+
+def load_file(path: str, **kwargs: Any) -> Node:
+    """Loads a document from the file at `path`, which is memory-mapped.
+
+    Keyword arguments are the ones of `load`.
+    """
+    with open_buffer(path) as buffer:
+        return load_bytes(buffer, **kwargs)
+
+
+def _load_lark(
+    stream: str,
+    *,
+    interner: Optional[Interner] = None,
+    share: bool = False,
+    digests: bool = False,
+    positions: str = 'all',
+    max_position_depth: Optional[int] = None,
+    **_: Any,
+) -> Node:
+    # Lark is imported on first use, it is slow to import
+    import lark  # pylint: disable=import-outside-toplevel
+
+    try:
+        parser = _parser()
+        mark('grammar')
         obj = parser.parse(stream)
+        mark('parse')
+        subtrees = SubtreeTable() if share else None
+        data: Node = _simplify(
+            obj,
+            interner,
+            subtrees,
+            digests,
+            granularity(positions, max_position_depth),
+        )
+        mark('build')
     except lark.exceptions.LarkError as exc:
         raise MetaloaderError(f'Unable to parse stream: {exc}')
+    except (SyntaxError, ValueError) as exc:
+        # Tokens the grammar accepts that are not valid Python literals
+        raise MetaloaderError(f'Unable to parse stream: {exc}')
+    except RecursionError:
+        raise MetaloaderError(_TOO_DEEP)
     else:
-        data: Node = _simplify(obj)
         return data
 
 
-def _simplify(obj: Any) -> Any:
+def _load_scanner(
+    stream: str,
+    *,
+    interner: Optional[Interner] = None,
+    share: bool = False,
+    digests: bool = False,
+    limits: Optional[Limits] = None,
+    positions: str = 'all',
+    max_position_depth: Optional[int] = None,
+) -> Node:
+    subtrees = SubtreeTable() if share else None
+    partial = granularity(positions, max_position_depth)
+    scanner: _Scanner
+    if partial is None:
+        scanner = (
+            _Scanner(stream, interner, subtrees, digests)
+            if limits is None
+            else _GuardedScanner(stream, interner, subtrees, digests, limits)
+        )
+    elif limits is None:
+        scanner = _PartialScanner(
+            stream, interner, subtrees, digests, partial=partial,
+        )
+    else:
+        scanner = _GuardedPartialScanner(
+            stream, interner, subtrees, digests, limits, partial=partial,
+        )
+    try:
+        node, position = scanner.value(
+            _WS.match(stream).end(),  # type: ignore
+        )
+    except RecursionError:
+        raise MetaloaderError(_TOO_DEEP)
+    if _WS.match(stream, position).end() != len(stream):  # type: ignore
+        scanner.fail(position)
+    mark('scan')
+    return node
+
+
+class _Scanner:
+    """Recursive descent over the grammar tokens.
+
+    Offsets are translated to lines and columns with an index of the
+    offsets where lines start. Strings and numbers are decoded as the lark
+    engine does, with the C accelerated `json.decoder.scanstring`, `int`
+    and `float` whenever they give the same result as `ast.literal_eval`.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        interner: Optional[Interner],
+        subtrees: Optional[SubtreeTable],
+        digests: bool,
+    ) -> None:
+        self.stream = stream
+        self.interner = interner
+        self.subtrees = subtrees
+        self.digests = digests
+        self.lines: List[int] = [0]
+        self.lines.extend(
+            accumulate(map((1).__add__, map(len, stream.split('\n')))),
+        )
+
+    def fail(self, position: int, reason: Optional[str] = None) -> NoReturn:
+        """Raise an error for the token after white space at `position`.
+
+        The reason defaults to the token being unexpected.
+        """
+        position = _WS.match(self.stream, position).end()  # type: ignore
+        token = self.stream[position:position + 1] or 'end of stream'
+        line, column = self.position(position)
+        raise MetaloaderSyntaxError(
+            f'Unable to parse stream: {reason}'
+            if reason is not None
+            else f'Unable to parse stream: unexpected {token!r} '
+            f'at line {line} column {column + 1}',
+            line,
+            column,
+            position,
+        )
+
+    def convert(
+        self, function: Callable[[str], Any], token: str, position: int,
+    ) -> Any:
+        """Return `function` of the `token` at `position`, failing on errors.
+        """
+        try:
+            return function(token)
+        except (SyntaxError, ValueError) as exc:
+            self.fail(position, str(exc))
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Return the line and column of the character at `offset`."""
+        line = bisect_right(self.lines, offset)
+        return line, offset - self.lines[line - 1]
+
+    def node(self, data: Any, data_type: Type, start: int, end: int) -> Node:
+        """Build the node of the token or rule between `start` and `end`.
+        """
+        lines = self.lines
+        start_line = bisect_right(lines, start)
+        end_line = (
+            start_line
+            if end < lines[start_line]
+            else bisect_right(lines, end - 1)
+        )
+        # Positional arguments, this is the hottest path of the engine
+        node = Node(
+            data,
+            data_type,
+            end - lines[end_line - 1],
+            end_line,
+            start - lines[start_line - 1],
+            start_line,
+            digest(data, data_type) if self.digests else None,
+        )
+        return node if self.subtrees is None else self.subtrees.share(node)
+
+    def value(self, position: int) -> Tuple[Node, int]:
+        """Scan the value at `position`, return it and where it ends."""
+        stream = self.stream
+        char = stream[position:position + 1]
+
+        if char == '"':
+            return self.string(position)
+        if char == '{':
+            return self.object(position)
+        if char == '[':
+            return self.array(position)
+
+        data, data_type, end = self.scalar(position)
+        return self.node(data, data_type, position, end), end
+
+    def scalar(self, position: int) -> Tuple[Any, Type, int]:
+        """Scan the number or literal at `position`, return its data, type
+        and where it ends.
+        """
+        stream = self.stream
+        for literal, value, value_type in _LITERALS:
+            if stream.startswith(literal, position):
+                return value, value_type, position + len(literal)
+
+        match = _NUMBER.match(stream, position)
+        if match is None:
+            self.fail(position)
+
+        token = match.group()
+        data: Any
+        if token.isdigit() or token[1:].isdigit():
+            # Python rejects leading zeros, like the lark engine does
+            convert: Callable[[str], Any] = ast.literal_eval
+            if _INTEGER.fullmatch(token):
+                convert = int
+            data = self.convert(convert, token, position)
+        else:
+            data = float(token)
+
+        return data, Type.NUMBER, match.end()
+
+    def string(self, position: int) -> Tuple[Node, int]:
+        """Scan the string at `position`, return it and where it ends."""
+        data, end = self.text(position)
+        return self.node(data, Type.STRING, position, end), end
+
+    def text(self, position: int) -> Tuple[str, int]:
+        """Decode the string at `position`, return it and where it ends."""
+        match = _STRING.match(self.stream, position)
+        if match is None:
+            self.fail(position)
+
+        token = match.group()
+        data: str
+        if _NOT_JSON_STRING.search(token) is not None:
+            data = self.convert(ast.literal_eval, token, position)
+        elif '\\' in token:
+            data = _SCANSTRING(token, 1, False)[0]
+        else:
+            data = token[1:-1]
+
+        if self.interner is not None:
+            data = self.interner(data)
+
+        return data, match.end()
+
+    def array(self, position: int) -> Tuple[Node, int]:
+        """Scan the array at `position`, return it and where it ends."""
+        stream = self.stream
+        data: List[Node] = []
+        start = position
+        position = _WS.match(stream, position + 1).end()  # type: ignore
+
+        if stream.startswith(']', position):
+            position += 1
+        else:
+            while True:
+                val, position = self.value(position)
+                data.append(val)
+                match = _ARRAY_NEXT.match(stream, position)
+                if match is None:
+                    self.fail(position)
+                position = match.end()
+                if match.group(1) is not None:
+                    break
+
+        return self.node(data, Type.ARRAY, start, position), position
+
+    def object(self, position: int) -> Tuple[Node, int]:
+        """Scan the object at `position`, return it and where it ends."""
+        stream = self.stream
+        data: Dict[Node, Node] = {}
+        start = position
+        position = _WS.match(stream, position + 1).end()  # type: ignore
+
+        if stream.startswith('}', position):
+            position += 1
+        else:
+            while True:
+                if not stream.startswith('"', position):
+                    self.fail(position)
+                key, position = self.string(position)
+                match = _COLON.match(stream, position)
+                if match is None:
+                    self.fail(position)
+                val, position = self.value(match.end())
+                data[key] = val
+                match = _OBJECT_NEXT.match(stream, position)
+                if match is None:
+                    self.fail(position)
+                position = match.end()
+                if match.group(1) is not None:
+                    break
+
+        return self.node(data, Type.OBJECT, start, position), position
+
+
+class _GuardedScanner(_Scanner):
+    """Scanner that enforces limits as it goes, see `metaloaders.limits`.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        interner: Optional[Interner],
+        subtrees: Optional[SubtreeTable],
+        digests: bool,
+        limits: Limits,
+    ) -> None:
+        super().__init__(stream, interner, subtrees, digests)
+        self.guard = Guard(limits)
+
+    def scalar(self, position: int) -> Tuple[Any, Type, int]:
+        """Account for the number or literal at `position`, and scan it."""
+        line, column = self.position(position)
+        self.guard.node(1, line, column)
+        match = _NUMBER.match(self.stream, position)
+        if match is not None:
+            self.guard.scalar(match.end() - position, line, column)
+        return super().scalar(position)
+
+    def text(self, position: int) -> Tuple[str, int]:
+        """Account for the string at `position`, and decode it."""
+        line, column = self.position(position)
+        self.guard.node(1, line, column)
+        match = _STRING.match(self.stream, position)
+        if match is not None:
+            self.guard.scalar(match.end() - position - 2, line, column)
+        return super().text(position)
+
+    def array(self, position: int) -> Tuple[Node, int]:
+        """Account for the array at `position`, and scan it."""
+        line, column = self.position(position)
+        self.guard.node(1, line, column)
+        self.guard.enter(line, column)
+        result = super().array(position)
+        self.guard.leave()
+        return result
+
+    def object(self, position: int) -> Tuple[Node, int]:
+        """Account for the object at `position`, and scan it."""
+        line, column = self.position(position)
+        self.guard.node(1, line, column)
+        self.guard.enter(line, column)
+        result = super().object(position)
+        self.guard.leave()
+        return result
+
+
+class _Partial(_Scanner):
+    """Scanner that builds nodes only for some elements, and plain values
+    for the others, see `metaloaders.positions`.
+
+    Plain arrays and objects are decoded at once by the C accelerated
+    `json` decoder whenever it gives the same result. Otherwise, and if
+    strings are interned or limits enforced, nodes are built as usual and
+    converted.
+    """
+
+    def __init__(self, *args: Any, partial: Granularity) -> None:
+        super().__init__(*args)
+        self.partial = partial
+        self.depth = 0
+        """Nesting level of the element being scanned."""
+        self.exact = False
+        """Whether nodes are being built for a plain value."""
+
+    def value(self, position: int) -> Tuple[Any, int]:
+        """Scan the value at `position`, as a node if positioned."""
+        char = self.stream[position:position + 1]
+        container = char in {'[', '{'}
+        if self.exact or self.partial.positioned(
+            container, False, self.depth,
+        ):
+            return super().value(position)
+        if container:
+            return self.plain(position)
+        if char == '"':
+            return self.text(position)
+
+        data, _, end = self.scalar(position)
+        return data, end
+
+    def string(self, position: int) -> Tuple[Any, int]:
+        """Scan the key at `position`, as a node if positioned.
+
+        Strings that are not keys only get here if positioned.
+        """
+        if self.exact or self.partial.positioned(False, True, self.depth):
+            return super().string(position)
+        return self.text(position)
+
+    def array(self, position: int) -> Tuple[Node, int]:
+        """Scan the array at `position`, one level deeper."""
+        self.depth += 1
+        result = super().array(position)
+        self.depth -= 1
+        return result
+
+    def object(self, position: int) -> Tuple[Node, int]:
+        """Scan the object at `position`, one level deeper."""
+        self.depth += 1
+        result = super().object(position)
+        self.depth -= 1
+        return result
+
+    def plain(self, position: int) -> Tuple[Any, int]:
+        """Scan the array or object at `position` as a plain value."""
+        if self.interner is None and not isinstance(self, _GuardedScanner):
+            with suppress(ValueError):
+                data, end = _DECODER.raw_decode(self.stream, position)
+                if (
+                    _NUMBER_TAIL.match(self.stream, end) is None
+                    and _NOT_JSON_STRING.search(self.stream, position, end)
+                    is None
+                ):
+                    return data, end
+
+        self.exact = True
+        node, end = super().value(position)
+        self.exact = False
+        return node.raw, end
+
+
+class _Checker(_Scanner):
+    """Scanner that checks the grammar without building nodes."""
+
+    def node(self, data: Any, data_type: Type, start: int, end: int) -> Any:
+        """Build nothing, positions are only needed on errors."""
+        return None
+
+
+class _PartialScanner(_Partial):
+    """Scanner with the granularity of `_Partial`."""
+
+
+class _GuardedPartialScanner(_Partial, _GuardedScanner):
+    """Scanner with the granularity of `_Partial` that enforces limits."""
+
+
+def _reject(constant: str) -> NoReturn:
+    # JSON constants not in the grammar, like NaN
+    raise ValueError(constant)
+
+
+@lru_cache(maxsize=None)
+def _parser() -> Any:
+    # The grammar is analyzed once, and only when the first JSON is loaded
+    import lark  # pylint: disable=import-outside-toplevel
+
+    return lark.Lark(
+        grammar=GRAMMAR,
+        parser='lalr',
+        propagate_positions=True,
+    )
+
+
+def _simplify(  # pylint: disable=too-many-arguments
+    obj: Any,
+    interner: Optional[Interner] = None,
+    subtrees: Optional[SubtreeTable] = None,
+    digests: bool = False,
+    partial: Optional[Granularity] = None,
+    depth: int = 0,
+    key: bool = False,
+) -> Any:
     data: Any
     data_type: Optional[Type]
+    children = (interner, subtrees, digests, partial, depth + 1)
 
-    if isinstance(obj, lark.Tree):
+    # Tokens are instances of `str`, everything else is a `lark.Tree`
+    if not isinstance(obj, str):
         if obj.data == 'object':
-            data = dict(map(_simplify, obj.children))
+            # Pairs are not elements, their key and value are one level
+            # deeper than the object
+            data = dict(
+                _simplify(child, interner, subtrees, digests, partial, depth)
+                for child in obj.children
+            )
             data_type = Type.OBJECT
         elif obj.data == 'array':
-            data = list(map(_simplify, obj.children))
+            data = [_simplify(child, *children) for child in obj.children]
             data_type = Type.ARRAY
         elif obj.data == 'pair':
             data = (
-                _simplify(obj.children[0]),
-                _simplify(obj.children[1]),
+                _simplify(obj.children[0], *children, True),
+                _simplify(obj.children[1], *children),
             )
             data_type = None
         elif obj.data == 'null':
@@ -144,6 +771,7 @@ def _simplify(obj: Any) -> Any:
             data_type = Type.BOOLEAN
         elif obj.data == 'string':
             data = ast.literal_eval(obj.children[0].value)  # type: ignore
+            data = data if interner is None else interner(data)
             data_type = Type.STRING
         elif obj.data == 'number':
             data = ast.literal_eval(obj.children[0].value)  # type: ignore
@@ -153,11 +781,32 @@ def _simplify(obj: Any) -> Any:
     else:
         raise NotImplementedError(obj)
 
-    return data if data_type is None else Node(
+    if data_type is None or partial is not None and not partial.positioned(
+        data_type in {Type.ARRAY, Type.OBJECT}, key, depth,
+    ):
+        return data
+
+    node = Node(
         data=data,
         data_type=data_type,
         end_column=obj.end_column - 1,  # type: ignore
         end_line=obj.end_line,  # type: ignore
         start_column=obj.column - 1,  # type: ignore
         start_line=obj.line,  # type: ignore
+        digest=digest(data, data_type) if digests else None,
     )
+
+    return node if subtrees is None else subtrees.share(node)
+
+
+# Side effects
+_DECODER = JSONDecoder(parse_constant=_reject)
+
+
+register(Engine(
+    fmt='json',
+    name='lark',
+    load=_load_lark,
+    unsupported=frozenset({'limits'}),
+))
+register(Engine(fmt='json', name='scanner', load=_load_scanner, priority=1))
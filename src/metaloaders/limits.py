@@ -0,0 +1,131 @@
+"""Limits on the resources a single load may consume.
+
+An untrusted document can exhaust memory before a loader returns: a YAML
+alias bomb, extreme nesting or a huge string. Given `Limits`, loads fail
+fast with `metaloaders.exceptions.MetaloaderLimitExceeded` instead:
+
+    >>> from metaloaders.limits import Limits
+    >>> from metaloaders.yaml import load
+
+    >>> load(stream, limits=Limits(max_depth=64, max_nodes=100_000))
+
+The size is checked before anything is parsed, everything else
+incrementally, as nodes are composed or built.
+
+JSON scalars are checked before they are decoded. YAML scalars are checked
+once ruamel.yaml has scanned them, so their text is in memory by then:
+only `max_bytes` bounds the memory a single YAML scalar takes.
+
+Only the `scanner` JSON engine and the `python` YAML engine enforce limits,
+so they are the ones used when limits are given,
+see `metaloaders.backends`.
+"""
+
+# Standard library
+import codecs
+from typing import (
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+# Local libraries
+from metaloaders.buffers import (
+    TextReader,
+)
+from metaloaders.exceptions import (
+    MetaloaderLimitExceeded,
+)
+
+
+class Limits(NamedTuple):
+    """Maximum resources of a load, None means unlimited."""
+    max_nodes: Optional[int] = None
+    """Nodes in the tree, aliased subtrees count once per occurrence."""
+    max_depth: Optional[int] = None
+    """Nesting levels of arrays and objects."""
+    max_aliases: Optional[int] = None
+    """Occurrences of YAML aliases."""
+    max_scalar_length: Optional[int] = None
+    """Characters of a scalar, without the quotes of strings.
+
+    YAML scalars are checked after they are scanned, see the module.
+    """
+    max_bytes: Optional[int] = None
+    """Size of the document: of its buffer, or of a string in UTF-8."""
+
+
+class Guard:
+    """Resources used by a load in progress, checked against `limits`.
+
+    Positions are numbered like in `metaloaders.model.Node`.
+    """
+
+    def __init__(self, limits: Limits) -> None:
+        self.limits: Limits = limits
+        self.aliases: int = 0
+        """Aliases found so far."""
+        self.depth: int = 0
+        """Current nesting level."""
+        self.nodes: int = 0
+        """Nodes found so far."""
+
+    def check(self, limit: str, value: int, line: int, column: int) -> None:
+        """Raise if `value` exceeds the limit called `limit`."""
+        maximum = getattr(self.limits, limit)
+        if maximum is not None and value > maximum:
+            raise MetaloaderLimitExceeded(limit, maximum, line, column)
+
+    def alias(self, line: int, column: int) -> None:
+        """Account for an alias at `line` and `column`."""
+        self.aliases += 1
+        self.check('max_aliases', self.aliases, line, column)
+
+    def enter(self, line: int, column: int) -> None:
+        """Account for an array or object starting at `line` and `column`.
+        """
+        self.depth += 1
+        self.check('max_depth', self.depth, line, column)
+
+    def leave(self) -> None:
+        """Account for the end of the innermost array or object."""
+        self.depth -= 1
+
+    def node(self, count: int, line: int, column: int) -> None:
+        """Account for `count` nodes starting at `line` and `column`."""
+        self.nodes += count
+        self.check('max_nodes', self.nodes, line, column)
+
+    def scalar(self, length: int, line: int, column: int) -> None:
+        """Account for a scalar of `length` at `line` and `column`."""
+        self.check('max_scalar_length', length, line, column)
+
+
+def check_size(stream: Union[str, TextReader], limits: Limits) -> None:
+    """Raise if `stream` is larger than `limits.max_bytes`.
+
+    At most `max_bytes` are encoded or decoded to find the position of
+    the first character that does not fit.
+    """
+    maximum = limits.max_bytes
+    if maximum is None:
+        return
+
+    text: str
+    if isinstance(stream, str):
+        head = stream[:maximum + 1].encode('utf-8', 'surrogatepass')
+        if len(head) <= maximum:
+            return
+        decoder = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+        text = decoder.decode(head[:maximum])
+    else:
+        if stream.size <= maximum:
+            return
+        text = stream.head(maximum)
+
+    raise MetaloaderLimitExceeded(
+        'max_bytes',
+        maximum,
+        text.count('\n') + 1,
+        len(text) - text.rfind('\n') - 1,
+    )
@@ -1,14 +1,30 @@
 """Collection of objects returned by the different loaders."""
 
 # Standard library
+from datetime import (
+    date,
+)
 from enum import (
     Enum,
 )
+from fnmatch import (
+    fnmatchcase,
+)
 from typing import (
     Any,
+    Callable,
+    Iterator,
+    List,
     NamedTuple,
+    Optional,
+    Tuple,
+    Union,
 )
 
+# Types
+Path = Tuple[Union[int, str], ...]
+"""Keys and indexes that lead from a root `Node` to one of its elements."""
+
 
 class Type(Enum):
     """Enumeration for all possible `Node` data types."""
@@ -31,7 +47,11 @@ class Type(Enum):
 
 
 class Node(NamedTuple):
-    """Represents any JSON token and its metadata."""
+    """Represents any JSON token and its metadata.
+
+    Nodes are equal if their data, type and positions are, whether they
+    carry a digest or not.
+    """
     data: Any
     """Contains the raw inner element data."""
     data_type: Type
@@ -44,6 +64,8 @@ class Node(NamedTuple):
     """Start column for the element."""
     start_line: int
     """Start line for the element."""
+    digest: Optional[bytes] = None
+    """Structural hash of the data and type, see `metaloaders.hashing`."""
 
     @property
     def inner(self) -> Any:
@@ -54,12 +76,20 @@ class Node(NamedTuple):
         - Arrays are simplified 1 level: [a, b] -> [a.data, b.data]
         - Objects are simplified on its keys only: {a: b} -> {a.data: b}
         - Everything else returns the inner data as per `Node.data`
+
+        Elements that are plain values instead of nodes are left as is.
         """
         data: Any
         if self.data_type is Type.ARRAY:
-            data = [val.data for val in self.data]
+            data = [
+                val.data if isinstance(val, Node) else val
+                for val in self.data
+            ]
         elif self.data_type is Type.OBJECT:
-            data = {key.data: val for key, val in self.data.items()}
+            data = {
+                (key.data if isinstance(key, Node) else key): val
+                for key, val in self.data.items()
+            }
         else:
             data = self.data
 
@@ -68,23 +98,244 @@ class Node(NamedTuple):
     @property
     def raw(self) -> Any:
         """Access the wrapped data by this `Node`, recursing into sub-objects.
+
+        Plain values within, like the ones built for CloudFormation
+        intrinsics, are recursed into as well.
         """
         data: Any
         if self.data_type is Type.ARRAY:
-            data = [val.raw for val in self.data]
+            data = [
+                val.raw if isinstance(val, Node) else _raw(val)
+                for val in self.data
+            ]
         elif self.data_type is Type.OBJECT:
-            data = {key.raw: val.raw for key, val in self.data.items()}
+            data = {
+                (key.raw if isinstance(key, Node) else _raw(key)): (
+                    val.raw if isinstance(val, Node) else _raw(val)
+                )
+                for key, val in self.data.items()
+            }
         else:
             data = self.data
 
         return data
 
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Node):
+            return self._identity() == other._identity()
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        return hash(self._identity())
+
+    def _identity(self) -> Tuple[Any, Type, int, int, int, int]:
+        # Every field but the digest
+        return (
+            self.data,
+            self.data_type,
+            self.end_column,
+            self.end_line,
+            self.start_column,
+            self.start_line,
+        )
+
+    def equivalent(self, other: 'Node') -> bool:
+        """Compare the data and type of two nodes, ignoring positions.
+
+        Nodes are compared by digest, so `1` is not equivalent to `true`.
+        This is O(1) when both nodes carry a digest, otherwise it is
+        computed.
+        """
+        # pylint: disable=import-outside-toplevel
+        from metaloaders.hashing import (
+            digest_of,
+        )
+
+        return digest_of(self) == digest_of(other)
+
+    def walk(
+        self,
+        *,
+        prune: Optional[Callable[[Path, 'Node'], bool]] = None,
+    ) -> Iterator[Tuple[Path, 'Node']]:
+        """Iterate over this `Node` and its descendants in document order.
+
+        Yields `(path, node)` pairs where `path` holds the keys and indexes
+        that lead to `node`, for instance `('Resources', 'rBucket', 'Type')`.
+        Keys themselves are not yielded.
+
+        Descendants of the nodes for which `prune(path, node)` is true are
+        skipped. The traversal is iterative so it is not bounded by the
+        recursion limit, and can be stopped at any time.
+        """
+        yield (), self
+        if prune is not None and prune((), self):
+            return
+        if self.data_type not in {Type.ARRAY, Type.OBJECT}:
+            return
+
+        # Keys of the containers being traversed, one per level below the
+        # first, paths are only built for the nodes yielded
+        keys: List[Any] = []
+        stack: List[Iterator[Tuple[Any, Any]]] = [_entries(self.data)]
+        while stack:
+            for key, value in stack[-1]:
+                break
+            else:
+                stack.pop()
+                if stack:
+                    keys.pop()
+                continue
+
+            if isinstance(value, Node):
+                path = (*keys, key)
+                yield path, value
+                if prune is not None and prune(path, value):
+                    continue
+                if value.data_type not in {Type.ARRAY, Type.OBJECT}:
+                    continue
+                value = value.data
+
+            # Plain containers, like the ones in CloudFormation intrinsics,
+            # are traversed in order to reach the nodes they hold
+            if isinstance(value, (dict, list)):
+                keys.append(key)
+                stack.append(_entries(value))
+
+    def find(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        data_type: Optional[Type] = None,
+        key: Optional[Union[int, str]] = None,
+        has_key: Optional[str] = None,
+        path: Optional[str] = None,
+        prune: Optional[Callable[[Path, 'Node'], bool]] = None,
+    ) -> Iterator[Tuple[Path, 'Node']]:
+        """Iterate over the elements of `Node.walk` that match all filters.
+
+        - `data_type`: the element is of this type.
+        - `key`: the element is under this key or index.
+        - `has_key`: the element is an object with this key.
+        - `path`: the element path matches this glob, where components are
+          separated by `/`, `*` and `?` match within a component
+          and `**` matches any number of components.
+          Example: `/Resources/*/Properties/**`.
+
+        Subtrees that cannot match `path` are not traversed.
+        """
+        pattern = None if path is None else _compile_glob(path)
+
+        def _prune(current: Path, node: 'Node') -> bool:
+            if pattern is not None and not _may_match(pattern, current):
+                return True
+            return prune is not None and prune(current, node)
+
+        for current, node in self.walk(prune=_prune):
+            if data_type is not None and node.data_type is not data_type:
+                continue
+            if key is not None and (not current or current[-1] != key):
+                continue
+            if has_key is not None and not (
+                node.data_type is Type.OBJECT
+                and has_key in map(_key_name, node.data)
+            ):
+                continue
+            if pattern is not None and not _matches(pattern, current):
+                continue
+            yield current, node
+
     def __repr__(self) -> str:
+        digest = '' if self.digest is None else f"""
+            digest={self.digest!r},"""
         return f"""Node(
             data={self.data},
             data_type={self.data_type},
             end_column={self.end_column},
             end_line={self.end_line},
             start_column={self.start_column},
-            start_line={self.start_line},
+            start_line={self.start_line},{digest}
         )"""
+
+
+def plain_type(value: Any) -> Type:
+    """Return the `Type` of a plain value, as if it was wrapped in a `Node`.
+    """
+    data_type: Type
+    if value is None:
+        data_type = Type.NULL
+    elif isinstance(value, bool):
+        data_type = Type.BOOLEAN
+    elif isinstance(value, (int, float)):
+        data_type = Type.NUMBER
+    elif isinstance(value, (bytes, bytearray)):
+        data_type = Type.BINARY
+    elif isinstance(value, date):
+        data_type = Type.DATETIME
+    elif isinstance(value, (list, tuple)):
+        data_type = Type.ARRAY
+    elif isinstance(value, dict):
+        data_type = Type.OBJECT
+    else:
+        data_type = Type.STRING
+
+    return data_type
+
+
+def _raw(value: Any) -> Any:
+    if isinstance(value, Node):
+        return value.raw
+    if isinstance(value, dict):
+        return {_raw(key): _raw(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [_raw(val) for val in value]
+    return value
+
+
+def _entries(data: Any) -> Iterator[Tuple[Any, Any]]:
+    if isinstance(data, dict):
+        for key, val in data.items():
+            yield _key_name(key), val
+    else:
+        yield from enumerate(data)
+
+
+def _key_name(key: Any) -> Any:
+    return key.data if isinstance(key, Node) else key
+
+
+def _compile_glob(glob: str) -> Tuple[str, ...]:
+    return tuple(part for part in glob.split('/') if part)
+
+
+def _may_match(pattern: Tuple[str, ...], path: Path) -> bool:
+    # Whether `path` or any of its descendants can match `pattern`
+    for index, component in enumerate(path):
+        if index >= len(pattern):
+            return False
+        if pattern[index] == '**':
+            return True
+        if not fnmatchcase(str(component), pattern[index]):
+            return False
+    return True
+
+
+def _matches(pattern: Tuple[str, ...], path: Path) -> bool:
+    # Dynamic programming over the pattern, `matched[index]` tells whether
+    # `path[:index]` matches the pattern components seen so far
+    matched = [True] + [False] * len(path)
+    for component in pattern:
+        if component == '**':
+            # Any number of components, from the first prefix that matched
+            for index in range(1, len(matched)):
+                matched[index] = matched[index] or matched[index - 1]
+        else:
+            matched = [False] + [
+                matched[index]
+                and fnmatchcase(str(path[index]), component)
+                for index in range(len(path))
+            ]
+    return matched[-1]
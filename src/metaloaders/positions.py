@@ -0,0 +1,82 @@
+"""Granularity of the positions kept by the loaders.
+
+By default every element of a document is a `metaloaders.model.Node`.
+When positions are only needed for some of them, for instance for keys and
+containers near the top of a template, everything else can be loaded as
+plain Python values, which takes less time and memory:
+
+    >>> from metaloaders.yaml import load
+
+    >>> template = load(stream, positions='keys', max_position_depth=2)
+
+`positions` chooses the elements that are nodes:
+
+- `all`: every element, the default.
+- `keys`: arrays, objects and the keys of objects.
+- `containers`: arrays and objects.
+
+`max_position_depth` makes plain values of everything nested deeper than
+it, where the root is at depth 0 and keys are as deep as their values.
+The root is always a node.
+
+`Node.inner`, `Node.raw` and `Node.walk` work on such mixed trees.
+Run `python -m bench --filter positions` for the savings on every loader.
+"""
+
+# Standard library
+from typing import (
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+
+# Constants
+POSITIONS: Tuple[str, ...] = ('all', 'keys', 'containers')
+"""Valid values of the `positions` option of the loaders."""
+
+
+class Granularity(NamedTuple):
+    """Elements of a document that are loaded as nodes."""
+    keys: bool
+    """Whether keys of objects are nodes."""
+    scalars: bool
+    """Whether scalars other than keys are nodes."""
+    max_depth: float
+    """Deepest level with nodes, the root is at level 0."""
+
+    def positioned(self, container: bool, key: bool, depth: int) -> bool:
+        """Return whether an element at `depth` is loaded as a node."""
+        return depth == 0 or depth <= self.max_depth and (
+            container or (self.keys if key else self.scalars)
+        )
+
+
+def granularity(
+    positions: str,
+    max_position_depth: Optional[int],
+) -> Optional[Granularity]:
+    """Return the granularity of the options, None if everything is a node.
+
+    Raises `metaloaders.exceptions.MetaloaderError` if `positions` is not
+    one of `POSITIONS`.
+    """
+    if positions not in POSITIONS:
+        raise MetaloaderError(f'Unknown positions: {positions}')
+
+    if positions == 'all' and max_position_depth is None:
+        return None
+
+    return Granularity(
+        keys=positions in {'all', 'keys'},
+        scalars=positions == 'all',
+        max_depth=(
+            float('inf')
+            if max_position_depth is None
+            else max_position_depth
+        ),
+    )
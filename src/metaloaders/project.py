@@ -0,0 +1,257 @@
+"""Projects of CloudFormation templates that nest other templates.
+
+Nested stacks reference their template with the `TemplateURL` property of
+an `AWS::CloudFormation::Stack` resource. When it is a local path, relative
+to the directory of the template that references it, the nested template
+is part of the project:
+
+    >>> from metaloaders.project import load, reload
+
+    >>> project = load('root.yaml')
+    >>> project.templates[project.root].references
+        (Reference(resource='rNetwork', url=Node(...), path='/network.yaml'),)
+
+The format of a template is the one of its file extension, `json`, `yaml`
+or `yml`. Other files, like `.template` ones or files without extension,
+are JSON if they start with `{`, ignoring white space, and YAML otherwise.
+
+Every distinct file is loaded once, no matter how many templates reference
+it. Files can be loaded in parallel by an executor from
+`concurrent.futures`. Nodes are sent back from processes, so threads are
+usually faster unless the templates are large:
+
+    >>> with ThreadPoolExecutor() as executor:
+    ...     project = load('root.yaml', executor=executor)
+
+A reload loads again only the files whose modification time or size
+changed, and reuses the others:
+
+    >>> project = reload(project)
+    >>> project.loaded
+        ('/network.yaml',)
+"""
+
+# Standard library
+from concurrent.futures import (
+    Executor,
+)
+from functools import (
+    partial,
+)
+import os
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Local libraries
+from metaloaders import (
+    cloudformation,
+)
+from metaloaders.buffers import (
+    Buffer,
+    TextReader,
+    open_buffer,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+# Constants
+NESTED_STACK: str = 'AWS::CloudFormation::Stack'
+"""Type of the resources whose `TemplateURL` is followed."""
+FORMATS: Tuple[str, ...] = ('json', 'yaml', 'yml')
+"""File extensions taken as the format of a template."""
+SNIFF_SIZE: int = 4096
+"""Bytes looked at for the format of a template with any other extension."""
+
+
+class Reference(NamedTuple):
+    """A nested stack of a template whose template is a local file."""
+    resource: str
+    """Logical ID of the nested stack resource."""
+    url: Any
+    """`TemplateURL` value, a node unless loaded as a plain value."""
+    path: str
+    """Resolved path of the nested template."""
+
+
+class Template(NamedTuple):
+    """A template of a project."""
+    path: str
+    """Resolved path of the template."""
+    node: Node
+    """Root of the loaded template."""
+    stamp: Tuple[int, int]
+    """Modification time in nanoseconds and size of the file when loaded."""
+    references: Tuple[Reference, ...]
+    """Nested stacks of the template, in document order."""
+
+
+class Project(NamedTuple):
+    """Graph of the templates reachable from a root template."""
+    root: str
+    """Resolved path of the root template."""
+    templates: Dict[str, Template]
+    """Templates by resolved path, breadth first from the root."""
+    loaded: Tuple[str, ...]
+    """Templates parsed by the load that built the project, the others were
+    reused."""
+    options: Dict[str, Any]
+    """Keyword arguments templates are loaded with."""
+
+
+def load(
+    root: str,
+    *,
+    executor: Optional[Executor] = None,
+    **kwargs: Any,
+) -> Project:
+    """Loads the template at `root` and every nested template, recursively.
+
+    Files of the same depth are loaded by `executor` when given.
+    Keyword arguments are the ones of `metaloaders.cloudformation.load`.
+
+    Raises `metaloaders.exceptions.MetaloaderError` if any template can not
+    be read or parsed.
+    """
+    return _build(os.path.realpath(root), kwargs, {}, executor)
+
+
+def reload(
+    project: Project,
+    *,
+    executor: Optional[Executor] = None,
+) -> Project:
+    """Loads `project` again, reusing the templates whose file did not
+    change, see `load`.
+    """
+    return _build(project.root, project.options, project.templates, executor)
+
+
+def _build(
+    root: str,
+    options: Dict[str, Any],
+    previous: Dict[str, Template],
+    executor: Optional[Executor],
+) -> Project:
+    templates: Dict[str, Template] = {}
+    loaded: List[str] = []
+    pending = [root]
+    while pending:
+        # Breadth first, so a file is loaded once even if referenced from
+        # several templates of the same depth
+        pending = [
+            path for path in dict.fromkeys(pending) if path not in templates
+        ]
+        stamps = {path: _stamp(path) for path in pending}
+        changed = [
+            path for path in pending
+            if path not in previous or previous[path].stamp != stamps[path]
+        ]
+        nodes = dict(zip(changed, _map(
+            executor, partial(_parse, options=options), changed,
+        )))
+
+        for path in pending:
+            if path in nodes:
+                templates[path] = Template(
+                    path=path,
+                    node=nodes[path],
+                    stamp=stamps[path],
+                    references=_references(path, nodes[path]),
+                )
+                loaded.append(path)
+            else:
+                templates[path] = previous[path]
+
+        pending = [
+            reference.path
+            for path in pending
+            for reference in templates[path].references
+        ]
+
+    return Project(
+        root=root,
+        templates=templates,
+        loaded=tuple(loaded),
+        options=options,
+    )
+
+
+def _map(
+    executor: Optional[Executor],
+    function: Callable[[str], Node],
+    paths: List[str],
+) -> Iterable[Node]:
+    if executor is None or len(paths) < 2:
+        return map(function, paths)
+    return executor.map(function, paths)
+
+
+def _parse(path: str, options: Dict[str, Any]) -> Node:
+    # Module level, so processes can run it
+    fmt = os.path.splitext(path)[1][1:].lower()
+    try:
+        with open_buffer(path) as buffer:
+            if fmt not in FORMATS:
+                fmt = _sniff(buffer)
+            return cloudformation.load_bytes(buffer, fmt, **options)
+    except OSError as exc:
+        raise MetaloaderError(f'Unable to read template: {exc}')
+
+
+def _sniff(buffer: Buffer) -> str:
+    with TextReader(buffer) as reader:
+        head = reader.head(SNIFF_SIZE).lstrip()
+    return 'json' if head.startswith('{') else 'yaml'
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    try:
+        stat = os.stat(path)
+    except OSError as exc:
+        raise MetaloaderError(f'Unable to read template: {exc}')
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _references(path: str, node: Node) -> Tuple[Reference, ...]:
+    references: List[Reference] = []
+    for name, resource in _object(_object(node).get('Resources')).items():
+        if _plain(_object(resource).get('Type')) != NESTED_STACK:
+            continue
+
+        url = _object(_object(resource).get('Properties')).get('TemplateURL')
+        location = _plain(url)
+        # Intrinsic functions and remote locations are left out
+        if isinstance(location, str) and '://' not in location:
+            references.append(Reference(
+                resource=name,
+                url=url,
+                path=os.path.realpath(
+                    os.path.join(os.path.dirname(path), location),
+                ),
+            ))
+
+    return tuple(references)
+
+
+def _object(value: Any) -> Dict[Any, Any]:
+    # Entries of an object, loaded as a node or not, none for anything else
+    if isinstance(value, Node):
+        value = value.inner if value.data_type is Type.OBJECT else None
+    return value if isinstance(value, dict) else {}
+
+
+def _plain(value: Any) -> Any:
+    return value.data if isinstance(value, Node) else value
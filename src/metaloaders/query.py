@@ -0,0 +1,299 @@
+"""Compiled path queries over `metaloaders.model.Node` trees.
+
+Two syntaxes are supported:
+
+- [JSON Pointer](https://tools.ietf.org/html/rfc6901),
+  for instance: `/Resources/rBucket/Properties/BucketName`
+- A subset of JSONPath, for instance: `$.Resources.*.Type`, with:
+  `$` (the root), `.name` and `['name']` (a member), `[0]` (an index),
+  `.*` and `[*]` (every child), `..name` and `..*` (every descendant).
+
+Let's query a document:
+
+    >>> from metaloaders.json import load
+    >>> from metaloaders.query import PathIndex, compile_query
+
+    >>> json = load('{"a": [{"b": 1}, {"b": 2}]}')
+    >>> query = compile_query('$.a[*].b')
+
+    >>> [node.data for _, node in query.find(json)]
+        [1, 2]
+
+Queries are compiled once and can be run many times. Running them over a
+`PathIndex` of the tree, instead of the tree itself, keeps the objects
+already visited and the paths recently resolved, so repeated lookups cost
+O(1), and new ones O(depth) from the longest resolved prefix:
+
+    >>> index = PathIndex(json)
+    >>> compile_query('/a/1/b').first(index)
+        Node(data=2, ...)
+
+Returned nodes are the ones in the tree, with their positions. Array
+indexes in returned paths are integers, for both syntaxes.
+"""
+
+# Standard library
+from functools import (
+    lru_cache,
+)
+import re
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.model import (
+    Node,
+    Path,
+    Type,
+)
+
+# Constants
+_POINTER_INDEX = re.compile(r'0|[1-9][0-9]*')
+_JSONPATH_TOKEN = re.compile(
+    r"""
+        \.\.(?P<descendant>[^.\[\]]+)
+      | \.(?P<member>[^.\[\]]+)
+      | \[\s*(?P<index>-?\d+)\s*\]
+      | \[\s*(?P<quoted>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")\s*\]
+      | \[\s*(?P<wildcard>\*)\s*\]
+    """,
+    re.VERBOSE,
+)
+
+
+class PathIndex:
+    """Lazily built index from paths to the nodes of a tree.
+
+    Objects are indexed the first time they are traversed, and up to
+    `max_paths` resolved paths are remembered, the oldest are forgotten
+    first.
+    """
+
+    def __init__(self, root: Node, max_paths: int = 4096) -> None:
+        self.root: Node = root
+        self.max_paths: int = max_paths
+        self._members: Dict[int, Dict[Any, Node]] = {}
+        self._paths: Dict[Path, Tuple[Path, Node]] = {}
+
+    def get(self, path: Path) -> Optional[Node]:
+        """Return the node at `path`, or None if there is no such node."""
+        located = self.locate(path)
+        return None if located is None else located[1]
+
+    def locate(self, path: Path) -> Optional[Tuple[Path, Node]]:
+        """Return the `(path, node)` pair at `path`, None if missing.
+
+        In the returned path array indexes are integers within bounds.
+        """
+        # Walk from the longest resolved prefix, one component at a time
+        located: Path = ()
+        start, node = 0, self.root
+        for length in range(len(path), 0, -1):
+            if path[:length] in self._paths:
+                start = length
+                located, node = self._paths[path[:length]]
+                break
+
+        for length in range(start + 1, len(path) + 1):
+            entry = self.entry(node, path[length - 1])
+            if entry is None:
+                return None
+            located, node = located + (entry[0],), entry[1]
+            self._remember(path[:length], (located, node))
+
+        return located, node
+
+    def child(self, node: Node, key: Union[int, str]) -> Optional[Node]:
+        """Return the child of `node` under `key`, or None if missing.
+
+        Arrays accept integers and their string representation as keys,
+        see `entry`.
+        """
+        entry = self.entry(node, key)
+        return None if entry is None else entry[1]
+
+    def entry(
+        self,
+        node: Node,
+        key: Union[int, str],
+    ) -> Optional[Tuple[Union[int, str], Node]]:
+        """Return the `(key, child)` pair of `node` under `key`, or None.
+
+        Arrays accept integers, negative ones count from the end, and
+        non-negative integers without leading zeros in strings, like
+        JSON Pointer array indexes. The returned key is the actual one.
+        """
+        child: Any = None
+        if node.data_type is Type.ARRAY:
+            index = _as_index(key)
+            if index is not None and -len(node.data) <= index < len(node.data):
+                key, child = index % len(node.data), node.data[index]
+        elif node.data_type is Type.OBJECT:
+            members = self.members(node)
+            child = members.get(key)
+            if child is None and isinstance(key, str):
+                index = _as_index(key)
+                if index is not None:
+                    key, child = index, members.get(index)
+
+        return (key, child) if isinstance(child, Node) else None
+
+    def children(self, node: Node) -> Iterator[Tuple[Union[int, str], Node]]:
+        """Iterate over the `(key, child)` pairs of an array or object."""
+        if node.data_type is Type.ARRAY:
+            for index, val in enumerate(node.data):
+                if isinstance(val, Node):
+                    yield index, val
+        elif node.data_type is Type.OBJECT:
+            yield from self.members(node).items()
+
+    def members(self, node: Node) -> Dict[Any, Node]:
+        """Return the members of an object indexed by key data."""
+        try:
+            return self._members[id(node)]
+        except KeyError:
+            members = self._members[id(node)] = {
+                (key.data if isinstance(key, Node) else key): val
+                for key, val in node.data.items()
+                if isinstance(val, Node)
+            }
+            return members
+
+    def _remember(self, path: Path, located: Tuple[Path, Node]) -> None:
+        if len(self._paths) >= self.max_paths:
+            # Dictionaries keep insertion order, the first one is the oldest
+            del self._paths[next(iter(self._paths))]
+        if self.max_paths > 0:
+            self._paths[path] = located
+
+
+class Step(NamedTuple):
+    """A single step of a compiled query."""
+    kind: str
+    """One of `member`, `wildcard` or `descendant`."""
+    key: Optional[Union[int, str]] = None
+    """The member or descendant key, None matches any key."""
+
+
+class Query(NamedTuple):
+    """A compiled query, see `compile_query`."""
+    expression: str
+    """Source of the query."""
+    steps: Tuple[Step, ...]
+    """Steps to go from the root to the results."""
+
+    def find(
+        self,
+        root: Union[Node, PathIndex],
+    ) -> Iterator[Tuple[Path, Node]]:
+        """Iterate over the `(path, node)` pairs matched by this query."""
+        index = root if isinstance(root, PathIndex) else PathIndex(root)
+
+        if all(step.kind == 'member' for step in self.steps):
+            located = index.locate(
+                tuple(step.key for step in self.steps),  # type: ignore
+            )
+            if located is not None:
+                yield located
+            return
+
+        current: List[Tuple[Path, Node]] = [((), index.root)]
+        for step in self.steps:
+            current = list(_apply(index, step, current))
+
+        yield from current
+
+    def first(self, root: Union[Node, PathIndex]) -> Optional[Node]:
+        """Return the first node matched by this query, if any."""
+        for _, node in self.find(root):
+            return node
+        return None
+
+
+@lru_cache(maxsize=1024)
+def compile_query(expression: str) -> Query:
+    """Compile a JSON Pointer or JSONPath expression.
+
+    Raises `metaloaders.exceptions.MetaloaderError` on invalid expressions.
+    """
+    steps: List[Step] = []
+
+    if expression == '' or expression.startswith('/'):
+        for token in expression.split('/')[1:]:
+            token = token.replace('~1', '/').replace('~0', '~')
+            steps.append(Step(kind='member', key=token))
+    elif expression.startswith('$'):
+        position = 1
+        while position < len(expression):
+            match = _JSONPATH_TOKEN.match(expression, position)
+            if match is None:
+                raise MetaloaderError(
+                    f'Invalid query at {position}: {expression}',
+                )
+            steps.append(_jsonpath_step(match))
+            position = match.end()
+    else:
+        raise MetaloaderError(f'Invalid query: {expression}')
+
+    return Query(expression=expression, steps=tuple(steps))
+
+
+def _jsonpath_step(match: 're.Match[str]') -> Step:
+    step: Step
+    if match.group('descendant') is not None:
+        key = match.group('descendant')
+        step = Step(kind='descendant', key=None if key == '*' else key)
+    elif match.group('member') is not None:
+        key = match.group('member')
+        step = Step(kind='wildcard') if key == '*' else Step('member', key)
+    elif match.group('index') is not None:
+        step = Step(kind='member', key=int(match.group('index')))
+    elif match.group('quoted') is not None:
+        key = re.sub(r'\\(.)', r'\1', match.group('quoted')[1:-1])
+        step = Step(kind='member', key=key)
+    else:
+        step = Step(kind='wildcard')
+
+    return step
+
+
+def _apply(
+    index: PathIndex,
+    step: Step,
+    current: List[Tuple[Path, Node]],
+) -> Iterator[Tuple[Path, Node]]:
+    for path, node in current:
+        if step.kind == 'member':
+            assert step.key is not None
+            entry = index.entry(node, step.key)
+            if entry is not None:
+                yield path + (entry[0],), entry[1]
+        elif step.kind == 'wildcard':
+            for key, child in index.children(node):
+                yield path + (key,), child
+        else:
+            for relative, descendant in node.walk():
+                if relative and (
+                    step.key is None or str(relative[-1]) == step.key
+                ):
+                    yield path + relative, descendant
+
+
+def _as_index(key: Union[int, str]) -> Optional[int]:
+    if isinstance(key, int):
+        return key
+    # RFC 6901: no leading zeros, no sign, `-` is past the last element
+    if _POINTER_INDEX.fullmatch(key):
+        return int(key)
+    return None
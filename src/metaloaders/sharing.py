@@ -0,0 +1,149 @@
+"""Hash-consing of structurally identical subtrees.
+
+Documents with many repeated fragments, for instance heavily aliased YAML or
+generated JSON, produce one `metaloaders.model.Node` subtree per occurrence.
+
+Loading with `share=True` makes identical subtrees share storage:
+
+    >>> from metaloaders.json import load
+
+    >>> json = load(
+            '[{"a": [1, 2]}, {"a": [1, 2]}]',
+            share=True,
+            max_position_depth=1,
+        )
+    >>> first, second = json.data
+
+    >>> first.data is second.data
+        True
+    >>> (first.start_column, second.start_column)
+        (1, 16)
+
+Every occurrence is a lightweight `Node` with its own positions that wraps
+the shared data. Only data without nodes is shared, every node nested in a
+subtree locates its own occurrence, so sharing pays off with
+`metaloaders.positions`: with every position kept only scalars are shared.
+
+YAML aliases are the exception, an alias occurrence reuses the data of its
+anchor, nested nodes included, as there is nothing else to locate them at.
+"""
+
+# Standard library
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+# Local libraries
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+
+class SubtreeTable:
+    """Table of canonical subtrees for a single load.
+
+    Subtrees are identified by their plain values, every plain value is
+    below a single node so the whole document is identified in linear time.
+    """
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self._table: Dict[Hashable, Node] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def share(self, node: Node) -> Node:
+        """Return `node` with its data replaced by the canonical equivalent.
+        """
+        key = _key(node)
+        if key is None:
+            return node
+
+        canonical = self._table.setdefault(key, node)
+        if canonical is node:
+            return node
+
+        self.hits += 1
+        return Node(
+            data=canonical.data,
+            data_type=node.data_type,
+            end_column=node.end_column,
+            end_line=node.end_line,
+            start_column=node.start_column,
+            start_line=node.start_line,
+            digest=node.digest,
+        )
+
+
+def _key(node: Node) -> Optional[Hashable]:
+    key: Optional[Hashable]
+    if node.data_type in {Type.ARRAY, Type.OBJECT}:
+        children: Iterable[Any] = (
+            node.data
+            if node.data_type is Type.ARRAY
+            else (child for pair in node.data.items() for child in pair)
+        )
+        # Nested nodes carry the positions of their own occurrence
+        if any(isinstance(child, Node) for child in children):
+            return None
+        key = _freeze(node.data)
+    elif isinstance(node.data, float):
+        # 0.0 == -0.0, the representation tells them apart
+        key = (float, repr(node.data))
+    else:
+        key = (type(node.data), node.data)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+
+    return None if key is None else (node.data_type, key)
+
+
+def _freeze(value: Any) -> Optional[Hashable]:
+    # Hashable equivalent of a plain value. Iterative, plain values can be
+    # deeper than the recursion limit
+    frozen: List[Hashable] = []
+    stack: List[Tuple[Any, bool]] = [(value, False)]
+    while stack:
+        item, built = stack.pop()
+        if built:
+            count = 2 * len(item) if isinstance(item, dict) else len(item)
+            children = tuple(frozen[len(frozen) - count:])
+            del frozen[len(frozen) - count:]
+            frozen.append((type(item), children))
+        elif isinstance(item, Node):
+            # Like the ones built for CloudFormation intrinsics
+            return None
+        elif isinstance(item, (dict, list, tuple)):
+            stack.append((item, True))
+            stack.extend(
+                (child, False)
+                for child in reversed(
+                    [child for pair in item.items() for child in pair]
+                    if isinstance(item, dict)
+                    else item,
+                )
+            )
+        elif isinstance(item, float):
+            # 0.0 == -0.0, the representation tells them apart
+            frozen.append((float, repr(item)))
+        elif isinstance(item, (set, frozenset)):
+            frozen.append((type(item), frozenset(item)))
+        else:
+            key = (type(item), item)
+            try:
+                hash(key)
+            except TypeError:
+                return None
+            frozen.append(key)
+
+    return frozen[0]
@@ -0,0 +1,115 @@
+"""Validation of the syntax of documents, without loading them.
+
+Only scanning and parsing happen, no node is built. The first error is
+returned with its position, or None if the document is well-formed:
+
+    >>> from metaloaders.validation import validate
+
+    >>> validate('{"a": [1, 2}', 'json')
+        Issue(
+            line=1,
+            column=11,
+            offset=11,
+            message="Unable to parse stream: unexpected '}' at line 1 ...",
+        )
+
+Formats are the ones of `metaloaders.cloudformation`, the syntax of a
+template is the one of its format.
+
+JSON documents that the C accelerated `json` decoder takes are checked by
+it, see `metaloaders.json.check_syntax`. YAML documents are checked by the
+engine `metaloaders.yaml.load` would use, from its events,
+see `metaloaders.yaml.check_syntax`. Well-formed documents may still fail
+to load on what only constructors check, like duplicate keys or values of
+the wrong type for their tag.
+"""
+
+# Standard library
+import os
+from typing import (
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+# Local libraries
+from metaloaders import (
+    json,
+    yaml,
+)
+from metaloaders.buffers import (
+    Buffer,
+    TextReader,
+    decode,
+    open_buffer,
+)
+from metaloaders.exceptions import (
+    MetaloaderSyntaxError,
+)
+
+
+class Issue(NamedTuple):
+    """First error of a document, numbered like in `Node`."""
+    line: int
+    """Line of the error, starting at 1."""
+    column: int
+    """Column of the error, starting at 0."""
+    offset: int
+    """Index in the text of the document of the error."""
+    message: str
+    """Description of the error, as `load` would raise it."""
+
+
+def validate(stream: Union[str, TextReader], fmt: str) -> Optional[Issue]:
+    """Return the first error of the document, None if it is well-formed.
+
+    Raises `metaloaders.exceptions.MetaloaderError` on errors that can not
+    be located.
+    """
+    try:
+        if fmt in {'yml', 'yaml'}:
+            yaml.check_syntax(stream)
+        elif fmt in {'json'}:
+            json.check_syntax(
+                stream if isinstance(stream, str) else stream.read(),
+            )
+        else:
+            raise NotImplementedError(fmt)
+    except MetaloaderSyntaxError as exc:
+        return _issue(exc)
+
+    return None
+
+
+def validate_bytes(buffer: Buffer, fmt: str) -> Optional[Issue]:
+    """Validate a document in a bytes-like object or memory-mapped buffer.
+
+    Invalid data for its encoding is an error as well.
+    """
+    try:
+        text = decode(buffer)
+    except MetaloaderSyntaxError as exc:
+        return _issue(exc)
+
+    return validate(text, fmt)
+
+
+def validate_file(path: str, fmt: Optional[str] = None) -> Optional[Issue]:
+    """Validate the document in the file at `path`, which is memory-mapped.
+
+    The format defaults to the file extension.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1][1:].lower()
+
+    with open_buffer(path) as buffer:
+        return validate_bytes(buffer, fmt)
+
+
+def _issue(exc: MetaloaderSyntaxError) -> Issue:
+    return Issue(
+        line=exc.line,
+        column=exc.column,
+        offset=exc.offset,
+        message=str(exc),
+    )
@@ -49,20 +49,32 @@ Every YAML token contains all possible metadata:
 """
 
 # Standard library
+from bisect import (
+    bisect_right,
+)
 from collections.abc import (
     Generator,
 )
 from contextlib import (
     suppress,
 )
+from copy import (
+    copy,
+)
 from functools import (
     wraps as mimic_function,
 )
+import re
 from typing import (
     Any,
     Callable,
+    Dict,
     List,
+    Optional,
+    Set,
+    Tuple,
     Type as TypeOf,
+    Union,
 )
 
 # Third party library
@@ -71,14 +83,57 @@ from ruamel import (
 )
 
 # Local libraries
+from metaloaders.backends import (
+    Engine,
+    register,
+    select,
+)
+from metaloaders.buffers import (
+    Buffer,
+    TextReader,
+    open_buffer,
+)
+from metaloaders.hashing import (
+    digest,
+)
+from metaloaders.instrumentation import (
+    mark,
+    run,
+)
+from metaloaders.interning import (
+    Interner,
+)
+from metaloaders.limits import (
+    Guard,
+    Limits,
+    check_size,
+)
 from metaloaders.model import (
     Node,
     Type,
 )
+from metaloaders.positions import (
+    Granularity,
+    granularity,
+)
 from metaloaders.exceptions import (
     MetaloaderError,
+    MetaloaderSyntaxError,
+)
+from metaloaders.sharing import (
+    SubtreeTable,
 )
 
+# Constants
+_BREAKS = '\n\r\x85\u2028\u2029'
+_INDICATOR = re.compile(f'[?:](?=[ \t{_BREAKS}]|$)')
+# ruamel.yaml marks count no other YAML 1.1 line break
+_LINE_BREAK = re.compile('\r\n|[\n\r]')
+_SKIP = re.compile(f'(?:[ \t{_BREAKS}]+|#[^{_BREAKS}]*)*')
+
+# Loaders composing with libyaml, by the loader they extend
+_LIBYAML_LOADERS: Dict[TypeOf['Loader'], TypeOf['Loader']] = {}
+
 
 class Loader(  # pylint: disable=abstract-method,too-many-ancestors
     _yaml.SafeLoader,  # type: ignore
@@ -89,21 +144,363 @@ class Loader(  # pylint: disable=abstract-method,too-many-ancestors
     here in order to ease extension when needed.
     """
 
+    interner: Optional[Interner] = None
+    """Shares equal strings across the document when set."""
+    subtrees: Optional[SubtreeTable] = None
+    """Shares identical subtrees and aliased nodes when set."""
+    digests: bool = False
+    """Computes the structural hash of every node when set."""
+    guard: Optional[Guard] = None
+    """Enforces limits while composing when set."""
+    partial: Optional[Granularity] = None
+    """Constructs only some elements as nodes when set."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.aliases: Dict[Any, Any] = {}
+        self.copies: Dict[Tuple[int, Any], Any] = {}
+        self.positioned: Set[Any] = set()
+        self.signatures: Dict[Any, Any] = {}
+        self.sizes: Dict[Any, int] = {}
+
+    def compose_node(self, parent: Any, index: Any) -> Any:
+        """Compose a node, accounting for it if guarded.
+
+        Alias occurrences account for as many nodes as their anchored node,
+        so expanding them is bounded too.
+        Scalars are accounted for once scanned, see `metaloaders.limits`.
+        """
+        if self.guard is None:
+            return self.compose_occurrence(parent, index)
+
+        event = self.peek_event()
+        line, column = event.start_mark.line + 1, event.start_mark.column
+        if isinstance(event, _yaml.AliasEvent):
+            self.guard.alias(line, column)
+            node = self.compose_occurrence(parent, index)
+            size = self.sizes.get(self.aliases.get(node, node), 1)
+            self.guard.node(size, line, column)
+            return node
+
+        nodes = self.guard.nodes
+        self.guard.node(1, line, column)
+        if isinstance(event, _yaml.ScalarEvent):
+            self.guard.scalar(len(event.value), line, column)
+            node = self.compose_occurrence(parent, index)
+        else:
+            self.guard.enter(line, column)
+            node = self.compose_occurrence(parent, index)
+            self.guard.leave()
+
+        if event.anchor is not None:
+            self.sizes[node] = self.guard.nodes - nodes
+        return node
+
+    def compose_occurrence(self, parent: Any, index: Any) -> Any:
+        """Compose a node, keeping the position of every alias occurrence.
+
+        The anchored node is shallow copied with the marks of the alias,
+        its children are the anchored ones so they are not composed again.
+        """
+        if self.subtrees is None or not self.check_event(_yaml.AliasEvent):
+            return super().compose_node(parent, index)
+
+        event = self.peek_event()
+        anchored = super().compose_node(parent, index)
+        occurrence = copy(anchored)
+        occurrence.start_mark = event.start_mark
+        occurrence.end_mark = event.end_mark
+        self.aliases[occurrence] = anchored
+        return occurrence
+
+    def is_container(self, node: Any) -> bool:
+        """Return whether `node` is constructed as an array or object."""
+        return isinstance(node, _yaml.CollectionNode)
+
+    def position(self, root: Any) -> None:
+        """Record the composed nodes under `root` that are constructed as
+        nodes, see `metaloaders.positions`.
+
+        Aliases reach a composed node at several depths, whether it is a
+        node depends on each one. The first one keeps the composed node,
+        every other decision gets a shallow copy of it, so it is constructed
+        on its own.
+        """
+        if self.partial is None:
+            return
+
+        stack: List[Tuple[Any, int]] = []
+        self.occurrence(root, 0, False, True, stack)
+        while stack:
+            node, depth = stack.pop()
+            # Descendants of plain values are plain values as well
+            parent = node in self.positioned
+            if isinstance(node, _yaml.MappingNode):
+                pairs = [
+                    (
+                        self.occurrence(key, depth + 1, True, parent, stack),
+                        self.occurrence(val, depth + 1, False, parent, stack),
+                    )
+                    for key, val in node.value
+                ]
+                if pairs != node.value:
+                    # Never in place, the list may be an alias occurrence's
+                    node.value = pairs
+            elif isinstance(node, _yaml.SequenceNode):
+                items = [
+                    self.occurrence(val, depth + 1, False, parent, stack)
+                    for val in node.value
+                ]
+                if items != node.value:
+                    node.value = items
+
+    def occurrence(  # pylint: disable=too-many-arguments
+        self,
+        node: Any,
+        depth: int,
+        key: bool,
+        parent: bool,
+        stack: List[Tuple[Any, int]],
+    ) -> Any:
+        """Return the composed node to construct `node` from at `depth`,
+        pushing it to `stack` if its children are not decided yet.
+        """
+        signature = self.signature(node, depth, key, parent)
+        if node not in self.signatures:
+            self.signatures[node] = signature
+        elif self.signatures[node] == signature:
+            return node
+        else:
+            original = node
+            node = self.copies.get((id(original), signature))
+            if node is not None:
+                return node
+            node = self.copies[id(original), signature] = copy(original)
+            self.signatures[node] = signature
+
+        if signature is not None:
+            self.positioned.add(node)
+        if isinstance(node, _yaml.CollectionNode):
+            stack.append((node, depth))
+        return node
+
+    def signature(
+        self, node: Any, depth: int, key: bool, parent: bool,
+    ) -> Any:
+        """Return what decides how `node` and its descendants are positioned
+        at `depth`, None if they are plain values.
+        """
+        container = self.is_container(node)
+        if self.partial is None or not parent or not self.partial.positioned(
+            container, key, depth,
+        ):
+            return None
+        return (
+            key and not container,
+            # Without a maximum depth every depth decides the same
+            depth if self.partial.max_depth < float('inf') else None,
+        )
+
+    def construct_document(self, node: Any) -> Any:
+        """Construct a composed document, positioning its nodes first.
+
+        `get_data` composes a document and constructs it here, so this is
+        where composing ends.
+        """
+        mark('compose')
+        if self.partial is not None:
+            self.position(node)
+            mark('position')
+        data = super().construct_document(node)
+        mark('construct')
+        return data
+
+    def construct_object(self, node: Any, deep: bool = False) -> Any:
+        """Construct a node, reusing the anchored data on alias occurrences.
+        """
+        anchored = self.aliases.get(node)
+        if anchored is None or self.signatures.get(
+            anchored,
+        ) != self.signatures.get(node):
+            # Positioned otherwise, its own children were decided for it
+            return super().construct_object(node, deep)
+
+        data = super().construct_object(anchored, deep)
+        if not isinstance(data, Node):
+            return data
 
-def load(stream: str, *, loader_cls: TypeOf[Loader] = Loader) -> Node:
+        return Node(
+            data=data.data,
+            data_type=data.data_type,
+            end_column=node.end_mark.column,
+            end_line=node.end_mark.line + 1,
+            start_column=node.start_mark.column,
+            start_line=node.start_mark.line + 1,
+            digest=data.digest,
+        )
+
+
+def load(
+    stream: Union[str, TextReader],
+    *,
+    engine: Optional[str] = None,
+    interner: Optional[Interner] = None,
+    loader_cls: TypeOf[Loader] = Loader,
+    share: bool = False,
+    digests: bool = False,
+    limits: Optional[Limits] = None,
+    positions: str = 'all',
+    max_position_depth: Optional[int] = None,
+) -> Node:
     """Loads a string representation of a document.
 
+    `stream` can also be a `metaloaders.buffers.TextReader`,
+    see `load_bytes` and `load_file`.
+
+    The parsing engine is chosen by `engine` when given,
+    see `metaloaders.backends`.
+
+    Strings are shared through `interner` when given,
+    see `metaloaders.interning`.
+
+    Identical subtrees without nested nodes share storage if `share` is
+    set, see `metaloaders.sharing`. Alias occurrences reuse the data of
+    their anchor, the nodes below them locate the anchor.
+
+    Every node carries its structural hash if `digests` is set,
+    see `metaloaders.hashing`.
+
+    Resources are bounded by `limits` when given, see `metaloaders.limits`.
+
+    Only some elements are nodes if `positions` or `max_position_depth`
+    are set, see `metaloaders.positions`.
+
     Raises `metaloaders.exceptions.MetaloaderError` if any parsing error occur.
     """
+    granularity(positions, max_position_depth)
+    if limits is not None:
+        check_size(stream, limits)
+
+    options = {
+        'share': share, 'digests': digests, 'limits': limits is not None,
+    }
+    size = len(stream) if isinstance(stream, str) else stream.size
+    return run(
+        select(
+            'yaml',
+            engine,
+            size=size,
+            options=[option for option, value in options.items() if value],
+        ),
+        size,
+        stream,
+        interner=interner,
+        loader_cls=loader_cls,
+        share=share,
+        digests=digests,
+        limits=limits,
+        positions=positions,
+        max_position_depth=max_position_depth,
+    )
+
+
+def check_syntax(
+    stream: Union[str, TextReader],
+    *,
+    engine: Optional[str] = None,
+) -> None:
+    """Scans and parses a document without composing or constructing it.
+
+    Aliases to undefined anchors are errors as well, but not what only
+    constructors reject, like duplicate keys or unknown tags.
+
+    The engine is chosen as in `load`.
+
+    Raises `metaloaders.exceptions.MetaloaderSyntaxError` at the first error,
+    or `metaloaders.exceptions.MetaloaderError` if it can not be located.
+    """
     # pylint: disable=protected-access
+    size = len(stream) if isinstance(stream, str) else stream.size
+    parser: Any = None
+    anchors: Set[str] = set()
+    try:
+        if select('yaml', engine, size=size).name == 'libyaml':
+            text = stream if isinstance(stream, str) else stream.read()
+            parser = _libyaml(Loader)(text)
+        else:
+            parser = Loader(stream)
+
+        while parser.check_event():
+            event = parser.get_event()
+            anchor = getattr(event, 'anchor', None)
+            if isinstance(event, _yaml.DocumentStartEvent):
+                anchors.clear()
+            elif isinstance(event, _yaml.AliasEvent):
+                if anchor not in anchors:
+                    raise _yaml.composer.ComposerError(
+                        None,
+                        None,
+                        f'found undefined alias {anchor!r}',
+                        event.start_mark,
+                    )
+            elif anchor is not None:
+                anchors.add(anchor)
+    except _yaml.YAMLError as exc:  # type: ignore
+        raise _error(exc, parser, stream)
+    finally:
+        if parser is not None:
+            parser._parser.dispose()
+
+
+def load_bytes(buffer: Buffer, **kwargs: Any) -> Node:
+    """Loads a document from a bytes-like object or memory-mapped buffer.
+
+    The buffer is decoded incrementally while parsing, it is never held as
+    a whole in memory as text. Keyword arguments are the ones of `load`.
+    """
+    with TextReader(buffer) as stream:
+        return load(stream, **kwargs)
+
+
+def load_file(path: str, **kwargs: Any) -> Node:
+    """Loads a document from the file at `path`, which is memory-mapped.
+
+    Keyword arguments are the ones of `load`.
+    """
+    with open_buffer(path) as buffer, TextReader(buffer, path) as stream:
+        return load(stream, **kwargs)
+
+
+def _load_python(
+    stream: Union[str, TextReader],
+    *,
+    interner: Optional[Interner] = None,
+    loader_cls: TypeOf[Loader] = Loader,
+    share: bool = False,
+    digests: bool = False,
+    limits: Optional[Limits] = None,
+    positions: str = 'all',
+    max_position_depth: Optional[int] = None,
+) -> Node:
+    # pylint: disable=protected-access,too-many-arguments
     items: List[Node] = []
-    loader = loader_cls(stream)
+    try:
+        loader = loader_cls(stream)
+    except _yaml.YAMLError as exc:  # type: ignore
+        # The Python reader checks strings as soon as it gets them
+        raise _error(exc, None, stream)
+    loader.interner = interner
+    loader.subtrees = SubtreeTable() if share else None
+    loader.digests = digests
+    loader.guard = None if limits is None else Guard(limits)
+    loader.partial = granularity(positions, max_position_depth)
 
     try:
-        while loader._constructor.check_data():
-            items.append(loader._constructor.get_data())
+        # Phases are marked by `Loader.construct_document`
+        while loader.check_data():
+            items.append(loader.get_data())
     except _yaml.YAMLError as exc:  # type: ignore
-        raise MetaloaderError(f'Unable to parse stream: {exc}')
+        raise _error(exc, loader, stream)
     else:
         if len(items) == 0:
             return Node(
@@ -134,7 +531,197 @@ def load(stream: str, *, loader_cls: TypeOf[Loader] = Loader) -> Node:
             loader._scanner.reset_scanner()
 
 
-def _factory(constructor: str, data_type: Type) -> Callable[..., Node]:
+class _LibYAML:
+    """Composes with libyaml, with the marks the Python composer would set.
+
+    libyaml sets different marks on empty mapping values and at the end of
+    streams that do not end in a line break. Both are realigned. It also
+    ends lines on the other YAML 1.1 line breaks, so every mark of a text
+    that has one is realigned.
+
+    libyaml does not count the byte order mark in indexes, so it is left
+    out of the text.
+    """
+
+    def __init__(self, stream: str, version: Any = None) -> None:
+        self.offset: int = 1 if stream.startswith('\ufeff') else 0
+        """Characters before the text, a byte order mark."""
+        stream = stream[self.offset:]
+        super().__init__(stream)  # type: ignore
+        self._parser = self._composer = self
+        _yaml.SafeConstructor.__init__(self, loader=self)
+        _yaml.VersionedResolver.__init__(self, version, loader=self)
+        self.aliases: Dict[Any, Any] = {}
+        self.copies: Dict[Tuple[int, Any], Any] = {}
+        self.positioned: Set[Any] = set()
+        self.signatures: Dict[Any, Any] = {}
+        self.text: str = stream
+        self.line_starts: List[int] = []
+        self.realign: bool = any(char in stream for char in _BREAKS[2:])
+        """Whether libyaml counts lines the Python composer does not."""
+
+    def get_node(self) -> Any:
+        """Compose the next document and realign its marks."""
+        root = super().get_node()  # type: ignore
+        mark('compose')
+        if root is None:
+            return root
+
+        aligned = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if id(node) in aligned:
+                continue
+            aligned.add(id(node))
+
+            if self.realign or node.start_mark.index >= len(self.text):
+                node.start_mark = self.mark(
+                    min(node.start_mark.index, len(self.text)),
+                )
+            if self.realign or node.end_mark.index >= len(self.text):
+                node.end_mark = self.mark(
+                    min(node.end_mark.index, len(self.text)),
+                )
+
+            if isinstance(node, _yaml.MappingNode):
+                for key, val in node.value:
+                    if _is_empty(val):
+                        self.align_empty_value(node, key, val)
+                    stack.extend((key, val))
+            elif isinstance(node, _yaml.SequenceNode):
+                stack.extend(node.value)
+
+        mark('align')
+        return root
+
+    def align_empty_value(self, mapping: Any, key: Any, val: Any) -> None:
+        """Move the marks of an empty value to where Python would set them.
+
+        In block mappings it is the end of the token that follows the value
+        indicator, in flow mappings it is the end of the value indicator.
+        """
+        index = val.start_mark.index
+        if mapping.flow_style:
+            index = _skip(self.text, key.end_mark.index)
+            if self.text[index:index + 1] != ':':
+                return
+            index += 1
+        elif self.text[index - 1:index] == ':':
+            index = _skip(self.text, index)
+            if _INDICATOR.match(self.text, index):
+                index += 1
+        else:
+            return
+
+        val.start_mark = val.end_mark = self.mark(index)
+
+    def mark(self, index: int) -> Any:
+        """Return a mark for the character at `index`."""
+        if not self.line_starts:
+            self.line_starts.append(0)
+            self.line_starts.extend(
+                match.end() for match in _LINE_BREAK.finditer(self.text)
+            )
+        line = bisect_right(self.line_starts, index) - 1
+        return _yaml.error.StreamMark(
+            '<unicode string>', index, line, index - self.line_starts[line],
+        )
+
+
+def _skip(text: str, index: int) -> int:
+    # Index of the first token at or after `index`
+    skipped = _SKIP.match(text, index)
+    return index if skipped is None else skipped.end()
+
+
+def _is_empty(node: Any) -> bool:
+    return (
+        isinstance(node, _yaml.ScalarNode)
+        and node.value == ''
+        and not node.style
+        and node.start_mark.index == node.end_mark.index
+    )
+
+
+def _error(
+    exc: Any,
+    loader: Any,
+    stream: Union[str, TextReader],
+) -> MetaloaderError:
+    # Located if possible, like nodes. The Python reader sets no mark, and
+    # libyaml marks are realigned
+    message = f'Unable to parse stream: {exc}'
+    problem_mark = getattr(exc, 'problem_mark', None)
+    libyaml = isinstance(loader, _LibYAML)
+    if problem_mark is not None and not libyaml:
+        return MetaloaderSyntaxError(
+            message,
+            problem_mark.line + 1,
+            problem_mark.column,
+            problem_mark.index,
+        )
+
+    text = loader.text if libyaml else stream
+    if problem_mark is not None:
+        index = problem_mark.index
+    elif isinstance(exc, _yaml.reader.ReaderError) and libyaml:
+        # In UTF-8 bytes
+        head = text.encode('utf-8', 'surrogatepass')[:exc.position]
+        index = len(head.decode('utf-8', 'ignore'))
+    elif isinstance(exc, _yaml.reader.ReaderError) and isinstance(text, str):
+        index = exc.position
+    else:
+        return MetaloaderError(message)
+
+    index = min(index, len(text))
+    line, column = _location(text, index)
+    return MetaloaderSyntaxError(
+        message, line, column, index + (loader.offset if libyaml else 0),
+    )
+
+
+def _location(text: str, index: int) -> Tuple[int, int]:
+    # Line and column of the character at `index`, as marks number them
+    line, start = 1, 0
+    for match in _LINE_BREAK.finditer(text, 0, index):
+        line, start = line + 1, match.end()
+    if start == 0 and text.startswith('\ufeff'):
+        start = min(index, 1)
+    return line, index - start
+
+
+def _load_libyaml(
+    stream: Union[str, TextReader],
+    *,
+    loader_cls: TypeOf[Loader] = Loader,
+    **kwargs: Any,
+) -> Node:
+    # Marks are realigned over the text, so it is read at once
+    text = stream if isinstance(stream, str) else stream.read()
+    mark('read')
+    return _load_python(text, loader_cls=_libyaml(loader_cls), **kwargs)
+
+
+def _libyaml(loader_cls: TypeOf[Loader]) -> TypeOf[Loader]:
+    # Same constructors and resolver, but scanning, parsing and composing
+    # happen in C. The composer is not the Python one, so alias occurrences
+    # can not get their own positions, see `Loader.compose_occurrence`
+    # pylint: disable=import-outside-toplevel
+    from ruamel.yaml.cyaml import (
+        CParser,
+    )
+
+    if loader_cls not in _LIBYAML_LOADERS:
+        _LIBYAML_LOADERS[loader_cls] = type(
+            f'LibYAML{loader_cls.__name__}',
+            (_LibYAML, CParser, loader_cls),
+            {},
+        )
+    return _LIBYAML_LOADERS[loader_cls]
+
+
+def _factory(constructor: str, data_type: Type) -> Callable[..., Any]:
 
     constructor_func = getattr(Loader, f'construct_{constructor}')
 
@@ -144,22 +731,31 @@ def _factory(constructor: str, data_type: Type) -> Callable[..., Node]:
         node: _yaml.Node,  # type: ignore
         *args: Any,
         **kwargs: Any,
-    ) -> Node:
+    ) -> Any:
         result = constructor_func(self, node, *args, **kwargs)
 
         if isinstance(result, Generator):
             result = tuple(result)
             result = result[0] if len(result) == 1 else result
 
-        return Node(
+        if self.interner is not None and isinstance(result, str):
+            result = self.interner(result)
+
+        if self.partial is not None and node not in self.positioned:
+            return result
+
+        data = Node(
             data=result,
             data_type=data_type,
             end_column=node.end_mark.column,
             end_line=node.end_mark.line + 1,
             start_column=node.start_mark.column,
             start_line=node.start_mark.line + 1,
+            digest=digest(result, data_type) if self.digests else None,
         )
 
+        return data if self.subtrees is None else self.subtrees.share(data)
+
     return wrapper
 
 
@@ -183,3 +779,11 @@ def _override() -> None:
 
 # Side effects
 _override()
+register(Engine(fmt='yaml', name='python', load=_load_python, priority=1))
+if _yaml.__with_libyaml__:  # type: ignore
+    register(Engine(
+        fmt='yaml',
+        name='libyaml',
+        load=_load_libyaml,
+        unsupported=frozenset({'limits', 'share'}),
+    ))
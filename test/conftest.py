@@ -0,0 +1,32 @@
+# Standard library
+from typing import (
+    Any,
+    Iterator,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders.backends import (
+    engines,
+    using,
+)
+
+
+@pytest.fixture(  # type: ignore
+    params=[engine.name for engine in engines('json')],
+    ids=lambda name: f'json-{name}',
+)
+def json_engine(request: Any) -> Iterator[str]:
+    # JSON is loaded with every registered engine by default
+    with using('json', request.param):
+        yield request.param
+
+
+@pytest.fixture(  # type: ignore
+    params=[engine.name for engine in engines('yaml')],
+    ids=lambda name: f'yaml-{name}',
+)
+def yaml_engine(request: Any) -> Iterator[str]:
+    # YAML is loaded with every registered engine by default
+    with using('yaml', request.param):
+        yield request.param
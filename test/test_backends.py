@@ -0,0 +1,223 @@
+# Standard library
+import os
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+)
+from unittest.mock import (
+    patch,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders import (
+    backends,
+    cloudformation,
+    json,
+    yaml,
+)
+from metaloaders.backends import (
+    Engine,
+    configure,
+    engines,
+    register,
+    select,
+    using,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.interning import (
+    Interner,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+# Engines every other engine of the format must agree with
+REFERENCE = {'json': 'lark', 'yaml': 'python'}
+
+DOCUMENTS = {
+    'json': (
+        '\x0c[ 1 ,\r\n\n\t{ } , [ ] ]\n',
+        '{"a": {"b": [true, false, null]}, "a": 1}',
+        '[0, -0, +1, 00, 1., .5, -.5e3, 1E+2, 1e400, -0.0]',
+        r'["\n\t\"\\", "\/", "\u00e9", "\ud83d\ude00", "\x41"]',
+        r'["\N{EM DASH}", "\'", "\0", "é€😀", "\t"]',
+        '[{"a": [1, 2]}, {"a": [1, 2]}, "a", "a"]',
+        '{"Resources": {"b": {"Type": "AWS::S3::Bucket"}}}',
+    ),
+    'yaml': (
+        'a:   # c\n\n  # d\nb: 1',
+        'a:\n  b:\nc: 1\n',
+        '? a\n: \n? b\n',
+        '- a:\n  b:\n- c:',
+        '{a: , b: }',
+        '{a:   # c\n }',
+        '[a: ]',
+        'a: !!str\nb: 1',
+        'a: &x\nb: *x\n',
+        'a: &x [1, {b: c}]\nd: *x\ne: [1, {b: c}]\n',
+        'a: |\n\nb: 1',
+        'a:\r\nb:\r\n',
+        '\ufeffé: ü',
+        '---\n--- a\n...\n',
+        '',
+        'test: 123',
+        'a: !!binary aGVsbG8=\nb: 2001-12-14\nc: !!set {x, y}\n',
+        'a: !Ref b\nc: !GetAtt d.e\nf: !Sub [g, {h: i}]\n',
+    ),
+}
+ERRORS = {
+    'json': (
+        '', '[1,]', '{"a" 1}', '[1 2]', '01', '1e', '"\n"', r'"\x4"',
+        '{"a": 1', '[01, ]', 'nul', '"a\rb"',
+    ),
+    'yaml': ('a: [1', 'a: b: c', 'a:\n  - 1\n - 2', 'a: *x'),
+}
+OPTIONS: List[Dict[str, Any]] = [
+    {},
+    {'share': True},
+    {'digests': True},
+    {'interner': Interner()},
+    {'positions': 'keys'},
+    {'positions': 'containers', 'max_position_depth': 2},
+]
+
+
+@pytest.fixture(autouse=True)  # type: ignore
+def registry() -> Iterator[None]:
+    # pylint: disable=protected-access
+    registered = {fmt: dict(named) for fmt, named in backends._ENGINES.items()}
+    configured = dict(backends._CONFIGURED)
+    try:
+        yield
+    finally:
+        backends._ENGINES.clear()
+        backends._ENGINES.update(registered)
+        backends._CONFIGURED.clear()
+        backends._CONFIGURED.update(configured)
+
+
+def _load(fmt: str, stream: str, **kwargs: Any) -> Node:
+    # Through the CloudFormation loader, so intrinsics are covered as well
+    return cloudformation.load(stream, fmt, **kwargs)
+
+
+def _toy(name: str, **kwargs: Any) -> Engine:
+    return Engine(
+        fmt='toy',
+        name=name,
+        load=lambda stream, **_: Node(
+            data=name,
+            data_type=Type.STRING,
+            end_column=0,
+            end_line=1,
+            start_column=0,
+            start_line=1,
+        ),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(  # type: ignore
+    'engine',
+    [engine for fmt in REFERENCE for engine in engines(fmt)],
+    ids=lambda engine: f'{engine.fmt}-{engine.name}',
+)
+def test_conformance_1(engine: Engine) -> None:
+    reference = REFERENCE[engine.fmt]
+    for stream in DOCUMENTS[engine.fmt]:
+        for options in OPTIONS:
+            if engine.unsupported & {
+                option for option, value in options.items() if value
+            }:
+                continue
+            expected = _load(engine.fmt, stream, engine=reference, **options)
+            assert repr(
+                _load(engine.fmt, stream, engine=engine.name, **options),
+            ) == repr(expected), (stream, options)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    'engine',
+    [engine for fmt in REFERENCE for engine in engines(fmt)],
+    ids=lambda engine: f'{engine.fmt}-{engine.name}',
+)
+def test_conformance_2(engine: Engine) -> None:
+    for stream in ERRORS[engine.fmt]:
+        with pytest.raises(MetaloaderError):
+            _load(engine.fmt, stream, engine=engine.name)
+
+    stream = DOCUMENTS[engine.fmt][1]
+    for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-32-be'):
+        loader = json if engine.fmt == 'json' else yaml
+        assert loader.load_bytes(  # type: ignore
+            stream.encode(encoding), engine=engine.name,
+        ) == loader.load_bytes(  # type: ignore
+            stream.encode(encoding), engine=REFERENCE[engine.fmt],
+        ), encoding
+
+
+def test_engines_1() -> None:
+    assert {engine.name for engine in engines('json')} == {'lark', 'scanner'}
+    assert 'python' in [engine.name for engine in engines('yaml')]
+    assert engines('toy') == ()
+
+
+def test_select_1() -> None:
+    register(_toy('small'))
+    register(_toy('large', priority=2, min_size=1000))
+    register(_toy('sharing', priority=1, unsupported=frozenset({'share'})))
+
+    assert select('toy').name == 'sharing'
+    assert select('toy', size=1000).name == 'large'
+    assert select('toy', size=1000, options=['share']).name == 'large'
+    assert select('toy', options=['share']).name == 'small'
+    assert select('toy', 'small', size=1000).name == 'small'
+
+    with pytest.raises(MetaloaderError):
+        select('toy', 'sharing', options=['share'])
+    with pytest.raises(MetaloaderError):
+        select('toy', 'missing')
+
+    with using('toy', 'small'):
+        assert select('toy', size=1000).name == 'small'
+        with using('toy', 'sharing'):
+            assert select('toy').name == 'sharing'
+            assert select('toy', options=['share']).name == 'small'
+        assert select('toy').name == 'small'
+    assert select('toy').name == 'sharing'
+
+    with patch.dict(os.environ, {'METALOADERS_TOY_ENGINE': 'small'}):
+        assert select('toy').name == 'small'
+        with using('toy', 'large'):
+            assert select('toy').name == 'large'
+
+    with pytest.raises(MetaloaderError):
+        configure('toy', 'missing')
+
+
+def test_select_2() -> None:
+    for fmt in REFERENCE:
+        for engine in engines(fmt):
+            assert select(fmt, engine.name) == engine
+
+    assert select('json', options=['limits']).name == 'scanner'
+    assert select('yaml', options=['limits']).name == 'python'
+
+    # The fastest engine for the size, unless it may differ
+    assert select('json').name == 'scanner'
+    assert select('json', size=10 ** 9).name == 'scanner'
+    with using('json', 'lark'):
+        assert select('json', size=10 ** 9).name == 'lark'
+        assert select('json', options=['limits']).name == 'scanner'
+    assert select('yaml').name == 'python'
+    assert select('yaml', size=10 ** 9).name == 'python'
+    if any(engine.name == 'libyaml' for engine in engines('yaml')):
+        with using('yaml', 'libyaml'):
+            assert select('yaml').name == 'libyaml'
+            assert select('yaml', options=['share']).name == 'python'
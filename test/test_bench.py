@@ -0,0 +1,98 @@
+# Standard library
+import json
+from typing import (
+    Any,
+)
+# Local libraries
+from bench.__main__ import (
+    CORPORA,
+    cases,
+    compare,
+    main,
+)
+from bench.corpus import (
+    Spec,
+    render,
+)
+from metaloaders.cloudformation import (
+    load,
+)
+
+
+def test_corpus_1() -> None:
+    for spec in CORPORA:
+        spec = spec._replace(size=2000)
+        for fmt in ['json', 'yaml']:
+            text = render(spec, fmt)
+            assert text == render(spec, fmt), (spec.name, fmt)
+            assert text != render(spec._replace(seed=1), fmt)
+            assert len(text) >= 1000
+
+        # Both formats render the same document
+        assert load(render(spec, 'json'), 'json').raw == load(
+            render(spec, 'yaml'), 'yaml',
+        ).raw
+
+
+def test_compare_1(tmp_path: Any, capsys: Any) -> None:
+    current = {'results': {
+        'a': {'corpus': 'x', 'throughput': 89.0, 'unit': 'MB/s'},
+        'b': {'corpus': 'x', 'throughput': 91.0, 'unit': 'MB/s'},
+        'c': {'corpus': 'y', 'throughput': 1.0, 'unit': 'MB/s'},
+        'd': {'corpus': 'x', 'throughput': 1.0, 'unit': 'MB/s'},
+    }}
+    baseline = {'results': {
+        'a': {'corpus': 'x', 'throughput': 100.0, 'unit': 'MB/s'},
+        'b': {'corpus': 'x', 'throughput': 100.0, 'unit': 'MB/s'},
+        # Another document, or a new benchmark, are not compared
+        'c': {'corpus': 'z', 'throughput': 100.0, 'unit': 'MB/s'},
+    }}
+    assert compare(current, baseline, 0.1) == ['a']
+    assert compare(current, baseline, 0.2) == []
+    assert 'c: not in the baseline, skipped' in capsys.readouterr().out
+
+    # The exit status tells whether anything regressed
+    output = tmp_path / 'results.json'
+    argv = [
+        '--filter', 'json.load[scanner]/flat',
+        '--repeat', '1',
+        '--size', '1000',
+    ]
+    assert main([*argv, '--output', str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert list(results['results']) == ['json.load[scanner]/flat']
+
+    for factor, status in [(100.0, 1), (0.01, 0)]:
+        for result in results['results'].values():
+            result['throughput'] *= factor
+        output.write_text(json.dumps(results))
+        assert main([*argv, '--baseline', str(output)]) == status
+        for result in results['results'].values():
+            result['throughput'] /= factor
+
+
+def test_cases_1(monkeypatch: Any) -> None:
+    rendered = []
+
+    def _render(spec: Spec, fmt: str) -> str:
+        rendered.append((spec.name, fmt))
+        return render(spec, fmt)
+
+    # Documents no benchmark matching the filter runs on are not rendered
+    monkeypatch.setattr('bench.__main__.render', _render)
+    names = [case.name for case in cases(1200, 'json.load[scanner]/flat')]
+    assert names == ['json.load[scanner]/flat']
+    assert rendered == [('flat', 'json')]
+
+    names = [case.name for case in cases(1200, 'pickle.loads/nested')]
+    assert names == ['pickle.loads/nested']
+    assert rendered[1:] == [('nested', 'json')]
+
+    assert not list(cases(1200, 'nothing'))
+    assert len(rendered) == 2
+
+    # Without a filter every benchmark is generated
+    names = [case.name for case in cases(1200)]
+    assert 'Node.raw/template' in names
+    assert 'yaml.load[share]/nested' in names
+    assert len(names) == len(set(names))
@@ -0,0 +1,152 @@
+# Standard library
+import codecs
+from pathlib import (
+    Path,
+)
+from tempfile import (
+    TemporaryDirectory,
+)
+from textwrap import (
+    dedent,
+)
+from unittest.mock import (
+    patch,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders import (
+    buffers,
+    cloudformation,
+    json,
+    yaml,
+)
+from metaloaders.backends import (
+    engines,
+)
+from metaloaders.buffers import (
+    LineIndex,
+    detect_encoding,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+
+YAML = dedent("""
+    Resources:
+        rBücket:
+            Type: 'AWS::S3::Bucket'
+            Properties: {BucketName: ñandú}
+""")
+
+
+def test_detect_encoding_1() -> None:
+    assert detect_encoding(b'') == ('utf-8', 0)
+    assert detect_encoding(b'{}') == ('utf-8', 0)
+    assert detect_encoding(codecs.BOM_UTF8 + b'{}') == ('utf-8', 3)
+    assert detect_encoding('{}'.encode('utf-16')) == ('utf-16-le', 2)
+    assert detect_encoding('{}'.encode('utf-16-be')) == ('utf-16-be', 0)
+    assert detect_encoding('{}'.encode('utf-32')) == ('utf-32-le', 4)
+    assert detect_encoding('{}'.encode('utf-32-be')) == ('utf-32-be', 0)
+
+
+def test_load_bytes_1() -> None:
+    expected = yaml.load(YAML)
+
+    # Multi-byte characters are split across chunks
+    with patch.object(buffers, 'CHUNK_SIZE', 3):
+        for encoding in ('utf-8', 'utf-8-sig', 'utf-16', 'utf-32-be'):
+            buffer = YAML.encode(encoding)
+            assert yaml.load_bytes(buffer) == expected
+            assert yaml.load_bytes(memoryview(buffer)) == expected
+            assert yaml.load_bytes(bytearray(buffer)) == expected
+
+    assert json.load_bytes(
+        '{"ñandú": [1]}'.encode('utf-16'),
+    ) == json.load('{"ñandú": [1]}')
+
+
+def test_load_file_1() -> None:
+    with TemporaryDirectory() as tmp:
+        _test_load_file(Path(tmp))
+
+
+def _test_load_file(directory: Path) -> None:
+    (directory / 'template.yaml').write_bytes(YAML.encode('utf-8-sig'))
+    (directory / 'template.json').write_text('{"a": "ñ"}', encoding='utf-8')
+    (directory / 'empty.yaml').write_bytes(b'')
+
+    template = cloudformation.load_file(str(directory / 'template.yaml'))
+    assert template == yaml.load(YAML)
+    assert template == yaml.load_file(str(directory / 'template.yaml'))
+    assert cloudformation.load_file(
+        str(directory / 'template.json'),
+    ) == json.load('{"a": "ñ"}')
+    assert json.load_file(
+        str(directory / 'template.json'),
+    ) == json.load('{"a": "ñ"}')
+    assert yaml.load_file(str(directory / 'empty.yaml')).data is None
+
+
+def test_load_file_2() -> None:
+    # Invalid data is reported, and the file is unmapped nonetheless
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'template.yaml'
+        path.write_bytes(b'a: 1\nc: \xff\n')
+        for engine in engines('yaml'):
+            with pytest.raises(MetaloaderError):
+                yaml.load_file(str(path), engine=engine.name)
+        with pytest.raises(MetaloaderError):
+            cloudformation.load_file(str(path))
+        with pytest.raises(MetaloaderError):
+            json.load_file(str(path))
+
+
+def test_line_index_1() -> None:
+    buffer = YAML.encode('utf-8-sig')
+    index = LineIndex(buffer, 'yaml')
+    value = yaml.load_bytes(buffer).inner['Resources'].inner['rBücket'] \
+        .inner['Properties'].inner['BucketName']
+
+    assert len(index) == 6
+    assert (value.start_line, value.start_column) == (5, 33)
+    assert index.byte_column(value.start_line, value.start_column) == 33
+    assert index.byte_column(value.end_line, value.end_column) == 40
+    assert buffer[index.byte_offset(value.start_line, value.start_column):
+                  index.byte_offset(value.end_line, value.end_column)] \
+        .decode() == 'ñandú'
+
+    key = list(yaml.load_bytes(buffer).inner['Resources'].data)[0]
+    assert (key.end_column, index.byte_column(key.end_line, key.end_column)) \
+        == (11, 12)
+
+    buffer = YAML.encode('utf-16-be')
+    index = LineIndex(buffer, 'yaml')
+    assert index.byte_offset(3, 4) == 2 * (len('\nResources:\n') + 4)
+
+
+def test_line_index_2() -> None:
+    # Lines split like the loaders split them
+    for fmt, loader, texts in [
+        ('yaml', yaml, ['"1\rx"', '"é\x85\u2028"', 'ü']),
+        ('json', json, ['"1"', '"é\u2028"', '"ü"']),
+    ]:
+        stream = (
+            f'a: {texts[0]}\rb: {texts[1]}\r\nc: {texts[2]}\n'
+            if fmt == 'yaml'
+            else f'{{"a": {texts[0]},\r"b": {texts[1]},\r\n"c": {texts[2]}}}'
+        )
+        for encoding in ['utf-8', 'utf-16-le', 'utf-32-be']:
+            buffer = stream.encode(encoding)
+            index = LineIndex(buffer, fmt)
+            nodes = loader.load_bytes(buffer).data.values()
+            assert [
+                buffer[
+                    index.byte_offset(node.start_line, node.start_column):
+                    index.byte_offset(node.end_line, node.end_column)
+                ].decode(encoding)
+                for node in nodes
+            ] == texts, (fmt, encoding)
+
+    with pytest.raises(NotImplementedError):
+        LineIndex(b'', 'toml')
@@ -5,6 +5,8 @@ from textwrap import (
 from typing import (
     Any,
 )
+# Third party libraries
+import pytest
 # Local libraries
 from metaloaders.model import (
     Node,
@@ -14,6 +16,8 @@ from metaloaders.cloudformation import (
     load,
 )
 
+pytestmark = pytest.mark.usefixtures('json_engine', 'yaml_engine')
+
 
 def test_load_1() -> None:
     stream = dedent("""
@@ -0,0 +1,76 @@
+# Standard library
+from textwrap import (
+    dedent,
+)
+# Third party libraries
+import pytest
+
+# Local libraries
+from metaloaders.columnar import (
+    TYPES,
+    depth_histogram,
+    longest_spans,
+    position_heatmap,
+    to_columns,
+    type_histogram,
+)
+from metaloaders.json import (
+    load as load_json,
+)
+from metaloaders.model import (
+    Type,
+)
+from metaloaders.yaml import (
+    load as load_yaml,
+)
+
+numpy = pytest.importorskip('numpy')
+
+
+def test_to_columns_1() -> None:
+    columns = to_columns(load_json('{"a": [1, 2], "bc": "d"}'))
+
+    assert [TYPES[code] for code in columns.data_type] == [
+        Type.OBJECT,
+        Type.STRING, Type.ARRAY, Type.NUMBER, Type.NUMBER,
+        Type.STRING, Type.STRING,
+    ]
+    assert columns.parent.tolist() == [-1, 0, 0, 2, 2, 0, 0]
+    assert columns.depth.tolist() == [0, 1, 1, 2, 2, 1, 1]
+    assert columns.is_key.tolist() == [
+        False, True, False, False, False, True, False,
+    ]
+    assert columns.start_column.tolist() == [0, 1, 6, 7, 10, 14, 20]
+    assert [columns.string(row) for row in (1, 5, 6)] == ['a', 'bc', 'd']
+    assert columns.string_offset[0] == -1
+
+
+def test_aggregates_1() -> None:
+    columns = to_columns(load_yaml(dedent("""
+        a:
+            b:
+                - 1
+                - 2
+        c: d
+    """)))
+
+    assert type_histogram(columns) == {
+        Type.ARRAY: 1,
+        Type.NUMBER: 2,
+        Type.OBJECT: 2,
+        Type.STRING: 4,
+    }
+    assert depth_histogram(columns).tolist() == [1, 4, 2, 2]
+    assert longest_spans(columns, 2).tolist() == [0, 2]
+
+    counts, lines, _ = position_heatmap(columns, bins=2)
+    assert counts.sum() == len(columns.data_type)
+    assert lines[0] == 2
+
+
+def test_to_columns_2() -> None:
+    columns = to_columns(load_json('"x"'))
+
+    assert len(columns.data_type) == 1
+    assert columns.strings == 'x'
+    assert numpy.issubdtype(columns.start_line.dtype, numpy.unsignedinteger)
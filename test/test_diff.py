@@ -0,0 +1,77 @@
+# Standard library
+from textwrap import (
+    dedent,
+)
+# Local libraries
+from metaloaders.diff import (
+    Kind,
+    diff,
+)
+from metaloaders.json import (
+    load as load_json,
+)
+from metaloaders.yaml import (
+    load as load_yaml,
+)
+
+
+def test_diff_1() -> None:
+    old = load_json('{"a": 1, "b": [1, 2], "d": {"e": null}}', digests=True)
+    new = load_json('{"a": 1, "b": [1, 3], "c": true}', digests=True)
+
+    assert [
+        (change.kind, change.path) for change in diff(old, new)
+    ] == [
+        (Kind.REMOVED, ('d',)),
+        (Kind.CHANGED, ('b', 1)),
+        (Kind.ADDED, ('c',)),
+    ]
+    assert list(diff(old, old)) == []
+
+
+def test_diff_2() -> None:
+    old = load_json('[{"x": 1}, {"y": 2}, {"z": 3}, 4]')
+    new = load_json('[{"z": 3}, {"x": 1}, {"y": 5}]')
+    changes = list(diff(old, new))
+
+    assert [(change.kind, change.path) for change in changes] == [
+        (Kind.REMOVED, (3,)),
+        (Kind.CHANGED, (2, 'y')),
+    ]
+    assert changes[0].old is not None
+    assert changes[0].old.start_column == 31
+    assert changes[1].old is not None
+    assert changes[1].new is not None
+    assert changes[1].old.start_column == 17
+    assert changes[1].new.start_column == 27
+
+
+def test_diff_3() -> None:
+    old = load_yaml(dedent("""
+        Resources:
+            rBucket:
+                Type: AWS::S3::Bucket
+            rQueue:
+                Type: AWS::SQS::Queue
+    """), digests=True)
+    new = load_yaml(dedent("""
+        Resources:
+            rBucket:
+                Type: AWS::S3::Bucket
+
+            rQueue:
+                Type: AWS::SNS::Topic
+    """), digests=True)
+    changes = list(diff(old, new))
+
+    assert len(changes) == 1
+    change = changes[0]
+    assert change.kind is Kind.CHANGED
+    assert change.path == ('Resources', 'rQueue', 'Type')
+    assert change.old is not None
+    assert change.new is not None
+    assert (change.old.start_line, change.old.start_column) == (6, 14)
+    assert (change.new.start_line, change.new.start_column) == (7, 14)
+    assert (change.old.data, change.new.data) == (
+        'AWS::SQS::Queue', 'AWS::SNS::Topic',
+    )
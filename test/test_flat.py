@@ -0,0 +1,172 @@
+# Standard library
+from datetime import (
+    date,
+    datetime,
+)
+from random import (
+    Random,
+)
+from textwrap import (
+    dedent,
+)
+# Third party libraries
+import pytest
+
+# Local libraries
+from metaloaders.cloudformation import (
+    load,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.flat import (
+    FlatTree,
+    dump,
+    to_shared_memory,
+)
+from metaloaders.model import (
+    Type,
+)
+
+TEMPLATE = dedent("""
+    Resources:
+        rBucket:
+            Type: AWS::S3::Bucket
+            Properties:
+                BucketName: !Join ['-', [!Ref 'AWS::StackName', bucket]]
+                Arn: !GetAtt rRole.Arn
+                Size: 123456789012345678901234567890
+                Ratio: -1.5
+                Negative: -42
+                Created: 2020-12-31
+                Updated: 2020-12-31T10:00:00
+                Secret: !!binary aGVsbG8=
+                Enabled: true
+                Nothing: null
+""")
+
+
+def test_dump_1() -> None:
+    template = load(TEMPLATE, 'yaml')
+    tree = FlatTree(dump(template))
+
+    assert tree.root.to_node() == template
+    assert tree.root.raw['Resources']['rBucket']['Type'] == 'AWS::S3::Bucket'
+
+    properties = tree.root.inner['Resources'].inner['rBucket'] \
+        .inner['Properties']
+    assert properties.data_type is Type.OBJECT
+    assert len(properties) == 10
+    assert (properties.start_line, properties.start_column) == (6, 12)
+
+    assert properties.inner['Size'].data == 123456789012345678901234567890
+    assert properties.inner['Ratio'].data == -1.5
+    assert properties.inner['Negative'].data == -42
+    assert properties.inner['Created'].data == date(2020, 12, 31)
+    assert properties.inner['Updated'].data == datetime(2020, 12, 31, 10)
+    assert properties.inner['Secret'].data == b'hello'
+    assert properties.inner['Enabled'].data is True
+    assert properties.inner['Nothing'].data is None
+    assert properties.inner['Arn'].raw == {'Fn::GetAtt': ['rRole', 'Arn']}
+    assert properties.inner['Arn'].data == {
+        'Fn::GetAtt': properties.inner['Arn'].data['Fn::GetAtt'],
+    }
+
+    bucket_name = properties.get('BucketName')
+    assert bucket_name is not None
+    assert bucket_name.raw == {
+        'Fn::Join': ['-', [{'Ref': 'AWS::StackName'}, 'bucket']],
+    }
+    assert properties.get('Missing') is None
+
+
+def test_dump_2() -> None:
+    json = load('{"a": "x", "b": ["x", "x"]}', 'json')
+    buffer = dump(json)
+
+    assert buffer.count(b'x') == 1
+    assert FlatTree(buffer).root.raw == {'a': 'x', 'b': ['x', 'x']}
+
+    with pytest.raises(MetaloaderError):
+        FlatTree(b'MLFT')
+
+    with pytest.raises(MetaloaderError):
+        FlatTree(b'XXXX' + buffer[4:])
+
+
+def test_shared_memory_1() -> None:
+    json = load('{"a": [1, 2, {"b": null}]}', 'json')
+    memory = to_shared_memory(json)
+    try:
+        with FlatTree.from_shared_memory(memory.name) as tree:
+            assert tree.root.to_node() == json
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_get_1() -> None:
+    json = load(
+        '{"b": 1, "a": 2, "1": 3, "c": {"x": null}, "": 4, "\\u00e9": 5}',
+        'json',
+    )
+    root = FlatTree(dump(json)).root
+
+    for key, value in json.inner.items():
+        found = root.get(key)
+        assert found is not None, key
+        assert found.raw == value.raw, key
+    for key in ['d', 1, None, b'a', ['a']]:
+        assert root.get(key) is None, key
+    found = root.inner['c'].get('x')
+    assert found is not None
+    assert found.raw is None
+    assert root.inner['a'].get('a') is None
+
+    yaml = load('{1: a, true: b, 2020-12-31: c, x: d}', 'yaml')
+    root = FlatTree(dump(yaml)).root
+    for key, value in [
+        (1, 'a'), (True, 'b'), (date(2020, 12, 31), 'c'), ('x', 'd'),
+    ]:
+        found = root.get(key)
+        assert found is not None, key
+        assert found.data == value, key
+    assert root.get('1') is None
+
+    # The last of duplicated keys, like Node.inner
+    for count in range(1, 8):
+        stream = '{' + ', '.join(
+            f'"{key}": {index}'
+            for index, key in enumerate(['a', 'b'] * count + ['c'])
+        ) + '}'
+        json = load(stream, 'json')
+        root = FlatTree(dump(json)).root
+        for key in ['a', 'b', 'c']:
+            found = root.get(key)
+            assert found is not None, stream
+            assert found.data == json.inner[key].data, stream
+
+
+def test_corrupt_1() -> None:
+    buffer = dump(load(TEMPLATE, 'yaml'))
+    random = Random(0)
+
+    def _read(data: bytes) -> None:
+        with FlatTree(data) as tree:
+            tree.root.to_node()
+            tree.root.get('Resources')
+
+    # Truncated
+    for size in range(len(buffer)):
+        with pytest.raises(MetaloaderError):
+            _read(buffer[:size])
+
+    # Corrupt, any error is a MetaloaderError
+    for _ in range(2000):
+        corrupt = bytearray(buffer)
+        for _ in range(random.randint(1, 4)):
+            corrupt[random.randrange(len(buffer))] = random.randrange(256)
+        try:
+            _read(bytes(corrupt))
+        except MetaloaderError:
+            pass
@@ -0,0 +1,90 @@
+# Standard library
+from textwrap import (
+    dedent,
+)
+# Local libraries
+from metaloaders.cloudformation import (
+    load,
+)
+from metaloaders.hashing import (
+    DIGEST_SIZE,
+    digest_of,
+    with_digests,
+)
+
+
+def test_load_1() -> None:
+    first = load('{"a": [1, 2], "b": null}', 'json', digests=True)
+    second = load('\n\n{ "b": null,\n "a": [1, 2] }', 'json', digests=True)
+    third = load('{"a": [2, 1], "b": null}', 'json', digests=True)
+
+    assert first != second
+    assert first.digest is not None
+    assert len(first.digest) == DIGEST_SIZE
+    assert first.digest == second.digest
+    assert first.digest != third.digest
+    assert first.equivalent(second)
+    assert not first.equivalent(third)
+    assert first.inner['b'].digest == third.inner['b'].digest
+
+
+def test_load_2() -> None:
+    json = load('{"a": [1, "1", true, 1.0], "b": {"c": null}}', 'json')
+    yaml = load(dedent("""
+        a: [1, '1', true, 1.0]
+        b:
+            c: null
+    """), 'yaml', digests=True)
+
+    assert json.digest is None
+    assert with_digests(json).digest == yaml.digest
+    assert json.equivalent(yaml)
+    assert [digest_of(val) for val in yaml.inner['a'].data] == [
+        digest_of(1), digest_of('1'), digest_of(True), digest_of(1.0),
+    ]
+    assert len(set(digest_of(val) for val in yaml.inner['a'].data)) == 4
+
+
+def test_load_3() -> None:
+    stream = dedent("""
+        Resources:
+            rBucket:
+                Type: 'AWS::S3::Bucket'
+                Properties:
+                    BucketName: !Ref 'AWS::StackName'
+    """)
+    yaml = load(stream, 'yaml', digests=True, share=True)
+
+    assert yaml == with_digests(load(stream, 'yaml'))
+    assert yaml.digest == digest_of({
+        'Resources': {
+            'rBucket': {
+                'Type': 'AWS::S3::Bucket',
+                'Properties': {'BucketName': {'Ref': 'AWS::StackName'}},
+            },
+        },
+    })
+
+
+def test_load_4() -> None:
+    stream = '{"a": [1, {"b": null}]}'
+    hashed = load(stream, 'json', digests=True)
+    plain = load(stream, 'json')
+
+    # Digests take no part in equality
+    assert hashed == plain
+    assert hash(hashed.inner['a'].data[1].inner['b']) == hash(
+        plain.inner['a'].data[1].inner['b'],
+    )
+    assert {hashed.inner['a'].data[0]: 1}[plain.inner['a'].data[0]] == 1
+
+    # Nor in equivalence, which does not depend on how trees were loaded
+    for digests in (False, True):
+        first = load('[1]', 'json', digests=digests)
+        assert not first.equivalent(load('[true]', 'json', digests=digests))
+        assert first.equivalent(load('- 1', 'yaml'))
+
+    # Members of sets have no order
+    assert load('!!set {a, b, c}', 'yaml', digests=True).digest == load(
+        '!!set {c, a, b}', 'yaml', digests=True,
+    ).digest
@@ -0,0 +1,74 @@
+# Standard library
+import subprocess
+import sys
+from typing import (
+    Dict,
+)
+
+
+def _import_times(code: str) -> Dict[str, int]:
+    """Run `code` in a fresh interpreter, return cumulative import times."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        check=True,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, module = line.split('|')
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_1() -> None:
+    times = _import_times('import metaloaders.json')
+
+    assert 'metaloaders.json' in times
+    assert 'lark' not in times, times['metaloaders.json']
+
+
+def test_import_2() -> None:
+    times = _import_times('import metaloaders.cloudformation')
+
+    assert 'metaloaders.cloudformation' in times
+    assert 'metaloaders.json' not in times
+    assert 'metaloaders.yaml' not in times
+    assert 'lark' not in times, times['metaloaders.cloudformation']
+    assert 'ruamel.yaml' not in times, times['metaloaders.cloudformation']
+
+
+def test_import_3() -> None:
+    times = _import_times('\n'.join([
+        'import metaloaders.cloudformation',
+        'metaloaders.cloudformation.load("{}", "json", engine="scanner")',
+    ]))
+
+    assert 'metaloaders.json' in times
+    assert 'lark' not in times
+    assert 'ruamel.yaml' not in times
+
+
+def test_import_4() -> None:
+    times = _import_times('\n'.join([
+        'import metaloaders.cloudformation',
+        'metaloaders.cloudformation.load("{}", "json", engine="lark")',
+    ]))
+
+    assert 'metaloaders.json' in times
+    assert 'lark' in times
+
+
+def test_import_5() -> None:
+    times = _import_times('\n'.join([
+        'import metaloaders.cloudformation',
+        'assert metaloaders.cloudformation.Loader.__name__ == "Loader"',
+        'metaloaders.cloudformation.load("a: !Ref b", "yaml")',
+    ]))
+
+    assert 'metaloaders.yaml' in times
+    assert 'ruamel.yaml' in times
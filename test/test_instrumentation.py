@@ -0,0 +1,123 @@
+# Standard library
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+import json
+import tracemalloc
+from typing import (
+    List,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders import (
+    cloudformation,
+    json as json_loader,
+    yaml,
+)
+from metaloaders.backends import (
+    engines,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.instrumentation import (
+    Record,
+    instrument,
+    mark,
+)
+
+PHASES = {
+    ('json', 'lark'): ['grammar', 'parse', 'build'],
+    ('json', 'scanner'): ['scan'],
+    ('yaml', 'libyaml'): ['read', 'compose', 'align', 'construct'],
+    ('yaml', 'python'): ['compose', 'construct'],
+}
+
+
+def test_instrument_1() -> None:
+    for fmt, stream in [
+        ('json', '{"a": [1, 2.5, true, null]}'),
+        ('yaml', 'a: [1, 2.5, true, null]'),
+    ]:
+        for engine in engines(fmt):
+            with instrument() as records:
+                cloudformation.load(stream, fmt, engine=engine.name)
+
+            assert len(records) == 1
+            record = records[0]
+            assert record.fmt == fmt
+            assert record.engine == engine.name
+            assert record.size == len(stream)
+            assert list(record.phases) == PHASES[(fmt, engine.name)]
+            assert sum(record.phases.values()) <= record.seconds
+            assert record.nodes == {
+                'ARRAY': 1,
+                'BOOLEAN': 1,
+                'NULL': 1,
+                'NUMBER': 2,
+                'OBJECT': 1,
+                'STRING': 1,
+            }
+            assert record.peak_memory is None
+            assert record.error is None
+            assert json.loads(json.dumps(record._asdict()))
+
+
+def test_instrument_2() -> None:
+    exported: List[Record] = []
+    with instrument(exported.append, memory=True) as records:
+        json_loader.load('[1]')
+        with pytest.raises(MetaloaderError):
+            yaml.load('a: [')
+
+    assert exported == records
+    peak_memory, error = records[0].peak_memory, records[1].error
+    assert peak_memory is not None and peak_memory > 0
+    assert records[1].nodes == {}
+    assert error is not None and error.startswith('MetaloaderSyntaxError: ')
+
+    # Nothing is recorded outside of blocks
+    json_loader.load('[1]')
+    mark('scan')
+    assert len(records) == 2
+
+
+def test_instrument_3() -> None:
+    stream = '- !Ref a\n- !GetAtt b.c\n'
+    with instrument() as outer:
+        with instrument() as inner:
+            cloudformation.load(stream, 'yaml')
+        cloudformation.load(stream, 'yaml')
+
+    assert len(inner) == 1
+    assert len(outer) == 2
+    # Intrinsics hold plain values, which are not nodes
+    assert outer[0].nodes == {'ARRAY': 1, 'OBJECT': 2}
+
+
+def test_instrument_4() -> None:
+    with instrument() as records:
+        yaml.load('a: [1, 2]', engine='python', positions='containers')
+    assert list(records[0].phases) == ['compose', 'position', 'construct']
+    assert records[0].nodes == {'ARRAY': 1, 'OBJECT': 1}
+
+
+def test_instrument_5() -> None:
+    stream = json.dumps([{'a': [1, 2, 3]}] * 100)
+    with instrument(memory=True) as records:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(json_loader.load, [stream] * 32))
+        assert not tracemalloc.is_tracing()
+
+    assert len(records) == 32
+    assert all(record.error is None for record in records)
+    assert all(record.peak_memory is not None for record in records)
+    # Tracing started by someone else is left alone
+    tracemalloc.start()
+    try:
+        with instrument(memory=True) as records:
+            json_loader.load(stream)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
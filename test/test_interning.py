@@ -0,0 +1,85 @@
+# Standard library
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+from textwrap import (
+    dedent,
+)
+# Local libraries
+from metaloaders.interning import (
+    Interner,
+)
+from metaloaders.cloudformation import (
+    load,
+)
+
+
+def test_interner_1() -> None:
+    interner = Interner(max_size=2, max_length=4)
+    first = ''.join(['a', 'b'])
+    second = ''.join(['a', 'b'])
+
+    assert first is not second
+    assert interner(first) is first
+    assert interner(second) is first
+    assert interner.hits == 1
+    assert interner.misses == 1
+
+    long = 'x' * 5
+    assert interner(long) is long
+    assert long not in interner
+
+    interner('c')
+    interner('d')
+    assert len(interner) == 2
+    assert 'ab' not in interner
+
+    interner.clear()
+    assert len(interner) == 0
+    assert interner.hits == 0
+
+
+def test_load_1() -> None:
+    interner = Interner()
+    stream = dedent("""
+        Resources:
+            rBucket:
+                Type: 'AWS::S3::Bucket'
+                Properties:
+                    BucketName: !Ref 'AWS::StackName'
+    """)
+
+    first = load(stream, 'yaml', interner=interner)
+    second = load(stream, 'yaml', interner=interner)
+    assert first == second
+
+    first_bucket = first.inner['Resources'].inner['rBucket']
+    second_bucket = second.inner['Resources'].inner['rBucket']
+    assert first_bucket.inner['Type'].data is second_bucket.inner['Type'].data
+    assert list(first_bucket.data)[0].data is list(second_bucket.data)[0].data
+
+    first_ref = first_bucket.inner['Properties'].inner['BucketName'].data
+    second_ref = second_bucket.inner['Properties'].inner['BucketName'].data
+    assert first_ref['Ref'] is second_ref['Ref']
+
+
+def test_load_2() -> None:
+    interner = Interner()
+    stream = '{"Type": "AWS::S3::Bucket", "Other": "AWS::S3::Bucket"}'
+
+    first = load(stream, 'json', interner=interner)
+    second = load(stream, 'json', interner=interner)
+    assert first == second
+    assert first.raw['Type'] is second.raw['Other']
+    assert interner.hits == 5
+
+
+def test_interner_2() -> None:
+    # Shared by threads, evicting all along
+    interner = Interner(max_size=8)
+    values = [str(index % 16) for index in range(100_000)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(interner, values, chunksize=100))
+
+    assert interner.hits + interner.misses == len(values)
+    assert len(interner) == 8
@@ -2,19 +2,42 @@
 from json import (
     dumps as dump,
 )
+from random import (
+    Random,
+)
 import textwrap
 from typing import (
     Any,
 )
+# Third party libraries
+import pytest
 # Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
 from metaloaders.model import (
     Node,
     Type,
 )
 from metaloaders.json import (
+    check_syntax,
     load,
 )
 
+# Fragments of documents the engines are fuzzed with
+SCALARS = [
+    '0', '-12', '1.5', '-0.0', '1e5', '2E-3', '+1', '.5', '1.', '00',
+    'true', 'false', 'null', '""', '"a"', r'"b\"c"', r'"\u00e9"',
+    r'"\ud83d\ude00"', r'"\x41"',
+]
+TOKENS = [
+    '{', '}', '[', ']', ',', ':', ' ', '\n', '\t', '"', '\\', 'e', '01',
+    '+1', '.5', 'NaN', r'"\q"', r'"\n"', 'true',
+]
+
+# Engines are compared on more documents in test_backends.py
+pytestmark = pytest.mark.usefixtures('json_engine')
+
 
 def test_load_1() -> None:
     assert load("""
@@ -207,3 +230,53 @@ def test_load_4() -> None:
     raw = [{'a': [123, {'b': None}]}]
     json = load(dump(raw))
     assert json.raw == raw
+
+
+def _document(random: Random, depth: int = 0) -> str:
+    choice = random.random()
+    if depth > 3 or choice < 0.4:
+        return random.choice(SCALARS)
+    if choice < 0.7:
+        return '[' + ','.join(
+            _document(random, depth + 1)
+            for _ in range(random.randint(0, 3))
+        ) + ']'
+    return '{' + ','.join(
+        random.choice(['"a"', '"b"', '""']) + ':'
+        + _document(random, depth + 1)
+        for _ in range(random.randint(0, 3))
+    ) + '}'
+
+
+def _outcome(stream: str, engine: str) -> str:
+    try:
+        return repr(load(stream, engine=engine, digests=True))
+    except MetaloaderError:
+        return 'error'
+
+
+def test_engines_1() -> None:
+    # Both engines load the same nodes, or both fail, on mutated documents
+    random = Random(0)
+    for _ in range(1000):
+        stream = _document(random)
+        for _ in range(random.randint(0, 3)):
+            index = random.randrange(len(stream) + 1)
+            skip = random.randint(0, 1)
+            token = random.choice(['', random.choice(TOKENS)])
+            stream = stream[:index] + token + stream[index + skip:]
+
+        assert _outcome(stream, 'lark') == _outcome(stream, 'scanner'), (
+            stream
+        )
+
+
+def test_engines_2() -> None:
+    # Deeper than the recursion limit
+    stream = '[' * 10000 + ']' * 10000
+    for engine in ['lark', 'scanner']:
+        for positions in ['all', 'containers']:
+            with pytest.raises(MetaloaderError, match='too deeply nested'):
+                load(stream, engine=engine, positions=positions)
+    with pytest.raises(MetaloaderError, match='too deeply nested'):
+        check_syntax(stream)
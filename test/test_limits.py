@@ -0,0 +1,125 @@
+# Standard library
+from typing import (
+    Any,
+    Callable,
+    List,
+    Tuple,
+    Union,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders import (
+    cloudformation,
+    json,
+    yaml,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+    MetaloaderLimitExceeded,
+)
+from metaloaders.limits import (
+    Limits,
+)
+from metaloaders.model import (
+    Node,
+)
+
+# Every level holds 9 aliases to the previous one, 9 ** 9 strings in total
+BOMB = 'a: &a [x, x, x, x, x, x, x, x, x]\n' + ''.join(
+    f'{key}: &{key} [{", ".join([f"*{previous}"] * 9)}]\n'
+    for previous, key in zip('abcdefgh', 'bcdefghi')
+)
+
+
+def _raises(
+    function: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Tuple[str, int, int]:
+    with pytest.raises(MetaloaderLimitExceeded) as exc:
+        function(*args, **kwargs)
+    return exc.value.limit, exc.value.line, exc.value.column
+
+
+def _load_json_bytes(stream: bytes, **kwargs: Any) -> Node:
+    return cloudformation.load_bytes(stream, 'json', **kwargs)
+
+
+def test_limits_1() -> None:
+    limits = Limits(max_nodes=10_000)
+    assert _raises(yaml.load, BOMB, limits=limits) == ('max_nodes', 5, 7)
+    limits = Limits(max_aliases=20)
+    assert _raises(yaml.load, BOMB, limits=limits) == ('max_aliases', 4, 15)
+    # Generous limits do not change the result
+    limits = Limits(max_nodes=10 ** 9, max_aliases=100)
+    assert len(yaml.load(BOMB, limits=limits).data) == 9
+
+
+def test_limits_2() -> None:
+    cases: List[Tuple[Callable[..., Any], str, Limits, Tuple[str, int, int]]]
+    cases = [
+        (json.load, '[[[1]]]', Limits(max_depth=2), ('max_depth', 1, 2)),
+        (json.load, '[1, 2, 3]', Limits(max_nodes=3), ('max_nodes', 1, 7)),
+        (
+            json.load,
+            '{"a": "abcdef"}',
+            Limits(max_scalar_length=5),
+            ('max_scalar_length', 1, 6),
+        ),
+        (
+            json.load,
+            '[1, 123456]',
+            Limits(max_scalar_length=5),
+            ('max_scalar_length', 1, 4),
+        ),
+        (
+            yaml.load,
+            'a:\n  b:\n    c: 1',
+            Limits(max_depth=2),
+            ('max_depth', 3, 4),
+        ),
+        (
+            yaml.load,
+            'a: abcdef',
+            Limits(max_scalar_length=5),
+            ('max_scalar_length', 1, 3),
+        ),
+        (yaml.load, 'a: [1, 2]', Limits(max_nodes=3), ('max_nodes', 1, 4)),
+    ]
+    for load, stream, limits, expected in cases:
+        assert _raises(load, stream, limits=limits) == expected, stream
+
+        # Generous limits do not change the result
+        assert load(stream, limits=Limits(**{expected[0]: 100})) == load(
+            stream,
+        )
+
+
+def test_limits_3() -> None:
+    limits = Limits(max_bytes=5)
+    cases: List[Tuple[Callable[..., Any], Union[str, bytes]]] = [
+        (json.load, '[\n"é", 1]'),
+        (json.load_bytes, '[\n"é", 1]'.encode()),
+        (yaml.load, '- \n- é'),
+        (yaml.load_bytes, '- \n- é'.encode()),
+        (_load_json_bytes, '[\n"é", 1]'.encode()),
+    ]
+    for load, stream in cases:
+        assert _raises(load, stream, limits=limits) == ('max_bytes', 2, 2)
+
+    assert json.load('"é"', limits=Limits(max_bytes=4)).data == 'é'
+    with pytest.raises(MetaloaderLimitExceeded):
+        json.load('"é"', limits=Limits(max_bytes=3))
+
+
+def test_limits_4() -> None:
+    with pytest.raises(MetaloaderError):
+        json.load('[1]', engine='lark', limits=Limits())
+    with pytest.raises(MetaloaderError):
+        json.load('1' * 10_000, limits=Limits())
+
+    template = cloudformation.load(
+        '- !Ref a\n- !GetAtt b.c\n', 'yaml', limits=Limits(max_nodes=3),
+    )
+    assert len(template.data) == 2
@@ -0,0 +1,136 @@
+# Standard library
+from itertools import (
+    islice,
+)
+from textwrap import (
+    dedent,
+)
+# Local libraries
+from metaloaders.cloudformation import (
+    load,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+TEMPLATE = dedent("""
+    Resources:
+        rBucket:
+            Type: AWS::S3::Bucket
+            Properties:
+                BucketName: !Join ['-', [!Ref 'AWS::StackName', bucket]]
+        rQueue:
+            Type: AWS::SQS::Queue
+            Properties:
+                QueueName: queue
+    Outputs:
+        Type: output
+""")
+
+
+def test_walk_1() -> None:
+    template = load(TEMPLATE, 'yaml')
+    paths = [path for path, _ in template.walk()]
+
+    assert paths[:4] == [
+        (),
+        ('Resources',),
+        ('Resources', 'rBucket'),
+        ('Resources', 'rBucket', 'Type'),
+    ]
+    assert ('Resources', 'rBucket', 'Properties', 'BucketName',
+            'Fn::Join', 1, 0) in paths
+    assert paths[-1] == ('Outputs', 'Type')
+
+    pruned = [
+        path for path, node in template.walk(
+            prune=lambda path, node: len(path) == 2,
+        )
+    ]
+    assert max(map(len, pruned)) == 2
+
+
+def test_find_1() -> None:
+    template = load(TEMPLATE, 'yaml')
+
+    assert [
+        (path, node.data) for path, node in template.find(
+            data_type=Type.STRING,
+            path='/Resources/*/Type',
+        )
+    ] == [
+        (('Resources', 'rBucket', 'Type'), 'AWS::S3::Bucket'),
+        (('Resources', 'rQueue', 'Type'), 'AWS::SQS::Queue'),
+    ]
+    assert [path for path, _ in template.find(key='Type')] == [
+        ('Resources', 'rBucket', 'Type'),
+        ('Resources', 'rQueue', 'Type'),
+        ('Outputs', 'Type'),
+    ]
+    assert [path for path, _ in template.find(has_key='QueueName')] == [
+        ('Resources', 'rQueue', 'Properties'),
+    ]
+    assert [path for path, _ in template.find(
+        path='/Resources/**/QueueName',
+    )] == [
+        ('Resources', 'rQueue', 'Properties', 'QueueName'),
+    ]
+    assert [path for path, _ in islice(template.find(key='Type'), 1)] == [
+        ('Resources', 'rBucket', 'Type'),
+    ]
+
+
+def test_walk_2() -> None:
+    node = Node(
+        data=None,
+        data_type=Type.NULL,
+        end_column=0,
+        end_line=1,
+        start_column=0,
+        start_line=1,
+    )
+    for _ in range(10000):
+        node = node._replace(data=[node], data_type=Type.ARRAY)
+
+    count = 0
+    for path, _ in node.walk():
+        count += 1
+
+    assert count == 10001
+    assert path == (0,) * 10000
+
+
+def test_find_2() -> None:
+    template = load(TEMPLATE, 'yaml')
+
+    # Every '**' matches any number of components, none included
+    for glob in ['/**/Type', '/**/**/Type', '/Resources/**/**/**/Type']:
+        assert [path for path, _ in template.find(path=glob)][:2] == [
+            ('Resources', 'rBucket', 'Type'),
+            ('Resources', 'rQueue', 'Type'),
+        ], glob
+    assert [path for path, _ in template.find(
+        path='/**/Fn::Join/**/?',
+    )] == [
+        ('Resources', 'rBucket', 'Properties', 'BucketName', 'Fn::Join', 0),
+        ('Resources', 'rBucket', 'Properties', 'BucketName', 'Fn::Join', 1),
+        ('Resources', 'rBucket', 'Properties', 'BucketName', 'Fn::Join', 1,
+         0),
+        ('Resources', 'rBucket', 'Properties', 'BucketName', 'Fn::Join', 1,
+         1),
+    ]
+
+    # Backtracking would try every split of the path among the '**'
+    node = Node(
+        data='x',
+        data_type=Type.STRING,
+        end_column=0,
+        end_line=1,
+        start_column=0,
+        start_line=1,
+    )
+    for _ in range(60):
+        node = node._replace(data={'a': node}, data_type=Type.OBJECT)
+    assert list(node.find(path='/**' * 30 + '/b')) == []
+    assert len(list(node.find(path='/**' * 30 + '/a'))) == 60
@@ -0,0 +1,138 @@
+# Standard library
+from textwrap import (
+    dedent,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders import (
+    cloudformation,
+    json,
+    yaml,
+)
+from metaloaders.backends import (
+    engines,
+)
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.limits import (
+    Limits,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+
+JSON = '{"a": [1, {"b": "c"}], "d": {"e": [true, null]}, "f": 1.5}'
+YAML = dedent("""
+    Resources:
+      rBucket:
+        Type: AWS::S3::Bucket
+        Properties:
+          BucketName: !Sub '${AWS::StackName}-bucket'
+          Tags: [{Key: a, Value: !Ref b}]
+""")
+
+
+def test_positions_1() -> None:
+    for fmt, stream in [('json', JSON), ('yaml', YAML)]:
+        expected = cloudformation.load(stream, fmt).raw
+        for engine in engines(fmt):
+            for positions in ('all', 'keys', 'containers'):
+                for max_position_depth in (None, 0, 1, 2):
+                    root = cloudformation.load(
+                        stream,
+                        fmt,
+                        engine=engine.name,
+                        positions=positions,
+                        max_position_depth=max_position_depth,
+                    )
+                    assert isinstance(root, Node)
+                    assert root.raw == expected
+
+
+def test_positions_2() -> None:
+    root = json.load(JSON, positions='containers')
+    assert set(root.data) == {'a', 'd', 'f'}
+    assert root.inner['f'] == 1.5
+    assert root.inner['a'].data_type is Type.ARRAY
+    assert root.inner['a'].inner == [1, root.inner['a'].data[1].data]
+    assert root.inner['a'].data[1].inner == {'b': 'c'}
+    assert root.inner['d'].inner['e'].start_column == 34
+
+    root = json.load(JSON, positions='keys')
+    assert all(isinstance(key, Node) for key in root.data)
+    assert root.inner['a'].data[0] == 1
+
+    root = json.load(JSON, max_position_depth=1)
+    assert root.inner['a'].data == [1, {'b': 'c'}]
+    assert root.inner['f'].data == 1.5
+    assert [path for path, _ in root.walk()] == [(), ('a',), ('d',), ('f',)]
+
+    root = json.load(JSON, max_position_depth=0)
+    assert root.inner == {
+        'a': [1, {'b': 'c'}],
+        'd': {'e': [True, None]},
+        'f': 1.5,
+    }
+
+
+def test_positions_3() -> None:
+    root = cloudformation.load(YAML, 'yaml', max_position_depth=2)
+    bucket = root.inner['Resources'].inner['rBucket']
+    assert (bucket.start_line, bucket.start_column) == (4, 4)
+    assert bucket.data['Properties']['Tags'] == [
+        {'Key': 'a', 'Value': {'Ref': 'b'}},
+    ]
+
+    root = cloudformation.load(YAML, 'yaml', positions='keys')
+    tags = root.inner['Resources'].inner['rBucket'].inner['Properties']
+    assert tags.inner['Tags'].data[0].inner['Value'].inner == {'Ref': 'b'}
+    assert tags.inner['BucketName'].raw == {
+        'Fn::Sub': '${AWS::StackName}-bucket',
+    }
+
+    # The root is always a node
+    assert yaml.load('a', positions='containers') == yaml.load('a')
+    assert json.load('1', max_position_depth=0) == json.load('1')
+
+
+def test_positions_4() -> None:
+    with pytest.raises(MetaloaderError):
+        json.load('[]', positions='scalars')
+    with pytest.raises(MetaloaderError):
+        yaml.load('[]', positions='scalars')
+
+    # Plain values count towards limits
+    with pytest.raises(MetaloaderError):
+        json.load(JSON, limits=Limits(max_nodes=5), max_position_depth=0)
+    with pytest.raises(MetaloaderError):
+        yaml.load(YAML, limits=Limits(max_nodes=5), max_position_depth=0)
+
+
+def test_positions_5() -> None:
+    # Aliases are positioned by the depth of each occurrence
+    for share in (False, True):
+        for engine in engines('yaml'):
+            if share and 'share' in engine.unsupported:
+                continue
+
+            root = yaml.load(
+                'a: &x {b: 1}\nc: {d: {e: *x}}',
+                engine=engine.name,
+                share=share,
+                max_position_depth=1,
+            )
+            assert root.inner['a'].data == {'b': 1}
+            assert root.inner['c'].data == {'d': {'e': {'b': 1}}}
+
+            root = yaml.load(
+                'a: {d: {e: &x {b: 1}}}\nc: *x',
+                engine=engine.name,
+                share=share,
+                max_position_depth=1,
+            )
+            assert root.inner['a'].data == {'d': {'e': {'b': 1}}}
+            assert root.inner['c'].data == {'b': 1}
+            assert root.inner['c'].start_line == (2 if share else 1)
@@ -0,0 +1,178 @@
+# Standard library
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+import os
+from textwrap import (
+    dedent,
+)
+from typing import (
+    Any,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.model import (
+    Node,
+)
+from metaloaders.project import (
+    load,
+    reload,
+)
+
+ROOT = dedent("""
+    Resources:
+      rNetwork:
+        Type: AWS::CloudFormation::Stack
+        Properties:
+          TemplateURL: ./network.json
+      rApp:
+        Type: AWS::CloudFormation::Stack
+        Properties:
+          TemplateURL: app/app.yml
+      rRemote:
+        Type: AWS::CloudFormation::Stack
+        Properties:
+          TemplateURL: https://example.com/remote.yml
+      rDynamic:
+        Type: AWS::CloudFormation::Stack
+        Properties:
+          TemplateURL: !Sub '${AWS::StackName}.yml'
+""")
+APP = dedent("""
+    Resources:
+      rNetwork:
+        Type: AWS::CloudFormation::Stack
+        Properties:
+          TemplateURL: ../network.json
+      rBucket:
+        Type: AWS::S3::Bucket
+""")
+NETWORK = '{"Resources": {"rVpc": {"Type": "AWS::EC2::VPC"}}}'
+
+
+def _write(tmp_path: Any) -> None:
+    (tmp_path / 'app').mkdir()
+    (tmp_path / 'root.yaml').write_text(ROOT)
+    (tmp_path / 'app' / 'app.yml').write_text(APP)
+    (tmp_path / 'network.json').write_text(NETWORK)
+
+
+def test_project_1(tmp_path: Any) -> None:
+    _write(tmp_path)
+    root = os.path.realpath(tmp_path / 'root.yaml')
+    app = os.path.realpath(tmp_path / 'app' / 'app.yml')
+    network = os.path.realpath(tmp_path / 'network.json')
+
+    project = load(str(tmp_path / 'app' / '..' / 'root.yaml'))
+    assert project.root == root
+    assert list(project.templates) == [root, network, app]
+    # Referenced twice, loaded once
+    assert project.loaded == (root, network, app)
+
+    references = project.templates[root].references
+    assert [(ref.resource, ref.path) for ref in references] == [
+        ('rNetwork', network),
+        ('rApp', app),
+    ]
+    assert references[0].url == Node(
+        data='./network.json',
+        data_type=references[0].url.data_type,
+        end_column=33,
+        end_line=6,
+        start_column=19,
+        start_line=6,
+    )
+    assert [ref.path for ref in project.templates[app].references] == [
+        network,
+    ]
+    assert project.templates[network].references == ()
+    assert project.templates[network].node.raw == {
+        'Resources': {'rVpc': {'Type': 'AWS::EC2::VPC'}},
+    }
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = load(str(tmp_path / 'root.yaml'), executor=executor)
+    assert parallel.loaded == project.loaded
+    for path, template in project.templates.items():
+        assert parallel.templates[path] == template
+
+
+def test_project_2(tmp_path: Any) -> None:
+    _write(tmp_path)
+    network = os.path.realpath(tmp_path / 'network.json')
+
+    project = load(str(tmp_path / 'root.yaml'), positions='containers')
+    assert project.templates[project.root].references[0].url == (
+        './network.json'
+    )
+
+    # Nothing changed
+    reloaded = reload(project)
+    assert reloaded.loaded == ()
+    assert reloaded.templates == project.templates
+
+    # Only the file that changed is loaded again, with the same options
+    (tmp_path / 'network.json').write_text('{"Resources": {}}')
+    stat = os.stat(network)
+    os.utime(network, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    reloaded = reload(project)
+    assert reloaded.loaded == (network,)
+    assert reloaded.templates[network].node.raw == {'Resources': {}}
+    assert reloaded.templates[network].node.data_type is (
+        project.templates[network].node.data_type
+    )
+    assert reloaded.templates[reloaded.root] is (
+        project.templates[project.root]
+    )
+
+    # Templates no longer referenced leave the project
+    (tmp_path / 'root.yaml').write_text('Resources: {}\n')
+    reloaded = reload(reloaded)
+    assert list(reloaded.templates) == [reloaded.root]
+
+
+def test_project_3(tmp_path: Any) -> None:
+    _write(tmp_path)
+    os.remove(tmp_path / 'network.json')
+    with pytest.raises(MetaloaderError):
+        load(str(tmp_path / 'root.yaml'))
+
+    (tmp_path / 'network.json').write_text('{"Resources": ')
+    with pytest.raises(MetaloaderError):
+        load(str(tmp_path / 'root.yaml'))
+
+
+def test_project_4(tmp_path: Any) -> None:
+    # Formats of files without a known extension are sniffed
+    (tmp_path / 'root.yaml').write_text(dedent("""
+        Resources:
+          rNetwork:
+            Type: AWS::CloudFormation::Stack
+            Properties:
+              TemplateURL: network.template
+          rApp:
+            Type: AWS::CloudFormation::Stack
+            Properties:
+              TemplateURL: app
+    """))
+    (tmp_path / 'network.template').write_text(f'\n  {NETWORK}')
+    (tmp_path / 'app').write_text(APP.replace('../network.json', 'root.yaml'))
+    network = os.path.realpath(tmp_path / 'network.template')
+    app = os.path.realpath(tmp_path / 'app')
+
+    project = load(str(tmp_path / 'root.yaml'))
+    assert project.loaded == (project.root, network, app)
+    assert project.templates[network].node.raw == {
+        'Resources': {'rVpc': {'Type': 'AWS::EC2::VPC'}},
+    }
+    assert project.templates[app].node.raw['Resources']['rBucket'] == {
+        'Type': 'AWS::S3::Bucket',
+    }
+    # Loaded as JSON, which has no tags
+    (tmp_path / 'network.template').write_text('{"a": !Ref b}')
+    with pytest.raises(MetaloaderError):
+        load(str(tmp_path / 'root.yaml'))
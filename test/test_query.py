@@ -0,0 +1,133 @@
+# Standard library
+from textwrap import (
+    dedent,
+)
+# Third party libraries
+import pytest
+
+# Local libraries
+from metaloaders.exceptions import (
+    MetaloaderError,
+)
+from metaloaders.json import (
+    load as load_json,
+)
+from metaloaders.model import (
+    Node,
+    Type,
+)
+from metaloaders.query import (
+    PathIndex,
+    compile_query,
+)
+from metaloaders.yaml import (
+    load as load_yaml,
+)
+
+
+def test_pointer_1() -> None:
+    json = load_json('{"a": [{"b": 1}, {"b": 2}], "c/d": {"~": true}}')
+    index = PathIndex(json)
+
+    node = compile_query('/a/1/b').first(index)
+    assert node is not None
+    assert node.data == 2
+    assert (node.start_line, node.start_column) == (1, 23)
+    assert compile_query('/a/1/b').first(index) is node
+    assert compile_query('/a/1/b') is compile_query('/a/1/b')
+
+    node = compile_query('/c~1d/~0').first(json)
+    assert node is not None
+    assert node.data is True
+
+    assert compile_query('').first(index) is json
+    assert compile_query('/a/2/b').first(index) is None
+    assert compile_query('/a/x').first(index) is None
+    assert compile_query('/c~1d/~0/x').first(index) is None
+
+
+def test_jsonpath_1() -> None:
+    yaml = load_yaml(dedent("""
+        Resources:
+            rBucket:
+                Type: AWS::S3::Bucket
+                Properties:
+                    Tags: [{Key: a, Value: b}]
+            rQueue:
+                Type: AWS::SQS::Queue
+    """))
+    index = PathIndex(yaml)
+
+    assert [
+        (path, node.data)
+        for path, node in compile_query('$.Resources.*.Type').find(index)
+    ] == [
+        (('Resources', 'rBucket', 'Type'), 'AWS::S3::Bucket'),
+        (('Resources', 'rQueue', 'Type'), 'AWS::SQS::Queue'),
+    ]
+    assert [
+        path for path, _ in compile_query('$..Key').find(index)
+    ] == [
+        ('Resources', 'rBucket', 'Properties', 'Tags', 0, 'Key'),
+    ]
+    assert [
+        node.data for _, node in compile_query(
+            "$['Resources'][\"rBucket\"].Properties.Tags[-1][*]",
+        ).find(index)
+    ] == ['a', 'b']
+    assert [
+        node.data_type for _, node in compile_query('$..*').find(yaml)
+        if node.data_type is Type.OBJECT
+    ] == [Type.OBJECT] * 5
+
+
+def test_compile_1() -> None:
+    with pytest.raises(MetaloaderError):
+        compile_query('Resources')
+
+    with pytest.raises(MetaloaderError):
+        compile_query('$.Resources[')
+
+
+def test_pointer_2() -> None:
+    json = load_json('{"a": [{"b": 1}, {"b": 2}], "01": 3, "-": 4}')
+    index = PathIndex(json)
+
+    # Array indexes are integers, whatever the syntax
+    assert [path for path, _ in compile_query('/a/1/b').find(index)] == [
+        ('a', 1, 'b'),
+    ]
+    assert [path for path, _ in compile_query('$.a[-1].b').find(index)] == [
+        ('a', 1, 'b'),
+    ]
+
+    # RFC 6901 array indexes, other tokens are still member names
+    for pointer in ['/a/01', '/a/-', '/a/-1', '/a/+1', '/a/ 1']:
+        assert compile_query(pointer).first(index) is None, pointer
+    assert compile_query('/01').first(index) == json.inner['01']
+    assert compile_query('/-').first(index) == json.inner['-']
+
+
+def test_pointer_3() -> None:
+    # Deeper than the recursion limit, built by hand as loaders recurse
+    deep = Node(
+        data=[],
+        data_type=Type.ARRAY,
+        end_column=2,
+        end_line=1,
+        start_column=0,
+        start_line=1,
+    )
+    for _ in range(4999):
+        deep = deep._replace(data=[deep])
+    pointer = '/0' * 4999
+    index = PathIndex(deep, max_paths=16)
+
+    node = compile_query(pointer).first(index)
+    assert node is not None
+    assert node.data == []
+    assert compile_query(pointer + '/0').first(index) is None
+    assert compile_query(pointer[:-2]).first(index) is not None
+    # Bounded, and misses are not remembered
+    assert len(index._paths) == 16
+    assert ('0',) * 5000 not in index._paths
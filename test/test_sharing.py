@@ -0,0 +1,109 @@
+# Standard library
+from json import (
+    dumps as dump,
+)
+from textwrap import (
+    dedent,
+)
+# Local libraries
+from metaloaders.model import (
+    Node,
+    Type,
+)
+from metaloaders.json import (
+    load as load_json,
+)
+from metaloaders.yaml import (
+    load as load_yaml,
+)
+
+
+def test_load_1() -> None:
+    stream = '[{"a": [1, 2]}, {"a": [1, 2]}, {"a": [1, 3]}]'
+    json = load_json(stream, share=True, max_position_depth=1)
+    first, second, third = json.data
+
+    assert first.data is second.data
+    assert first.data is not third.data
+    assert first.start_column == 1
+    assert second.start_column == 16
+    assert json.raw == [{'a': [1, 2]}, {'a': [1, 2]}, {'a': [1, 3]}]
+
+    # Nested nodes locate their own occurrence
+    json = load_json(stream, share=True)
+    first, second, _ = json.data
+    assert first.data is not second.data
+    assert first.inner['a'].start_column == 7
+    assert second.inner['a'].start_column == 22
+    assert json == load_json(stream)
+
+
+def test_load_2() -> None:
+    json = load_json('[0.0, -0.0, 1, true, 1.0]', share=True)
+
+    assert [(val.data_type, repr(val.data)) for val in json.data] == [
+        (Type.NUMBER, '0.0'),
+        (Type.NUMBER, '-0.0'),
+        (Type.NUMBER, '1'),
+        (Type.BOOLEAN, 'True'),
+        (Type.NUMBER, '1.0'),
+    ]
+
+
+def test_load_3() -> None:
+    yaml = load_yaml(dedent("""
+        a: &x
+            k: [1, 2]
+        b: *x
+        c:
+            <<: *x
+            z: 1
+    """), share=True)
+
+    assert yaml.inner['a'].data is yaml.inner['b'].data
+    assert yaml.inner['b'] == Node(
+        data=yaml.inner['a'].data,
+        data_type=Type.OBJECT,
+        end_column=5,
+        end_line=4,
+        start_column=3,
+        start_line=4,
+    )
+    assert yaml.raw == {
+        'a': {'k': [1, 2]},
+        'b': {'k': [1, 2]},
+        'c': {'k': [1, 2], 'z': 1},
+    }
+
+
+def test_load_4() -> None:
+    # Every alias points to an anchored subtree made of repeated fragments
+    item = '{name: item, value: 1, tags: [a, b, c]}, '
+    stream = 'base: &base\n    items: [' + item * 100 + '{}]\n'
+    stream += 'copies:\n' + '    - *base\n' * 200
+    yaml = load_yaml(stream, share=True, positions='containers')
+
+    base = yaml.inner['base']
+    items = base.inner['items'].data
+    tags = items[0].inner['tags']
+    assert all(item.inner['tags'].data is tags.data for item in items[1:-1])
+    assert items[1].inner['tags'].start_line == tags.start_line
+    assert items[1].inner['tags'].start_column != tags.start_column
+    assert all(copy.data is base.data for copy in yaml.inner['copies'].data)
+    assert yaml.raw == load_yaml(stream).raw
+
+
+def test_load_5() -> None:
+    data = [{'name': 'item', 'value': 1, 'tags': ['a', 'b', 'c']}] * 500
+    json = load_json(dump(data), share=True, max_position_depth=1)
+    first, *others = json.data
+
+    assert all(other.data is first.data for other in others)
+    assert [other.start_line for other in json.data] == [1] * 500
+    assert len({other.start_column for other in json.data}) == 500
+    assert json.raw == data
+
+    json = load_json(dump(data), share=True)
+    assert len({
+        other.inner['tags'].start_column for other in json.data
+    }) == 500
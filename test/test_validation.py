@@ -0,0 +1,119 @@
+# Standard library
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Tuple,
+)
+# Third party libraries
+import pytest
+# Local libraries
+from metaloaders import (
+    json,
+    yaml,
+)
+from metaloaders.backends import (
+    engines,
+)
+from metaloaders.exceptions import (
+    MetaloaderSyntaxError,
+)
+from metaloaders.validation import (
+    Issue,
+    validate,
+    validate_bytes,
+    validate_file,
+)
+
+
+def _located(
+    function: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Optional[Tuple[int, int, int]]:
+    try:
+        function(*args, **kwargs)
+    except MetaloaderSyntaxError as exc:
+        return exc.line, exc.column, exc.offset
+    return None
+
+
+def test_validate_1() -> None:
+    for fmt, stream in [
+        ('json', '{"a": [1, 2.5, "x\\n"], "b": null}'),
+        # Tokens of the grammar the json module rejects
+        ('json', '[+1, .5, 1., "\\q", "\\ud83d\\ude00"]\f'),
+        ('yaml', 'a: [1, 2]\nb: &c {d: e}\nf: *c\n'),
+        ('yml', '- !Ref a\n- !GetAtt b.c\n'),
+    ]:
+        assert validate(stream, fmt) is None, stream
+
+    with pytest.raises(NotImplementedError):
+        validate('a', 'toml')
+
+
+def test_validate_2() -> None:
+    assert validate('{"a": [1, 2}', 'json') == Issue(
+        line=1,
+        column=11,
+        offset=11,
+        message="Unable to parse stream: unexpected '}' at line 1 column 12",
+    )
+
+    for stream, expected in [
+        ('', (1, 0, 0)),
+        ('[1,\n 2', (2, 2, 6)),
+        ('[1]\n[2]', (2, 0, 4)),
+        ('{"a": NaN}', (1, 6, 6)),
+        ('[1, 007]', (1, 4, 4)),
+        ('["\ud800"]', (1, 1, 1)),
+    ]:
+        issue = validate(stream, 'json')
+        assert issue is not None, stream
+        assert issue[:3] == expected, stream
+        # As loading raises it
+        assert _located(json.load, stream, engine='scanner') == expected
+
+
+def test_validate_3() -> None:
+    for stream, expected in [
+        ('a: [1', (1, 5, 5)),
+        ('a: b: c', (1, 4, 4)),
+        ('a:\n  - 1\n - 2', (3, 1, 10)),
+        ('a: b\nc: \x07', (2, 3, 8)),
+        ('\ufeffa: [', (1, 4, 5)),
+        ('x: &a 1\n---\ny: *a', (3, 3, 15)),
+    ]:
+        issue = validate(stream, 'yaml')
+        assert issue is not None, stream
+        assert issue[:3] == expected, stream
+
+        # Every engine locates errors alike, as loading raises them
+        for engine in engines('yaml'):
+            assert _located(
+                yaml.check_syntax, stream, engine=engine.name,
+            ) == expected, (stream, engine.name)
+            assert _located(
+                yaml.load, stream, engine=engine.name,
+            ) == expected, (stream, engine.name)
+
+
+def test_validate_4(tmp_path: Any) -> None:
+    assert validate_bytes(b'a: \xff\n', 'yaml') == Issue(
+        line=1,
+        column=3,
+        offset=3,
+        message=(
+            "Unable to decode stream: 'utf-8' codec can't decode byte 0xff "
+            'in position 3: invalid start byte'
+        ),
+    )
+    assert validate_bytes('a: [1]\n'.encode('utf-16'), 'yaml') is None
+
+    path = tmp_path / 'template.json'
+    path.write_text('{"a":\n  [1, }')
+    issue = validate_file(str(path))
+    assert issue is not None
+    assert issue[:3] == (2, 6, 12)
+    path.write_text('{"a": [1]}')
+    assert validate_file(str(path)) is None
@@ -2,7 +2,12 @@
 from typing import (
     Any,
 )
+# Third party libraries
+import pytest
 # Local libraries
+from metaloaders.exceptions import (
+    MetaloaderSyntaxError,
+)
 from metaloaders.model import (
     Node,
     Type,
@@ -11,6 +16,8 @@ from metaloaders.yaml import (
     load,
 )
 
+pytestmark = pytest.mark.usefixtures('yaml_engine')
+
 
 def test_load_1() -> None:
     pass
@@ -53,3 +60,15 @@ def test_load_3() -> None:
         start_line=1,
     )
     assert yaml.data == {key: val}
+
+
+def test_load_4() -> None:
+    # Lines end like in the marks of the python engine, on every engine
+    yaml = load('a: "x\x85y\u2028z"\r\nb: 1\rc: 2\n')
+    assert [(node.start_line, node.start_column) for node in [
+        yaml.inner['a'], yaml.inner['b'], yaml.inner['c'],
+    ]] == [(1, 3), (2, 3), (3, 3)]
+
+    with pytest.raises(MetaloaderSyntaxError) as error:
+        load('a: "x\x85y"\nb: [\n')
+    assert error.value.line == 3